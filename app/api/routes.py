@@ -1,8 +1,8 @@
 """
 API Routes for Suvichaar FastAPI Service
 """
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse, FileResponse, Response
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, Request
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from typing import Dict, Any, Optional
 import json
@@ -12,20 +12,28 @@ import time
 from datetime import datetime
 
 from app.models.schemas import (
-    ArticleGenerationRequest, TTSGenerationRequest, HTMLProcessingRequest,
+    ArticleGenerationRequest, BatchArticleGenerationRequest, TTSGenerationRequest, TTSJobRequest, HTMLProcessingRequest,
     AMPGenerationRequest, ContentSubmissionRequest, CoverImageRequest,
     ArticleAnalysisResponse, StructuredOutputResponse, TTSOutputResponse,
     HTMLProcessingResponse, AMPGenerationResponse, ContentSubmissionResponse,
-    CoverImageResponse, MetadataResponse, ErrorResponse
+    CoverImageResponse, MetadataResponse, ErrorResponse, BatchProcessingResponse
 )
+from app.core.cancellation import CancellationToken, RequestCancelled, cancel_on_disconnect
+from app.core.executor import executor
 from app.services.article_service import ArticleService
 from app.services.tts_service import TTSService
 from app.services.s3_service import S3Service
 from app.services.html_service import HTMLProcessingService
+from app.services.pipeline_service import StoryPipeline
+from app.services.job_service import JobService
+from app.services.upload_queue import UploadQueue
+from app.services.llm_cache import llm_cache
+from app.services.llm_pool import llm_pool
+from app.services.article_cache import article_cache
 from app.utils.helpers import (
     generate_filename, create_structured_output, restructure_slide_output,
     transform_suvichaar_json, get_random_user, create_success_response,
-    create_error_response, extract_metadata_from_response
+    create_error_response, extract_metadata_from_response, format_sse
 )
 
 # Initialize routers
@@ -33,43 +41,25 @@ router = APIRouter()
 
 # Initialize services
 article_service = ArticleService()
-tts_service = TTSService()
 s3_service = S3Service()
+tts_service = TTSService(article_service=article_service, s3_client=s3_service.s3_client)
 html_service = HTMLProcessingService()
+upload_queue = UploadQueue(s3_service)
+story_pipeline = StoryPipeline(article_service, tts_service)
+job_service = JobService(story_pipeline)
 
 
 @router.post("/generate-article", response_model=StructuredOutputResponse)
-async def generate_article(request: ArticleGenerationRequest):
+async def generate_article(request: ArticleGenerationRequest, http_request: Request):
     """
     Generate article content and structured output (Tab 1 functionality)
     """
     try:
-        # Extract and analyze article
-        title, summary, full_text = article_service.extract_article(str(request.url))
-        sentiment = article_service.get_sentiment(summary or full_text)
-        result = article_service.detect_category_and_subcategory(full_text, request.content_language.value)
-        
-        category = result["category"]
-        subcategory = result["subcategory"]
-        emotion = result["emotion"]
-        
-        # Generate hookline and storytitle
-        hookline = article_service.generate_hookline(title, summary, request.content_language.value)
-        storytitle = article_service.generate_storytitle(title, summary, request.content_language.value)
-        
-        # Generate slide content
-        output = article_service.title_script_generator(
-            category, subcategory, emotion, full_text, request.content_language.value
-        )
-        
-        # Create structured output
-        structured_output = create_structured_output(
-            storytitle, hookline, output.get("slides", []), request.number_of_slides
-        )
-        
-        # Hindi transliteration if needed
-        if request.content_language.value == "Hindi":
-            structured_output = tts_service.transliterate_to_devanagari(structured_output)
+        # Remaining narrations/transliterations are cancelled if the client disconnects
+        structured_output = await cancel_on_disconnect(http_request, story_pipeline.generate_story(
+            str(request.url), request.content_language.value, request.number_of_slides,
+            single_shot=request.single_shot
+        ))
         
         filename = generate_filename("structured_slides", "json")
         
@@ -77,23 +67,69 @@ async def generate_article(request: ArticleGenerationRequest):
             structured_output=structured_output,
             filename=filename
         )
-        
+    
+    except RequestCancelled:
+        raise HTTPException(status_code=499, detail="Client disconnected")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Article generation failed: {str(e)}")
 
 
+@router.post("/generate-article/stream")
+async def generate_article_stream(request: ArticleGenerationRequest):
+    """
+    Generate article content as Server-Sent Events, one event per finished pipeline stage
+    """
+    stages = story_pipeline.stream_story(
+        str(request.url), request.content_language.value, request.number_of_slides,
+        single_shot=request.single_shot
+    )
+    
+    async def events():
+        # Starlette cancels this generator when the client disconnects, which closes
+        # the pipeline stream and cancels its outstanding LLM calls
+        try:
+            async for stage, data in stages:
+                yield format_sse(stage, data)
+        finally:
+            await stages.aclose()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/generate-article/batch", response_model=BatchProcessingResponse)
+async def generate_article_batch(request: BatchArticleGenerationRequest):
+    """
+    Generate structured output (and optionally TTS) for many article URLs concurrently
+    """
+    try:
+        batch = await story_pipeline.run_batch(
+            [str(url) for url in request.urls], request.content_language.value, request.number_of_slides,
+            single_shot=request.single_shot,
+            voice=request.voice if request.generate_tts else None,
+            concurrency=request.concurrency
+        )
+        return BatchProcessingResponse(**batch)
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch article generation failed: {str(e)}")
+
+
 @router.post("/generate-tts", response_model=TTSOutputResponse)
-async def generate_tts(request: TTSGenerationRequest):
+async def generate_tts(request: TTSGenerationRequest, http_request: Request):
     """
     Generate TTS and upload to S3 (Tab 2 functionality)
     """
     try:
-        # Generate TTS and upload to S3
-        tts_output = tts_service.synthesize_and_upload(request.structured_slides, request.voice)
-        
-        # Generate Remotion input
-        fixed_image_url = "https://media.suvichaar.org/upload/polaris/polariscover.png"
-        remotion_input = tts_service.generate_remotion_input(tts_output, fixed_image_url)
+        # Generate TTS, upload to S3 and build the Remotion input; a client disconnect
+        # stops pending syntheses and cleans up their partial uploads
+        token = CancellationToken()
+        tts_output, remotion_input = await cancel_on_disconnect(
+            http_request, story_pipeline.synthesize(request.structured_slides, request.voice, token=token), token
+        )
         
         filename = generate_filename("tts_output", "json")
         
@@ -102,11 +138,84 @@ async def generate_tts(request: TTSGenerationRequest):
             remotion_input=remotion_input,
             filename=filename
         )
-        
+    
+    except RequestCancelled:
+        raise HTTPException(status_code=499, detail="Client disconnected")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"TTS generation failed: {str(e)}")
 
 
+@router.post("/generate-article/jobs", status_code=202)
+async def create_article_job(request: ArticleGenerationRequest):
+    """
+    Queue an article generation and return its job id immediately
+    """
+    try:
+        job = await job_service.enqueue_article(
+            str(request.url), request.persona.value, request.content_language.value,
+            request.number_of_slides, single_shot=request.single_shot
+        )
+        return create_success_response(job, "Article generation job queued")
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Article job creation failed: {str(e)}")
+
+
+@router.get("/generate-article/jobs")
+async def list_article_jobs(status: Optional[str] = None, limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0)):
+    """
+    List article generation jobs, newest first
+    """
+    jobs = await executor.run_io(job_service.list_jobs, "article", status, limit, offset)
+    return create_success_response(jobs)
+
+
+@router.get("/generate-article/jobs/{job_id}")
+async def get_article_job(job_id: int):
+    """
+    Get the status and result of an article generation job
+    """
+    job = await executor.run_io(job_service.get_job, "article", job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Article job not found")
+    return create_success_response(job)
+
+
+@router.post("/generate-tts/jobs", status_code=202)
+async def create_tts_job(request: TTSJobRequest):
+    """
+    Queue a TTS generation and return its job id immediately
+    """
+    try:
+        job = await job_service.enqueue_tts(
+            request.structured_slides, request.voice, content_generation_id=request.content_generation_id
+        )
+        return create_success_response(job, "TTS generation job queued")
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"TTS job creation failed: {str(e)}")
+
+
+@router.get("/generate-tts/jobs")
+async def list_tts_jobs(status: Optional[str] = None, limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0)):
+    """
+    List TTS generation jobs, newest first
+    """
+    jobs = await executor.run_io(job_service.list_jobs, "tts", status, limit, offset)
+    return create_success_response(jobs)
+
+
+@router.get("/generate-tts/jobs/{job_id}")
+async def get_tts_job(job_id: int):
+    """
+    Get the status and result of a TTS generation job
+    """
+    job = await executor.run_io(job_service.get_job, "tts", job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="TTS job not found")
+    return create_success_response(job)
+
+
 @router.post("/process-html", response_model=HTMLProcessingResponse)
 async def process_html(request: HTMLProcessingRequest):
     """
@@ -118,7 +227,7 @@ async def process_html(request: HTMLProcessingRequest):
         
         if request.template_url:
             # Fetch template from URL
-            html_template = await html_service.fetch_template_from_url(str(request.template_url))
+            html_template = await html_service.fetch_compiled_template(str(request.template_url))
         elif request.html_template:
             # Use provided template
             html_template = request.html_template
@@ -136,35 +245,30 @@ async def process_html(request: HTMLProcessingRequest):
         
         filename = generate_filename("output_bundle", "zip")
         
-        # Upload files to S3 and get CloudFront URLs
-        try:
-            from app.services.s3_service import S3Service
-            s3_service = S3Service()
-            html_s3_url, json_s3_url = s3_service.upload_processed_files(
-                updated_html, updated_json, "processed_html"
-            )
-        except Exception as s3_error:
-            # If S3 upload fails, still return the response without S3 URLs
-            html_s3_url = None
-            json_s3_url = None
-            print(f"S3 upload failed: {s3_error}")
+        # Queue the S3 uploads; their CloudFront URLs are known up front
+        upload_job = upload_queue.submit(
+            s3_service.processed_file_items(updated_html, updated_json, "processed_html")
+        )
+        html_s3_url, json_s3_url = upload_job.urls
         
         return HTMLProcessingResponse(
             updated_html=updated_html,
             updated_json=updated_json,
             filename=filename,
             html_s3_url=html_s3_url,
-            json_s3_url=json_s3_url
+            json_s3_url=json_s3_url,
+            upload_job_id=upload_job.job_id
         )
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"HTML processing failed: {str(e)}")
 
 
 @router.post("/process-html-download", response_class=Response)
-async def process_html_download(request: HTMLProcessingRequest):
+async def process_html_download(request: HTMLProcessingRequest, stream: bool = False):
     """
-    Process HTML template with slide data and return ZIP file for download
+    Process HTML template with slide data and return ZIP file for download.
+    With ?stream=true the archive is streamed as it is compressed instead of built in memory.
     """
     try:
         # Determine HTML template source
@@ -172,7 +276,7 @@ async def process_html_download(request: HTMLProcessingRequest):
         
         if request.template_url:
             # Fetch template from URL
-            html_template = await html_service.fetch_template_from_url(str(request.template_url))
+            html_template = await html_service.fetch_compiled_template(str(request.template_url))
         elif request.html_template:
             # Use provided template
             html_template = request.html_template
@@ -180,11 +284,6 @@ async def process_html_download(request: HTMLProcessingRequest):
             # Use empty template if neither provided
             html_template = ""
         
-        # Replace placeholders in HTML
-        updated_html = html_service.replace_placeholders_in_html(
-            html_template, request.full_slide_json
-        )
-        
         # Modify JSON structure
         updated_json = html_service.modify_tab4_json(request.full_slide_json)
         
@@ -194,6 +293,23 @@ async def process_html_download(request: HTMLProcessingRequest):
         json_filename = f"processed_data_{timestamp}.json"
         zip_filename = f"html_processing_bundle_{timestamp}.zip"
         
+        if stream:
+            json_bytes = json.dumps(updated_json, indent=2, ensure_ascii=False).encode("utf-8")
+            members = [
+                (html_filename, html_service.iter_placeholders_in_html(html_template, request.full_slide_json)),
+                (json_filename, [json_bytes]),
+            ]
+            return StreamingResponse(
+                html_service.iter_zip_file(members),
+                media_type="application/zip",
+                headers={"Content-Disposition": f"attachment; filename={zip_filename}"}
+            )
+        
+        # Replace placeholders in HTML
+        updated_html = html_service.replace_placeholders_in_html(
+            html_template, request.full_slide_json
+        )
+        
         # Create ZIP file
         zip_content = html_service.create_zip_file(
             updated_html, updated_json, html_filename, json_filename
@@ -208,7 +324,7 @@ async def process_html_download(request: HTMLProcessingRequest):
                 "Content-Length": str(len(zip_content))
             }
         )
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"HTML processing download failed: {str(e)}")
 
@@ -240,7 +356,7 @@ async def generate_amp(request: AMPGenerationRequest):
         
         if request.amp_template_url:
             # Fetch template from URL
-            amp_template_html = await html_service.fetch_template_from_url(str(request.amp_template_url))
+            amp_template_html = await html_service.fetch_compiled_template(str(request.amp_template_url))
         elif request.amp_template_html:
             # Use provided template
             amp_template_html = request.amp_template_html
@@ -266,22 +382,17 @@ async def generate_amp(request: AMPGenerationRequest):
         
         filename = generate_filename("pre-final_amp_story", "html")
         
-        # Upload HTML to S3 and get CloudFront URL
-        try:
-            from app.services.s3_service import S3Service
-            s3_service = S3Service()
-            html_s3_url = s3_service.upload_amp_html(final_html, "amp_story")
-        except Exception as s3_error:
-            # If S3 upload fails, still return the response without S3 URL
-            html_s3_url = None
-            print(f"S3 upload failed: {s3_error}")
+        # Queue the S3 upload; its CloudFront URL is known up front
+        upload_job = upload_queue.submit([s3_service.amp_html_item(final_html, "amp_story")])
+        html_s3_url = upload_job.urls[0]
         
         return AMPGenerationResponse(
             final_html=final_html,
             filename=filename,
-            html_s3_url=html_s3_url
+            html_s3_url=html_s3_url,
+            upload_job_id=upload_job.job_id
         )
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AMP generation failed: {str(e)}")
 
@@ -312,15 +423,17 @@ async def download_amp_file(filename: str):
                 "Content-Length": str(len(content.encode('utf-8')))
             }
         )
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File download failed: {str(e)}")
 
 
 @router.post("/generate-amp-download", response_model=AMPGenerationResponse)
-async def generate_amp_download(request: AMPGenerationRequest):
+async def generate_amp_download(request: AMPGenerationRequest, stream: bool = False):
     """
-    Generate AMP HTML from template and JSON and return both HTML content and download URL
+    Generate AMP HTML from template and JSON and return both HTML content and download URL.
+    With ?stream=true the HTML itself is streamed as the download while being uploaded to S3
+    from the same stream; the CloudFront URL is returned in the X-HTML-S3-URL header.
     """
     try:
         # Determine AMP template source
@@ -328,7 +441,7 @@ async def generate_amp_download(request: AMPGenerationRequest):
         
         if request.amp_template_url:
             # Fetch template from URL
-            amp_template_html = await html_service.fetch_template_from_url(str(request.amp_template_url))
+            amp_template_html = await html_service.fetch_compiled_template(str(request.amp_template_url))
         elif request.amp_template_html:
             # Use provided template
             amp_template_html = request.amp_template_html
@@ -349,13 +462,27 @@ async def generate_amp_download(request: AMPGenerationRequest):
             # Use empty JSON if neither provided
             output_json_data = {}
         
-        # Process AMP template
-        final_html = html_service.process_amp_template(amp_template_html, output_json_data)
-        
         # Generate filename
         timestamp = int(time.time())
         html_filename = f"generated_amp_story_{timestamp}.html"
         
+        if stream:
+            chunks = html_service.iter_amp_template(amp_template_html, output_json_data)
+            upload, html_s3_url = s3_service.open_streaming_upload(
+                "generated_amp_story", "html", "text/html; charset=utf-8"
+            )
+            return StreamingResponse(
+                upload.tee(chunks),
+                media_type="text/html; charset=utf-8",
+                headers={
+                    "Content-Disposition": f"attachment; filename={html_filename}",
+                    "X-HTML-S3-URL": html_s3_url
+                }
+            )
+        
+        # Process AMP template
+        final_html = html_service.process_amp_template(amp_template_html, output_json_data)
+        
         # Save file to temp directory for download
         import os
         temp_dir = "temp"
@@ -368,23 +495,18 @@ async def generate_amp_download(request: AMPGenerationRequest):
         # Generate download URL
         download_url = f"/api/v1/download-amp/{html_filename}"
         
-        # Upload HTML to S3 and get CloudFront URL
-        try:
-            from app.services.s3_service import S3Service
-            s3_service = S3Service()
-            html_s3_url = s3_service.upload_amp_html(final_html, "generated_amp_story")
-        except Exception as s3_error:
-            # If S3 upload fails, still return the response without S3 URL
-            html_s3_url = None
-            print(f"S3 upload failed: {s3_error}")
+        # Queue the S3 upload; its CloudFront URL is known up front
+        upload_job = upload_queue.submit([s3_service.amp_html_item(final_html, "generated_amp_story")])
+        html_s3_url = upload_job.urls[0]
         
         return AMPGenerationResponse(
             final_html=final_html,
             filename=html_filename,
             download_url=download_url,
-            html_s3_url=html_s3_url
+            html_s3_url=html_s3_url,
+            upload_job_id=upload_job.job_id
         )
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AMP generation download failed: {str(e)}")
 
@@ -395,9 +517,6 @@ async def generate_metadata(story_title: str = Form(...)):
     Generate metadata for story title (Tab 5 helper)
     """
     try:
-        from app.services.article_service import ArticleService
-        article_service = ArticleService()
-        
         messages = [
             {
                 "role": "user",
@@ -411,14 +530,7 @@ Make sure to use the exact labels "Description:", "Keywords:", and "Filter Tags:
             }
         ]
         
-        response = article_service.client.chat.completions.create(
-            model=article_service.deployment_name,
-            messages=messages,
-            max_tokens=300,
-            temperature=0.5,
-        )
-        
-        output = response.choices[0].message.content
+        output = await article_service.complete_async(messages, max_tokens=300, temperature=0.5)
         metadata = extract_metadata_from_response(output)
         
         # Fallback: If extraction failed, generate basic metadata
@@ -432,7 +544,7 @@ Make sure to use the exact labels "Description:", "Keywords:", and "Filter Tags:
             metadata["filter_tags"] = f"{story_title}, News, Updates"
         
         return MetadataResponse(**metadata)
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Metadata generation failed: {str(e)}")
 
@@ -451,7 +563,7 @@ async def submit_content(request: ContentSubmissionRequest):
         cover_image_url = request.cover_image_url if request.use_custom_cover else request.image_url
         
         # Fetch HTML content from URL
-        prefinal_html = await html_service.fetch_template_from_url(str(request.prefinal_html_url))
+        prefinal_html = await html_service.fetch_compiled_template(str(request.prefinal_html_url))
         
         # Process HTML template
         submission_data = {
@@ -467,17 +579,13 @@ async def submit_content(request: ContentSubmissionRequest):
             "selected_user": get_random_user()
         }
         
-        processed_html = html_service.process_content_submission(prefinal_html, submission_data)
-        
-        # Generate resized image URLs
+        # Resized image URLs are filled in the same rendering pass
         resized_urls = s3_service.generate_resized_image_urls(str(request.image_url))
-        for label, url in resized_urls.items():
-            processed_html = processed_html.replace(f"{{{{{label}}}}}", url)
-        
-        # Upload HTML to S3
-        html_url = s3_service.upload_html_story(processed_html, slug_nano)
+        processed_html = html_service.process_content_submission(
+            prefinal_html, submission_data, extra_placeholders=resized_urls
+        )
         
-        # Generate and upload metadata
+        # Generate metadata
         filter_tags = [tag.strip() for tag in request.filter_tags.split(",") if tag.strip()]
         metadata = html_service.generate_metadata(
             request.story_title, 
@@ -488,7 +596,15 @@ async def submit_content(request: ContentSubmissionRequest):
             request.language.value
         )
         
-        metadata_url = s3_service.upload_metadata(metadata, slug_nano)
+        # Upload HTML and metadata to S3 concurrently
+        html_result, metadata_result = await s3_service.upload_batch_async([
+            s3_service.html_story_item(processed_html, slug_nano),
+            s3_service.metadata_item(metadata, slug_nano),
+        ])
+        for label, result in (("HTML", html_result), ("Metadata", metadata_result)):
+            if result.error:
+                raise Exception(f"{label} upload failed: {result.error}")
+        html_url, metadata_url = html_result.url, metadata_result.url
         
         filename = f"{request.story_title}.zip"
         
@@ -500,7 +616,7 @@ async def submit_content(request: ContentSubmissionRequest):
             slug=slug_nano,
             filename=filename
         )
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Content submission failed: {str(e)}")
 
@@ -515,10 +631,10 @@ async def generate_cover_image(request: CoverImageRequest):
         transformed_json = transform_suvichaar_json(request.suvichaar_json)
         
         # Generate thumbnail
-        thumbnail_bytes = s3_service.generate_thumbnail(transformed_json)
+        thumbnail_bytes = await executor.run_io(s3_service.generate_thumbnail, transformed_json)
         
         # Upload thumbnail
-        thumbnail_url = s3_service.upload_thumbnail(thumbnail_bytes)
+        thumbnail_url = await executor.run_io(s3_service.upload_thumbnail, thumbnail_bytes)
         
         filename = generate_filename("CoverJSON", "json")
         
@@ -528,7 +644,7 @@ async def generate_cover_image(request: CoverImageRequest):
             transformed_json=transformed_json,
             filename=filename
         )
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Cover image generation failed: {str(e)}")
 
@@ -544,7 +660,7 @@ async def upload_file(file: UploadFile = File(...)):
         content = await file.read()
         filename = f"{int(datetime.now().timestamp())}_{file.filename}"
         
-        file_url = s3_service.upload_file(content, filename, file.content_type)
+        file_url = await executor.run_io(s3_service.upload_file, content, filename, file.content_type)
         
         return create_success_response({
             "filename": filename,
@@ -552,7 +668,7 @@ async def upload_file(file: UploadFile = File(...)):
             "file_size": len(content),
             "content_type": file.content_type
         })
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
 
@@ -574,7 +690,7 @@ async def download_zip(html_content: str = Form(...), json_content: str = Form(.
             media_type="application/zip",
             filename=f"output_{int(datetime.now().timestamp())}.zip"
         )
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"ZIP creation failed: {str(e)}")
 
@@ -608,6 +724,49 @@ async def get_category_mapping():
     return create_success_response(settings.CATEGORY_MAPPING)
 
 
+@router.get("/llm-cache/stats")
+async def get_llm_cache_stats():
+    """
+    Get LLM response cache hit/miss counters
+    """
+    return create_success_response(llm_cache.stats())
+
+
+@router.get("/llm-rate-limit/stats")
+async def get_llm_rate_limit_stats():
+    """
+    Get per-deployment Azure OpenAI routing, health and rate limiter state
+    """
+    return create_success_response(llm_pool.stats())
+
+
+@router.get("/article-cache/stats")
+async def get_article_cache_stats():
+    """
+    Get fetched-article cache hit/miss/revalidation counters
+    """
+    return create_success_response(article_cache.stats())
+
+
+@router.get("/uploads/{job_id}")
+async def get_upload_status(job_id: str):
+    """
+    Get the status of a background S3 upload job
+    """
+    status = upload_queue.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    return create_success_response(status)
+
+
+@router.get("/executor/stats")
+async def get_executor_stats():
+    """
+    Get I/O thread pool and CPU process pool saturation metrics
+    """
+    return create_success_response(executor.stats())
+
+
 @router.get("/health")
 async def health_check():
     """
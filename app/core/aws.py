@@ -0,0 +1,56 @@
+"""
+Shared AWS clients for Suvichaar FastAPI Service
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.config import Config
+
+from app.core.config import settings
+
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+_s3_upload_pool = None
+
+
+def build_s3_client():
+    """Create an S3 client with a pooled, keep-alive, retrying connection config"""
+    config = Config(
+        region_name=settings.AWS_REGION,
+        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        connect_timeout=settings.S3_CONNECT_TIMEOUT,
+        read_timeout=settings.S3_READ_TIMEOUT,
+        retries={"max_attempts": settings.S3_MAX_ATTEMPTS, "mode": "adaptive"},
+    )
+    return boto3.client(
+        "s3",
+        aws_access_key_id=settings.AWS_ACCESS_KEY,
+        aws_secret_access_key=settings.AWS_SECRET_KEY,
+        config=config,
+    )
+
+
+def get_s3_client():
+    """Process-wide S3 client shared by every service (boto3 clients are thread-safe)"""
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = build_s3_client()
+    return _s3_client
+
+
+def get_s3_upload_pool() -> ThreadPoolExecutor:
+    """Process-wide thread pool for concurrent S3 uploads, sized below the client's connection pool"""
+    global _s3_upload_pool
+    if _s3_upload_pool is None:
+        with _s3_client_lock:
+            if _s3_upload_pool is None:
+                _s3_upload_pool = ThreadPoolExecutor(
+                    max_workers=min(settings.S3_UPLOAD_WORKERS, settings.S3_MAX_POOL_CONNECTIONS),
+                    thread_name_prefix="s3-upload"
+                )
+    return _s3_upload_pool
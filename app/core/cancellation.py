@@ -0,0 +1,65 @@
+"""
+Request cancellation for Suvichaar FastAPI Service
+"""
+import asyncio
+import threading
+from typing import Awaitable, Optional, TypeVar
+
+from starlette.requests import Request
+
+T = TypeVar("T")
+
+# Seconds between client disconnect checks while a request's work is running
+DISCONNECT_POLL_INTERVAL = 0.5
+
+
+class RequestCancelled(Exception):
+    """Raised when work is abandoned because its client went away"""
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag shared by a request's async tasks and the executor threads
+    working for it, which cannot be interrupted and so check it between steps.
+    """
+    
+    def __init__(self):
+        self._event = threading.Event()
+    
+    def cancel(self) -> None:
+        """Signal every holder of the token to stop"""
+        self._event.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() was called"""
+        return self._event.is_set()
+    
+    def raise_if_cancelled(self) -> None:
+        """Raise RequestCancelled once the token is cancelled"""
+        if self._event.is_set():
+            raise RequestCancelled("Request cancelled")
+
+
+async def cancel_on_disconnect(request: Request, work: Awaitable[T],
+                               token: Optional[CancellationToken] = None,
+                               poll_interval: float = DISCONNECT_POLL_INTERVAL) -> T:
+    """
+    Await work while watching the client connection. On disconnect the token is cancelled,
+    the work task is cancelled (and awaited, so its cleanup finishes) and RequestCancelled is raised.
+    """
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                break
+    finally:
+        if not task.done():
+            if token is not None:
+                token.cancel()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    raise RequestCancelled("Client disconnected")
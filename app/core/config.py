@@ -2,7 +2,7 @@
 Configuration settings for Suvichaar FastAPI Service
 """
 import os
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -19,11 +19,42 @@ class Settings(BaseSettings):
     AZURE_OPENAI_ENDPOINT: str
     AZURE_OPENAI_API_KEY: str
     AZURE_OPENAI_API_VERSION: str = "2024-02-01"
-    AZURE_OPENAI_DEPLOYMENT_NAME: str = "gpt-4"
+    AZURE_OPENAI_DEPLOYMENT_NAME: str = "gpt-4"  # Logical model name; also the LLM cache namespace
+    # JSON list of deployments to load-balance across, e.g. [{"name": "eastus", "endpoint": "...",
+    # "api_key": "...", "deployment": "gpt-4", "weight": 2, "requests_per_minute": 300,
+    # "tokens_per_minute": 40000}]; omitted fields fall back to the single-deployment settings above
+    AZURE_OPENAI_DEPLOYMENTS: List[Dict[str, Any]] = []
+    NARRATION_CONCURRENCY: int = 5  # Max parallel per-slide narration calls
+    LLM_SINGLE_SHOT: bool = False  # Generate outline, intro and narrations in one structured call
+    TRANSLITERATION_MAX_ATTEMPTS: int = 3  # Batched requests per story, retrying only missing keys
+    TRANSLITERATION_CACHE_SIZE: int = 2048  # Cached transliterations keyed by source text
+    
+    # LLM Rate Limit Settings
+    LLM_RATE_LIMIT_ENABLED: bool = True
+    LLM_REQUESTS_PER_MINUTE: int = 0  # Deployment RPM quota; 0 relies on x-ratelimit-* headers only
+    LLM_TOKENS_PER_MINUTE: int = 0  # Deployment TPM quota; 0 relies on x-ratelimit-* headers only
+    LLM_MAX_CONCURRENCY: int = 32  # Ceiling for the adaptive (AIMD) concurrency limit
+    LLM_MIN_CONCURRENCY: int = 2  # Floor the limit is halved down to on 429s
+    LLM_MAX_ATTEMPTS: int = 5  # Attempts per completion on 429/5xx/connection errors
+    LLM_RETRY_BASE_DELAY: float = 1.0  # Seconds, doubled per attempt with jitter unless Retry-After is sent
+    LLM_RETRY_MAX_DELAY: float = 30.0
+    LLM_EJECT_AFTER_FAILURES: int = 3  # Consecutive 429/5xx/connection errors before a deployment is ejected
+    LLM_EJECT_SECONDS: float = 30.0  # How long an ejected deployment receives no traffic
+    
+    # LLM Response Cache Settings
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 24 * 60 * 60  # 0 disables expiry
+    LLM_CACHE_MAX_ENTRIES: int = 4096
+    LLM_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64MB in-process tier
+    LLM_CACHE_SQLITE_PATH: Optional[str] = None  # e.g. "cache/llm_cache.db" to enable the disk tier
+    LLM_CACHE_SQLITE_MAX_ENTRIES: int = 100000
     
     # Azure Speech/TTS Settings
     AZURE_TTS_URL: str
     AZURE_API_KEY: str
+    TTS_CONCURRENCY: int = 6  # Max parallel slide syntheses/uploads per story
+    TTS_AUDIO_CACHE_ENABLED: bool = True  # Reuse audio for identical (text, voice, model)
+    TTS_AUDIO_INDEX_SIZE: int = 10000  # Local index entries in front of S3 head_object
     
     # AWS Settings
     AWS_ACCESS_KEY: str
@@ -33,6 +64,51 @@ class Settings(BaseSettings):
     S3_PREFIX: str = "media/"
     CDN_BASE: str
     CDN_PREFIX_MEDIA: str = "https://media.suvichaar.org/"
+    S3_MULTIPART_PART_SIZE: int = 8 * 1024 * 1024  # Streaming uploads switch to multipart past one part
+    S3_MAX_POOL_CONNECTIONS: int = 50  # Shared across every service using the process-wide client
+    S3_MAX_ATTEMPTS: int = 5
+    S3_CONNECT_TIMEOUT: int = 5
+    S3_READ_TIMEOUT: int = 60
+    S3_UPLOAD_WORKERS: int = 16  # Shared pool for batch uploads (capped at S3_MAX_POOL_CONNECTIONS)
+    UPLOAD_QUEUE_WORKERS: int = 4  # Background upload workers for HTML/AMP outputs
+    UPLOAD_MAX_ATTEMPTS: int = 5
+    UPLOAD_RETRY_BASE_DELAY: float = 1.0  # Seconds, doubled per attempt with jitter
+    UPLOAD_RETRY_MAX_DELAY: float = 60.0
+    UPLOAD_JOB_HISTORY: int = 1000  # Finished jobs kept for the status endpoint
+    UPLOAD_SHUTDOWN_TIMEOUT: float = 30.0  # Seconds to drain pending uploads on shutdown
+    
+    # Database / Job Queue Settings
+    DATABASE_URL: str = "sqlite:///./suvichaar.db"
+    JOB_WORKERS: int = 4  # Article/TTS jobs processed at once by the persistent job queue
+    JOB_LEASE_SECONDS: int = 300  # A processing job not renewed for this long is reclaimed by another worker
+    
+    # Batch Pipeline Settings
+    BATCH_CONCURRENCY: int = 8  # Stories generated at once by /generate-article/batch
+    
+    # Execution Layer Settings (blocking work off the event loop)
+    IO_POOL_WORKERS: int = 32  # Threads for sync SDK calls (requests, boto3, OpenAI)
+    CPU_POOL_WORKERS: int = 2  # Processes for CPU-bound NLP; 0 runs it on the I/O threads
+    
+    # Article Extraction Settings
+    ARTICLE_MAX_BYTES: int = 5 * 1024 * 1024  # Body bytes parsed per page; the rest is skipped
+    ARTICLE_FETCH_TIMEOUT: float = 10.0
+    ARTICLE_CACHE_ENABLED: bool = True
+    ARTICLE_CACHE_FRESH_SECONDS: int = 10 * 60  # Served without a request; revalidated after
+    ARTICLE_CACHE_TTL_SECONDS: int = 24 * 60 * 60  # Storage lifetime; 0 disables expiry
+    ARTICLE_CACHE_MAX_ENTRIES: int = 1024
+    ARTICLE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64MB in-process tier
+    ARTICLE_CACHE_SQLITE_PATH: Optional[str] = None  # e.g. "cache/article_cache.db" to enable the disk tier
+    ARTICLE_CACHE_SQLITE_MAX_ENTRIES: int = 20000
+    
+    # Outbound HTTP Client Settings (templates, JSON data)
+    HTTP_TIMEOUT: float = 30.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    HTTP_REVALIDATION_CACHE_ENTRIES: int = 256
+    HTTP_REVALIDATION_CACHE_BYTES: int = 32 * 1024 * 1024
+    TEMPLATE_CACHE_ENTRIES: int = 128  # Compiled HTML/AMP template plans
+    TEMPLATE_CACHE_BYTES: int = 64 * 1024 * 1024
     
     # Default Values
     DEFAULT_BG_IMAGE: str = "https://media.suvichaar.org/upload/polaris/polariscover.png"
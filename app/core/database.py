@@ -1,16 +1,17 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-# Database URL (you can configure this in settings)
-DATABASE_URL = "sqlite:///./suvichaar.db"  # Change to your database URL
+# Database URL (configured in settings)
+DATABASE_URL = settings.DATABASE_URL
 
 # Create engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+engine = create_engine(DATABASE_URL, connect_args=connect_args, pool_pre_ping=True)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -28,7 +29,21 @@ def get_db():
         db.close()
 
 
-def create_tables():
-    """Create all tables"""
+def create_tables(bind=None):
+    """Create all tables (on the application engine unless another bind is given)"""
     from app.models.database import Base
-    Base.metadata.create_all(bind=engine)
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    add_missing_columns(Base.metadata, bind)
+
+
+def add_missing_columns(metadata, bind) -> None:
+    """Add nullable model columns missing from tables created by an older version (there are no migrations)"""
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for table in metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=bind.dialect)
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
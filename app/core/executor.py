@@ -0,0 +1,177 @@
+"""
+Execution layer for blocking work in Suvichaar FastAPI Service
+"""
+import asyncio
+import functools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+
+def _process_context():
+    """
+    forkserver (or spawn) start method for the process pool: forking a process that already runs
+    thread pools and SDK clients can copy locks held by other threads into the workers
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class PoolMetrics:
+    """Submitted/active/queued counters for one pool, for saturation reporting"""
+    
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_run_seconds = 0.0
+        self._lock = threading.Lock()
+    
+    def on_submit(self) -> float:
+        """Count a submission and return its start time"""
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return time.perf_counter()
+    
+    def on_reject(self) -> None:
+        """Undo on_submit for work the pool refused"""
+        with self._lock:
+            self.submitted -= 1
+            self.in_flight -= 1
+    
+    def on_done(self, future: Future, started: float) -> None:
+        """Count a finished future"""
+        with self._lock:
+            self.in_flight -= 1
+            self.total_run_seconds += time.perf_counter() - started
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus derived saturation (busy workers / pool size) and queue depth"""
+        with self._lock:
+            active = min(self.in_flight, self.max_workers)
+            return {
+                "max_workers": self.max_workers,
+                "active": active,
+                "queued": self.in_flight - active,
+                "saturation": round(active / self.max_workers, 3) if self.max_workers else 0.0,
+                "peak_in_flight": self.peak_in_flight,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_latency_ms": round(1000 * self.total_run_seconds / max(1, self.completed + self.failed), 2),
+            }
+
+
+class ExecutionLayer:
+    """
+    Bounded pools for blocking work: a thread pool for sync SDK/network calls (requests,
+    boto3, OpenAI) and a process pool for CPU-bound NLP. CPU work falls back to the thread
+    pool when CPU_POOL_WORKERS is 0 or a process pool cannot be started.
+    """
+    
+    def __init__(self, io_workers: int = settings.IO_POOL_WORKERS,
+                 cpu_workers: int = settings.CPU_POOL_WORKERS):
+        self.io_workers = max(1, io_workers)
+        self.cpu_workers = max(0, cpu_workers)
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._cpu_pool: Optional[Executor] = None
+        self._lock = threading.RLock()
+        self.io_metrics = PoolMetrics("io", self.io_workers)
+        self.cpu_metrics = PoolMetrics("cpu", self.cpu_workers or self.io_workers)
+    
+    @property
+    def io_pool(self) -> ThreadPoolExecutor:
+        """Thread pool for blocking I/O, created on first use"""
+        if self._io_pool is None:
+            with self._lock:
+                if self._io_pool is None:
+                    self._io_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="io")
+        return self._io_pool
+    
+    @property
+    def cpu_pool(self) -> Executor:
+        """Process pool for CPU-bound work, created on first use"""
+        if self._cpu_pool is None:
+            with self._lock:
+                if self._cpu_pool is None:
+                    self._cpu_pool = self._build_cpu_pool()
+        return self._cpu_pool
+    
+    def _build_cpu_pool(self) -> Executor:
+        if self.cpu_workers:
+            try:
+                context = _process_context()
+                if context.get_start_method() == "forkserver":
+                    # Start the server now, from the process as it is, rather than on first submit
+                    from multiprocessing import forkserver
+                    forkserver.ensure_running()
+                return ProcessPoolExecutor(max_workers=self.cpu_workers, mp_context=context)
+            except (OSError, NotImplementedError) as e:
+                print(f"Process pool unavailable, running CPU work on threads: {e}")
+        return self.io_pool
+    
+    def startup(self) -> None:
+        """Create the CPU pool before the application starts its background threads"""
+        self.cpu_pool  # property access builds it
+    
+    def submit_io(self, fn: Callable, *args, **kwargs) -> Future:
+        """Submit blocking I/O to the thread pool"""
+        return self._submit(self.io_pool, self.io_metrics, functools.partial(fn, *args, **kwargs))
+    
+    def submit_cpu(self, fn: Callable, *args) -> Future:
+        """Submit CPU-bound work to the process pool; fn and args must be picklable"""
+        return self._submit(self.cpu_pool, self.cpu_metrics, functools.partial(fn, *args))
+    
+    async def run_io(self, fn: Callable, *args, **kwargs) -> Any:
+        """Await blocking I/O without holding the event loop"""
+        return await asyncio.wrap_future(self.submit_io(fn, *args, **kwargs))
+    
+    async def run_cpu(self, fn: Callable, *args) -> Any:
+        """Await CPU-bound work without holding the event loop or the GIL"""
+        return await asyncio.wrap_future(self.submit_cpu(fn, *args))
+    
+    @staticmethod
+    def _submit(pool: Executor, metrics: PoolMetrics, call: Callable) -> Future:
+        started = metrics.on_submit()
+        try:
+            future = pool.submit(call)
+        except Exception:
+            metrics.on_reject()
+            raise
+        future.add_done_callback(lambda f: metrics.on_done(f, started))
+        return future
+    
+    def stats(self) -> Dict[str, Any]:
+        """Saturation metrics for both pools"""
+        return {
+            "io": self.io_metrics.snapshot(),
+            "cpu": {**self.cpu_metrics.snapshot(), "processes": isinstance(self._cpu_pool, ProcessPoolExecutor)},
+        }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop both pools"""
+        with self._lock:
+            cpu_pool, io_pool = self._cpu_pool, self._io_pool
+            self._cpu_pool = self._io_pool = None
+        if cpu_pool is not None and cpu_pool is not io_pool:
+            cpu_pool.shutdown(wait=wait, cancel_futures=True)
+        if io_pool is not None:
+            io_pool.shutdown(wait=wait)
+
+
+# Process-wide execution layer shared by every service
+executor = ExecutionLayer()
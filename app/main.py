@@ -1,13 +1,32 @@
 """
 Main FastAPI application
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 import uvicorn
 
 from app.core.config import settings
-from app.api.routes import router
+from app.core.executor import executor
+from app.api.routes import router, article_service, html_service, upload_queue, job_service
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared application-lifetime clients on startup and close them on shutdown"""
+    executor.startup()
+    await html_service.startup()
+    await upload_queue.startup()
+    await job_service.startup()
+    try:
+        yield
+    finally:
+        await job_service.shutdown()
+        await upload_queue.shutdown()
+        await html_service.shutdown()
+        await article_service.extractor.shutdown()
+        executor.shutdown(wait=False)
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -15,7 +34,8 @@ app = FastAPI(
     description=settings.DESCRIPTION,
     version=settings.VERSION,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -23,6 +23,8 @@ class ContentGeneration(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     result_data = Column(JSON, nullable=True)
     error_message = Column(Text, nullable=True)
+    claimed_by = Column(String(100), nullable=True)  # job worker holding the lease while processing
+    claimed_at = Column(DateTime(timezone=True), nullable=True)  # last lease renewal
 
 
 class TTSGeneration(Base):
@@ -37,6 +39,8 @@ class TTSGeneration(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     result_data = Column(JSON, nullable=True)
     error_message = Column(Text, nullable=True)
+    claimed_by = Column(String(100), nullable=True)  # job worker holding the lease while processing
+    claimed_at = Column(DateTime(timezone=True), nullable=True)  # last lease renewal
 
 
 class PublishedStory(Base):
@@ -55,7 +59,7 @@ class PublishedStory(Base):
     status = Column(String(20), default="published")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    metadata = Column(JSON, nullable=True)
+    story_metadata = Column("metadata", JSON, nullable=True)  # "metadata" is reserved on declarative models
 
 
 class FileUpload(Base):
@@ -56,6 +56,19 @@ class ArticleGenerationRequest(BaseModel):
     persona: PersonaEnum = Field(..., description="Target audience persona")
     content_language: LanguageEnum = Field(..., description="Content language")
     number_of_slides: int = Field(default=10, ge=0, le=1000, description="Number of slides to generate")
+    single_shot: Optional[bool] = Field(None, description="Generate all slide scripts in one structured LLM call (defaults to LLM_SINGLE_SHOT)")
+
+
+class BatchArticleGenerationRequest(BaseModel):
+    """Request model for batch article generation"""
+    urls: List[HttpUrl] = Field(..., min_length=1, max_length=500, description="News article URLs")
+    persona: PersonaEnum = Field(..., description="Target audience persona")
+    content_language: LanguageEnum = Field(..., description="Content language")
+    number_of_slides: int = Field(default=10, ge=0, le=1000, description="Number of slides to generate")
+    single_shot: Optional[bool] = Field(None, description="Generate all slide scripts in one structured LLM call (defaults to LLM_SINGLE_SHOT)")
+    generate_tts: bool = Field(default=False, description="Also synthesize and upload TTS for each story")
+    voice: str = Field(default="alloy", description="Voice to use when generate_tts is set")
+    concurrency: Optional[int] = Field(None, ge=1, description="Stories processed at once (capped at BATCH_CONCURRENCY)")
 
 
 class TTSGenerationRequest(BaseModel):
@@ -64,6 +77,11 @@ class TTSGenerationRequest(BaseModel):
     voice: str = Field(default="alloy", description="Voice to use for TTS")
 
 
+class TTSJobRequest(TTSGenerationRequest):
+    """Request model for a queued TTS generation job"""
+    content_generation_id: Optional[int] = Field(None, description="Article job the slides came from")
+
+
 class HTMLProcessingRequest(BaseModel):
     """Request model for HTML processing (Tab 3)"""
     full_slide_json: Dict[str, Any] = Field(..., description="Full slide JSON with slide1 to slide8")
@@ -179,6 +197,7 @@ class HTMLProcessingResponse(BaseModel):
     download_url: Optional[str] = None
     html_s3_url: Optional[str] = None
     json_s3_url: Optional[str] = None
+    upload_job_id: Optional[str] = None  # Poll /uploads/{id}; the S3 URLs go live once it completes
 
 
 class AMPGenerationResponse(BaseModel):
@@ -187,6 +206,7 @@ class AMPGenerationResponse(BaseModel):
     filename: str
     download_url: Optional[str] = None
     html_s3_url: Optional[str] = None
+    upload_job_id: Optional[str] = None  # Poll /uploads/{id}; the S3 URL goes live once it completes
 
 
 class MetadataResponse(BaseModel):
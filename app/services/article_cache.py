@@ -0,0 +1,121 @@
+"""
+Fetched-article cache for Suvichaar FastAPI Service
+"""
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core.config import settings
+from app.utils.cache import MemoryCache, SQLiteCache, TieredCache
+
+
+# Query parameters that never change the page content
+_TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "ref_src"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key for an article URL: lowercase host, no fragment/default port/tracking params"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class ArticleCache:
+    """
+    Extracted (title, summary, full_text) per normalized URL with the page's validators.
+    Entries younger than fresh_ttl are served without any request; older ones are revalidated
+    with If-None-Match/If-Modified-Since until the storage TTL drops them.
+    """
+    
+    def __init__(self, cache: TieredCache, fresh_ttl: float = 0, enabled: bool = True):
+        self.cache = cache
+        self.fresh_ttl = fresh_ttl
+        self.enabled = enabled
+        self.revalidated = 0
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for a URL, fresh or not"""
+        if not self.enabled:
+            return None
+        return self.cache.get(normalize_url(url))
+    
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Whether an entry can be served without revalidating"""
+        return time.time() - entry["checked_at"] < self.fresh_ttl
+    
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Validator headers for revalidating an entry"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+    
+    @staticmethod
+    def article(entry: Dict[str, Any]) -> Tuple[str, str, str]:
+        """The (title, summary, full_text) stored in an entry"""
+        return entry["title"], entry["summary"], entry["full_text"]
+    
+    def set(self, url: str, article: Tuple[str, str, str], headers: Mapping[str, str]) -> None:
+        """Store a freshly extracted article with the response's validators"""
+        if not self.enabled:
+            return
+        title, summary, full_text = article
+        self.cache.set(normalize_url(url), {
+            "title": title,
+            "summary": summary,
+            "full_text": full_text,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "checked_at": time.time(),
+        })
+    
+    def mark_revalidated(self, url: str, entry: Dict[str, Any], headers: Mapping[str, str]) -> None:
+        """Restart an entry's freshness after a 304, picking up any updated validators"""
+        self.revalidated += 1
+        self.cache.set(normalize_url(url), {
+            **entry,
+            "etag": headers.get("etag") or entry.get("etag"),
+            "last_modified": headers.get("last-modified") or entry.get("last_modified"),
+            "checked_at": time.time(),
+        })
+    
+    def clear(self) -> None:
+        """Drop every cached article"""
+        self.cache.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/revalidation counters and tier sizes"""
+        return {"enabled": self.enabled, "revalidated": self.revalidated, **self.cache.stats()}
+
+
+def build_article_cache() -> ArticleCache:
+    """Create the article cache configured in settings"""
+    ttl = settings.ARTICLE_CACHE_TTL_SECONDS or None
+    memory = MemoryCache(
+        max_entries=settings.ARTICLE_CACHE_MAX_ENTRIES,
+        max_bytes=settings.ARTICLE_CACHE_MAX_BYTES,
+        ttl=ttl
+    )
+    disk = None
+    if settings.ARTICLE_CACHE_SQLITE_PATH:
+        disk = SQLiteCache(settings.ARTICLE_CACHE_SQLITE_PATH, max_entries=settings.ARTICLE_CACHE_SQLITE_MAX_ENTRIES, ttl=ttl)
+    return ArticleCache(
+        TieredCache(memory, disk),
+        fresh_ttl=settings.ARTICLE_CACHE_FRESH_SECONDS,
+        enabled=settings.ARTICLE_CACHE_ENABLED
+    )
+
+
+# Process-wide cache shared by every ArticleExtractor
+article_cache = build_article_cache()
@@ -0,0 +1,274 @@
+"""
+Streaming article extraction for Suvichaar FastAPI Service
+"""
+import asyncio
+import codecs
+import re
+from typing import Iterable, List, Optional, Tuple
+
+import httpx
+import requests
+from bs4 import BeautifulSoup
+from bs4.dammit import EncodingDetector
+
+from app.core.config import settings
+from app.services.article_cache import ArticleCache, article_cache
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+
+# Content containers in priority order; the first match wins
+CONTENT_SELECTORS = [
+    'article',
+    '.article-content',
+    '.post-content',
+    '.entry-content',
+    '.content',
+    'main',
+    '.main-content'
+]
+NO_CONTENT = "No article content available."
+UNTITLED = "Untitled Article"
+
+_NON_TEXT_TAGS = ("script", "style", "template")
+_CHARSET_PATTERN = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+
+
+def header_charset(content_type: Optional[str]) -> Optional[str]:
+    """Charset declared in a Content-Type header, if any"""
+    match = _CHARSET_PATTERN.search(content_type or "")
+    return match.group(1) if match else None
+
+
+def detect_charset(chunk: bytes) -> str:
+    """Encoding of a page from its first chunk: a BOM or <meta charset>, else UTF-8 if it decodes, else windows-1252"""
+    _, declared = EncodingDetector.strip_byte_order_mark(chunk)
+    declared = declared or EncodingDetector.find_declared_encoding(chunk, is_html=True)
+    if declared:
+        try:
+            return codecs.lookup(declared).name
+        except LookupError:
+            pass
+    try:
+        # Not final, so a multi-byte character cut off at the chunk end still counts as UTF-8
+        codecs.getincrementaldecoder("utf-8")().decode(chunk, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "windows-1252"
+
+
+def summarize(content_text: str) -> str:
+    """First 300 characters of the article text"""
+    return content_text[:300] + "..." if len(content_text) > 300 else content_text
+
+
+def _selector_matches(selector: str, tag: str, classes: List[str]) -> bool:
+    """Match a tag or .class selector against an element"""
+    if selector.startswith("."):
+        return selector[1:] in classes
+    return tag == selector
+
+
+def _element_text(element) -> str:
+    """Text of an lxml element, without script/style contents (as BeautifulSoup's get_text)"""
+    etree.strip_elements(element, *_NON_TEXT_TAGS, with_tail=False)
+    return "".join(element.itertext())
+
+
+class StreamingArticleParser:
+    """
+    Incremental lxml parse that tracks the title and the first element matching each content
+    selector. Once the first <article> has closed nothing better can follow, so feed()
+    reports that the rest of the page can be skipped.
+    """
+    
+    def __init__(self, encoding: Optional[str] = None):
+        self._parser = etree.HTMLPullParser(
+            events=("start", "end"), encoding=encoding, remove_comments=True, remove_pis=True
+        )
+        self._root = None
+        self._matches = {}  # selector index -> first matching element
+        self.title: Optional[str] = None
+        self.complete = False
+    
+    def feed(self, chunk: bytes) -> bool:
+        """Parse a chunk; returns True when the remaining input can be skipped"""
+        self._parser.feed(chunk)
+        self._read_events()
+        return self.complete
+    
+    def close(self) -> None:
+        """Finish parsing whatever input was fed"""
+        if not self.complete:
+            try:
+                self._parser.close()
+            except etree.XMLSyntaxError:
+                pass  # empty or unparseable document
+            self._read_events()
+    
+    def _read_events(self) -> None:
+        for event, element in self._parser.read_events():
+            if self._root is None:
+                self._root = element.getroottree().getroot()
+            if not isinstance(element.tag, str):
+                continue
+            tag = element.tag.lower()
+            if event == "start":
+                classes = (element.get("class") or "").split()
+                for index, selector in enumerate(CONTENT_SELECTORS):
+                    if index not in self._matches and _selector_matches(selector, tag, classes):
+                        self._matches[index] = element
+            elif tag == "title" and self.title is None:
+                self.title = _element_text(element).strip()
+            elif self._matches.get(0) is element:
+                self.complete = True
+                return
+    
+    def result(self) -> Tuple[str, str]:
+        """(title, content text) using the same fallbacks as the original extractor"""
+        content_text = ""
+        if self._matches:
+            content_text = _element_text(self._matches[min(self._matches)]).strip()
+        
+        if not content_text and self._root is not None:
+            content_text = ' '.join(_element_text(p).strip() for p in self._root.iter("p"))
+        
+        return self.title or UNTITLED, content_text or NO_CONTENT
+
+
+def extract_with_soup(content: bytes) -> Tuple[str, str]:
+    """(title, content text) via BeautifulSoup's html.parser, used when lxml is unavailable"""
+    soup = BeautifulSoup(content, 'html.parser')
+    
+    title_tag = soup.find('title')
+    title = title_tag.get_text().strip() if title_tag else UNTITLED
+    
+    content_text = ""
+    for selector in CONTENT_SELECTORS:
+        content_elem = soup.select_one(selector)
+        if content_elem:
+            content_text = content_elem.get_text().strip()
+            break
+    
+    if not content_text:
+        paragraphs = soup.find_all('p')
+        content_text = ' '.join([p.get_text().strip() for p in paragraphs])
+    
+    return title, content_text or NO_CONTENT
+
+
+class ExtractionSession:
+    """One page's extraction: takes body chunks up to a byte cap and reports when it has enough"""
+    
+    def __init__(self, max_bytes: int, encoding: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.received = 0
+        self.encoding = encoding
+        # Created on the first chunk, so a page without a header charset is decoded as detected
+        # rather than lxml's Latin-1 default
+        self._parser: Optional[StreamingArticleParser] = None
+        self._body = bytearray()
+    
+    def push(self, chunk: bytes) -> bool:
+        """Consume a chunk; returns True once the content is complete or the cap is reached"""
+        chunk = chunk[:self.max_bytes - self.received]
+        self.received += len(chunk)
+        if LXML_AVAILABLE:
+            if self._parser is None:
+                self.encoding = self.encoding or detect_charset(chunk)
+                self._parser = StreamingArticleParser(self.encoding)
+            done = self._parser.feed(chunk)
+        else:
+            self._body += chunk
+            done = False
+        return done or self.received >= self.max_bytes
+    
+    def finish(self) -> Tuple[str, str, str]:
+        """(title, summary, full text)"""
+        if LXML_AVAILABLE:
+            if self._parser is None:
+                self._parser = StreamingArticleParser(self.encoding or "utf-8")
+            self._parser.close()
+            title, content_text = self._parser.result()
+        else:
+            title, content_text = extract_with_soup(bytes(self._body))
+        return title, summarize(content_text), content_text
+
+
+class ArticleExtractor:
+    """Fetches article pages as capped streams and extracts title, summary and text while parsing"""
+    
+    def __init__(self, max_bytes: int = settings.ARTICLE_MAX_BYTES,
+                 timeout: float = settings.ARTICLE_FETCH_TIMEOUT,
+                 cache: Optional[ArticleCache] = None):
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.cache = cache or article_cache
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def parse(self, chunks: Iterable[bytes], encoding: Optional[str] = None) -> Tuple[str, str, str]:
+        """Extract from already-fetched body chunks"""
+        session = ExtractionSession(self.max_bytes, encoding)
+        for chunk in chunks:
+            if session.push(chunk):
+                break
+        return session.finish()
+    
+    def extract(self, url: str) -> Tuple[str, str, str]:
+        """Blocking fetch-and-extract, served from the article cache when possible"""
+        entry = self.cache.get(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            return self.cache.article(entry)
+        
+        headers = self.cache.conditional_headers(entry)
+        with requests.get(url, timeout=self.timeout, stream=True, headers=headers) as response:
+            if response.status_code == 304 and entry is not None:
+                self.cache.mark_revalidated(url, entry, response.headers)
+                return self.cache.article(entry)
+            response.raise_for_status()
+            article = self.parse(
+                response.iter_content(chunk_size=64 * 1024),
+                header_charset(response.headers.get("content-type"))
+            )
+        self.cache.set(url, article, response.headers)
+        return article
+    
+    async def extract_async(self, url: str) -> Tuple[str, str, str]:
+        """Fetch-and-extract without blocking; chunks are parsed as they arrive"""
+        entry = self.cache.get(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            return self.cache.article(entry)
+        
+        headers = self.cache.conditional_headers(entry)
+        async with self._get_client().stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and entry is not None:
+                self.cache.mark_revalidated(url, entry, response.headers)
+                return self.cache.article(entry)
+            response.raise_for_status()
+            session = ExtractionSession(self.max_bytes, header_charset(response.headers.get("content-type")))
+            async for chunk in response.aiter_bytes():
+                if session.push(chunk):
+                    break
+        article = session.finish()
+        self.cache.set(url, article, response.headers)
+        return article
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Keep-alive client for article fetches, recreated if the event loop changed"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=True)
+            self._client_loop = loop
+        return self._client
+    
+    async def shutdown(self) -> None:
+        """Close the HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
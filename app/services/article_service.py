@@ -2,6 +2,7 @@
 Core service classes for Suvichaar FastAPI Service
 """
 import json
+import asyncio
 import time
 import os
 import uuid
@@ -14,28 +15,104 @@ import string
 import base64
 import re
 import textwrap
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, NamedTuple, Optional, Tuple
 from urllib.parse import urlparse
 from io import BytesIO
 from datetime import datetime, timezone
 from collections import OrderedDict
-from openai import AzureOpenAI
+from concurrent.futures import ThreadPoolExecutor
 from textblob import TextBlob
 from bs4 import BeautifulSoup
 
 from app.core.config import settings
+from app.core.executor import executor
+from app.services.article_extractor import ArticleExtractor
+from app.services.llm_cache import LLMResponseCache, llm_cache
+from app.services.llm_pool import DeploymentPool, llm_pool
+
+# Progress callback: receives a stage name and that stage's output as soon as it is ready
+StageCallback = Callable[[str, Dict[str, Any]], None]
+
+
+def ignore_stage(stage: str, data: Dict[str, Any]) -> None:
+    """Default StageCallback for callers that do not track progress"""
+
+
+def sentiment_polarity(text: str) -> float:
+    """TextBlob polarity of text; module-level so it can run in the CPU process pool"""
+    return TextBlob(text).sentiment.polarity
+
+
+NARRATION_FALLBACK = "Unable to generate narration for this slide."
+
+# Response schema for single-shot slide script generation
+SINGLE_SHOT_SCHEMA = {
+    "type": "object",
+    "required": ["intro_script", "slides"],
+    "properties": {
+        "intro_script": {"type": "string", "minLength": 1},
+        "slides": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["title", "prompt", "script"],
+                "properties": {
+                    "title": {"type": "string", "minLength": 1},
+                    "prompt": {"type": "string", "minLength": 1},
+                    "script": {"type": "string", "minLength": 1}
+                }
+            }
+        }
+    }
+}
+
+_JSON_TYPES = {"object": dict, "array": list, "string": str}
+
+
+def matches_schema(value: Any, schema: Dict[str, Any]) -> bool:
+    """Validate a value against the subset of JSON Schema used by SINGLE_SHOT_SCHEMA"""
+    expected = _JSON_TYPES.get(schema.get("type"))
+    if expected and not isinstance(value, expected):
+        return False
+    if isinstance(value, dict):
+        if any(key not in value for key in schema.get("required", [])):
+            return False
+        for key, subschema in schema.get("properties", {}).items():
+            if key in value and not matches_schema(value[key], subschema):
+                return False
+    if isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            return False
+        if "items" in schema and not all(matches_schema(item, schema["items"]) for item in value):
+            return False
+    if isinstance(value, str) and len(value.strip()) < schema.get("minLength", 0):
+        return False
+    return True
+
+
+class LLMStep(NamedTuple):
+    """One completion request and how to read its reply, shared by the sync and async paths"""
+    label: str
+    messages: List[Dict[str, str]]
+    # Returns None for an unusable reply; only usable replies are cached
+    parse: Callable[[str], Any]
+    # Result used when the call fails or the reply is unusable; without one, call errors propagate
+    fallback: Optional[Callable[[], Any]] = None
+    params: Optional[Dict[str, Any]] = None
 
 
 class ArticleService:
     """Service for article extraction and analysis"""
     
-    def __init__(self):
-        self.client = AzureOpenAI(
-            azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
-            api_key=settings.AZURE_OPENAI_API_KEY,
-            api_version=settings.AZURE_OPENAI_API_VERSION
-        )
+    def __init__(self, cache: Optional[LLMResponseCache] = None, pool: Optional[DeploymentPool] = None):
+        self.pool = pool or llm_pool
+        # Logical model name: cache keys stay the same whichever deployment serves a call
         self.deployment_name = settings.AZURE_OPENAI_DEPLOYMENT_NAME
+        self.narration_concurrency = max(1, settings.NARRATION_CONCURRENCY)
+        self.single_shot = settings.LLM_SINGLE_SHOT
+        self.cache = cache or llm_cache
+        self.extractor = ArticleExtractor()
         
         # Setup NLTK
         try:
@@ -46,52 +123,14 @@ class ArticleService:
     def extract_article(self, url: str) -> Tuple[str, str, str]:
         """Extract article content from URL"""
         try:
-            import requests
-            from bs4 import BeautifulSoup
-            
-            # Use requests and BeautifulSoup instead of newspaper
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract title
-            title_tag = soup.find('title')
-            title = title_tag.get_text().strip() if title_tag else "Untitled Article"
-            
-            # Extract main content
-            # Try to find article content in common tags
-            content_selectors = [
-                'article',
-                '.article-content',
-                '.post-content',
-                '.entry-content',
-                '.content',
-                'main',
-                '.main-content'
-            ]
-            
-            content_text = ""
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    content_text = content_elem.get_text().strip()
-                    break
-            
-            # If no specific content found, get all paragraph text
-            if not content_text:
-                paragraphs = soup.find_all('p')
-                content_text = ' '.join([p.get_text().strip() for p in paragraphs])
-            
-            # Fallback for missing content
-            if not content_text:
-                content_text = "No article content available."
-            
-            # Generate summary (first 300 characters)
-            summary = content_text[:300] + "..." if len(content_text) > 300 else content_text
-            
-            return title, summary, content_text
-            
+            return self.extractor.extract(url)
+        except Exception as e:
+            raise Exception(f"Failed to extract article from URL: {str(e)}")
+    
+    async def extract_article_async(self, url: str) -> Tuple[str, str, str]:
+        """Extract article content from URL, streaming and parsing on the event loop"""
+        try:
+            return await self.extractor.extract_async(url)
         except Exception as e:
             raise Exception(f"Failed to extract article from URL: {str(e)}")
     
@@ -101,8 +140,19 @@ class ArticleService:
             return "neutral"
         
         clean_text = text.strip().replace("\n", " ")
-        polarity = TextBlob(clean_text).sentiment.polarity
+        return self._sentiment_label(sentiment_polarity(clean_text))
+    
+    async def get_sentiment_async(self, text: str) -> str:
+        """Analyze sentiment of text in the CPU process pool"""
+        if not text or not text.strip():
+            return "neutral"
         
+        clean_text = text.strip().replace("\n", " ")
+        return self._sentiment_label(await executor.run_cpu(sentiment_polarity, clean_text))
+    
+    @staticmethod
+    def _sentiment_label(polarity: float) -> str:
+        """Map a polarity score to a sentiment label"""
         if polarity > 0.2:
             return "positive"
         elif polarity < -0.2:
@@ -110,16 +160,77 @@ class ArticleService:
         else:
             return "neutral"
     
-    def detect_category_and_subcategory(self, text: str, content_language: str = "English") -> Dict[str, str]:
-        """Detect category, subcategory, and emotion"""
-        if not text or len(text.strip()) < 50:
-            return {
-                "category": "Unknown",
-                "subcategory": "General",
-                "emotion": "Neutral"
-            }
+    
+    # === LLM helpers ===
+    
+    def complete(self, messages: List[Dict[str, str]], validate: Optional[Callable[[str], bool]] = None,
+                 **params) -> str:
+        """
+        Run a rate-limited chat completion on the deployment pool and return the stripped message content.
+        Replies are cached only when validate (if given) accepts them, so malformed ones are asked for again.
+        """
+        cache_key = self.cache.make_key(self.deployment_name, messages, params)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        response = self.pool.complete(messages, params)
+        content = response.choices[0].message.content.strip()
+        self._cache_reply(cache_key, content, validate)
+        return content
+    
+    async def complete_async(self, messages: List[Dict[str, str]], validate: Optional[Callable[[str], bool]] = None,
+                             **params) -> str:
+        """Run a rate-limited chat completion on the deployment pool without blocking; caching as in complete"""
+        cache_key = self.cache.make_key(self.deployment_name, messages, params)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Prompt construction based on language
+        response = await self.pool.complete_async(messages, params)
+        content = response.choices[0].message.content.strip()
+        self._cache_reply(cache_key, content, validate)
+        return content
+    
+    def _cache_reply(self, cache_key: str, content: str, validate: Optional[Callable[[str], bool]]) -> None:
+        if validate is None or validate(content):
+            self.cache.set(cache_key, content)
+    
+    def _run_step(self, step: LLMStep) -> Any:
+        """Run an LLM step and return its parsed result or fallback"""
+        try:
+            content = self.complete(step.messages, validate=lambda reply: step.parse(reply) is not None,
+                                    **(step.params or {}))
+        except Exception as e:
+            return self._step_failed(step, e)
+        return self._step_result(step, content)
+    
+    async def _run_step_async(self, step: LLMStep) -> Any:
+        """Run an LLM step without blocking the event loop and return its parsed result or fallback"""
+        try:
+            content = await self.complete_async(step.messages, validate=lambda reply: step.parse(reply) is not None,
+                                                **(step.params or {}))
+        except Exception as e:
+            return self._step_failed(step, e)
+        return self._step_result(step, content)
+    
+    def _step_failed(self, step: LLMStep, error: Exception) -> Any:
+        if step.fallback is None:
+            raise error
+        print(f"{step.label} failed: {error}")
+        return step.fallback()
+    
+    def _step_result(self, step: LLMStep, content: str) -> Any:
+        result = step.parse(content)
+        if result is None and step.fallback is not None:
+            print(f"{step.label} returned a malformed reply, using its fallback")
+            return step.fallback()
+        return result
+    
+    # === Prompt builders ===
+    
+    def _category_messages(self, text: str, content_language: str) -> List[Dict[str, str]]:
+        """Build the category/subcategory/emotion classification messages"""
         if content_language == "Hindi":
             prompt = f"""
 आप एक समाचार विश्लेषण विशेषज्ञ हैं।
@@ -160,36 +271,32 @@ Return ONLY as JSON:
   "emotion": "..."
 }}
 """
-        
+        return [
+            {"role": "system", "content": "Classify the news into category, subcategory, and emotion."},
+            {"role": "user", "content": prompt.strip()}
+        ]
+    
+    def _parse_category(self, content: str) -> Optional[Dict[str, str]]:
+        """Parse the classification JSON, returning None if it is malformed or keys are missing"""
+        content = content.strip("```json").strip("```").strip()
         try:
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": "Classify the news into category, subcategory, and emotion."},
-                    {"role": "user", "content": prompt.strip()}
-                ],
-                max_tokens=150
-            )
-            
-            content = response.choices[0].message.content.strip()
-            content = content.strip("```json").strip("```").strip()
-            
             result = json.loads(content)
-            
-            if all(k in result for k in ["category", "subcategory", "emotion"]):
-                return result
-                
-        except Exception as e:
-            print(f"Category detection failed: {e}")
-        
+        except ValueError:
+            return None
+        if isinstance(result, dict) and all(k in result for k in ["category", "subcategory", "emotion"]):
+            return result
+        return None
+    
+    def _default_category(self) -> Dict[str, str]:
+        """Fallback classification"""
         return {
             "category": "Unknown",
             "subcategory": "General",
             "emotion": "Neutral"
         }
     
-    def generate_hookline(self, title: str, summary: str, content_language: str = "English") -> str:
-        """Generate hookline for the story"""
+    def _hookline_messages(self, title: str, summary: str, content_language: str) -> List[Dict[str, str]]:
+        """Build the hookline generation messages"""
         if content_language == "Hindi":
             prompt = f"""
 आप 'पोलारिस' नामक एक सोशल मीडिया रणनीतिकार हैं और चैनल 'सुविचार' के लिए कार्य करते हैं। आपका कार्य है एक संक्षिप्त, ध्यान खींचने वाली *हुकलाइन* बनाना जो इस समाचार की ओर दर्शकों का ध्यान आकर्षित करे।
@@ -226,25 +333,18 @@ Requirements:
 
 Now generate the hookline in Polaris' tone:
 """
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": "You create viral hooklines for news stories."},
-                    {"role": "user", "content": prompt.strip()}
-                ]
-            )
-            return response.choices[0].message.content.strip().strip('"')
-            
-        except Exception as e:
-            print(f"Hookline generation failed: {e}")
-            return "यह खबर आपको चौंका सकती है!" if content_language == "Hindi" else "This story might surprise you!"
+        return [
+            {"role": "system", "content": "You create viral hooklines for news stories."},
+            {"role": "user", "content": prompt.strip()}
+        ]
     
-    def generate_storytitle(self, title: str, summary: str, content_language: str = "English") -> str:
-        """Generate story title"""
-        if content_language == "Hindi":
-            prompt = f"""
+    def _default_hookline(self, content_language: str) -> str:
+        """Fallback hookline"""
+        return "यह खबर आपको चौंका सकती है!" if content_language == "Hindi" else "This story might surprise you!"
+    
+    def _storytitle_messages(self, title: str, summary: str) -> List[Dict[str, str]]:
+        """Build the Hindi story title messages"""
+        prompt = f"""
 आप एक समाचार शीर्षक विशेषज्ञ हैं। नीचे दी गई अंग्रेज़ी समाचार शीर्षक और सारांश को पढ़कर, उसी का अर्थ बनाए रखते हुए एक नया आकर्षक **हिंदी शीर्षक** बनाइए।
 
 अंग्रेज़ी शीर्षक: {title}
@@ -258,34 +358,21 @@ Now generate the hookline in Polaris' tone:
 
 अब कृपया हिंदी शीर्षक दीजिए:
 """
-        else:
-            return title.strip()
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": "You generate clear and catchy news headlines."},
-                    {"role": "user", "content": prompt.strip()}
-                ]
-            )
-            return response.choices[0].message.content.strip().strip('"')
-            
-        except Exception as e:
-            print(f"Storytitle generation failed: {e}")
-            return title.strip()
+        return [
+            {"role": "system", "content": "You generate clear and catchy news headlines."},
+            {"role": "user", "content": prompt.strip()}
+        ]
     
-    def title_script_generator(self, category: str, subcategory: str, emotion: str, 
-                              article_text: str, content_language: str = "English", 
-                              character_sketch: Optional[str] = None) -> Dict[str, Any]:
-        """Generate title and script for slides"""
-        if not character_sketch:
-            character_sketch = (
-                f"Polaris is a sincere and articulate {content_language} news anchor. "
-                "They present facts clearly, concisely, and warmly, connecting deeply with their audience."
-            )
-        
-        # Generate slides
+    def _default_character_sketch(self, content_language: str) -> str:
+        """Default Polaris character sketch"""
+        return (
+            f"Polaris is a sincere and articulate {content_language} news anchor. "
+            "They present facts clearly, concisely, and warmly, connecting deeply with their audience."
+        )
+    
+    def _outline_messages(self, category: str, subcategory: str, emotion: str,
+                          article_text: str, content_language: str) -> List[Dict[str, str]]:
+        """Build the slide outline messages"""
         system_prompt = f"""
 You are a digital content editor.
 
@@ -316,51 +403,48 @@ Emotion: {emotion}
 Article:
 \"\"\"{article_text[:3000]}\"\"\"
 """
-        
-        response = self.client.chat.completions.create(
-            model=self.deployment_name,
-            messages=[
-                {"role": "system", "content": system_prompt.strip()},
-                {"role": "user", "content": user_prompt.strip()}
-            ]
-        )
-        
-        content = response.choices[0].message.content.strip()
+        return [
+            {"role": "system", "content": system_prompt.strip()},
+            {"role": "user", "content": user_prompt.strip()}
+        ]
+    
+    def _parse_outline(self, content: str) -> Optional[List[Dict[str, Any]]]:
+        """Parse the slide outline JSON, returning None if it is malformed"""
         content = content.strip("```json").strip("```").strip()
-        
         try:
-            slides_raw = json.loads(content)["slides"]
+            return json.loads(content)["slides"]
         except:
-            return {"category": category, "subcategory": subcategory, "emotion": emotion, "slides": []}
-        
-        # Generate Slide 1 Intro Narration
-        headline = article_text.split("\n")[0].strip().replace('"', '')
-        
+            return None
+    
+    def _headline(self, article_text: str) -> str:
+        """First line of the article, used for the intro slide"""
+        return article_text.split("\n")[0].strip().replace('"', '')
+    
+    def _intro_messages(self, headline: str, content_language: str) -> List[Dict[str, str]]:
+        """Build the slide 1 intro narration messages"""
         if content_language == "Hindi":
             slide1_prompt = f"Generate a greeting and news headline narration in Hindi for the story: {headline}"
         else:
             slide1_prompt = f"Generate a greeting and headline intro narration in English for: {headline}"
-        
-        slide1_response = self.client.chat.completions.create(
-            model=self.deployment_name,
-            messages=[
-                {"role": "system", "content": "You are a news presenter generating opening lines."},
-                {"role": "user", "content": slide1_prompt}
-            ]
-        )
-        slide1_script = slide1_response.choices[0].message.content.strip()
-        
-        slides = [{
+        return [
+            {"role": "system", "content": "You are a news presenter generating opening lines."},
+            {"role": "user", "content": slide1_prompt}
+        ]
+    
+    def _intro_slide(self, headline: str, script: str) -> Dict[str, str]:
+        """Build the intro slide entry"""
+        return {
             "title": headline[:80],
             "prompt": "Intro slide with greeting and headline.",
             "image_prompt": f"Vector-style illustration of Polaris presenting news: {headline}",
-            "script": slide1_script
-        }]
-        
-        # Generate narration for each slide
-        for slide in slides_raw:
-            script_language = f"{content_language} (use Devanagari script)" if content_language == "Hindi" else content_language
-            narration_prompt = f"""
+            "script": script
+        }
+    
+    def _narration_messages(self, slide: Dict[str, Any], content_language: str,
+                            character_sketch: str) -> List[Dict[str, str]]:
+        """Build the narration messages for one outline slide"""
+        script_language = f"{content_language} (use Devanagari script)" if content_language == "Hindi" else content_language
+        narration_prompt = f"""
 Write a narration in **{script_language}** (max 200 characters),
 in the voice of Polaris.
 
@@ -370,29 +454,305 @@ Tone: Warm, clear, informative. No self-intro.
 Character sketch:
 {character_sketch}
 """
-            
-            try:
-                narration_response = self.client.chat.completions.create(
-                    model=self.deployment_name,
-                    messages=[
-                        {"role": "system", "content": "You write concise narrations for web story slides."},
-                        {"role": "user", "content": narration_prompt.strip()}
-                    ]
-                )
-                narration = narration_response.choices[0].message.content.strip()
-            except:
-                narration = "Unable to generate narration for this slide."
-            
-            slides.append({
-                "title": slide['title'],
-                "prompt": slide['prompt'],
-                "image_prompt": f"Modern vector-style visual for: {slide['title']}",
-                "script": narration
-            })
+        return [
+            {"role": "system", "content": "You write concise narrations for web story slides."},
+            {"role": "user", "content": narration_prompt.strip()}
+        ]
+    
+    def _content_slide(self, slide: Dict[str, Any], narration: str) -> Dict[str, str]:
+        """Build a narrated content slide entry"""
+        return {
+            "title": slide['title'],
+            "prompt": slide['prompt'],
+            "image_prompt": f"Modern vector-style visual for: {slide['title']}",
+            "script": narration
+        }
+    
+    def _single_shot_messages(self, category: str, subcategory: str, emotion: str, article_text: str,
+                              content_language: str, character_sketch: str) -> List[Dict[str, str]]:
+        """Build the messages that request outline, intro and narrations in one response"""
+        script_language = f"{content_language} (use Devanagari script)" if content_language == "Hindi" else content_language
+        headline = self._headline(article_text)
+        system_prompt = f"""
+You are a digital content editor and the news presenter Polaris.
+
+Create a structured 5-slide web story from the article below, in one response.
+
+Language: {content_language}
+
+Return:
+- "intro_script": a greeting and headline intro narration in {script_language} for: {headline}
+- "slides": 5 slides, each with
+  - "title": a short title in {content_language}
+  - "prompt": a narration instruction for the slide
+  - "script": the narration itself in **{script_language}** (max 200 characters), in the voice of Polaris.
+    Tone: Warm, clear, informative. No self-intro.
+{"- Titles and prompts must be written in Hindi (Devanagari script)." if content_language == "Hindi" else ""}
+
+Character sketch:
+{character_sketch}
+
+Respond ONLY with JSON matching this schema:
+{json.dumps(SINGLE_SHOT_SCHEMA)}
+"""
+        
+        user_prompt = f"""
+Category: {category}
+Subcategory: {subcategory}
+Emotion: {emotion}
+
+Article:
+\"\"\"{article_text[:3000]}\"\"\"
+"""
+        return [
+            {"role": "system", "content": system_prompt.strip()},
+            {"role": "user", "content": user_prompt.strip()}
+        ]
+    
+    def _parse_single_shot(self, content: str, article_text: str) -> Optional[List[Dict[str, str]]]:
+        """Parse and validate a single-shot response into slides, returning None if malformed"""
+        content = content.strip("```json").strip("```").strip()
+        try:
+            result = json.loads(content)
+        except ValueError:
+            return None
+        
+        if not matches_schema(result, SINGLE_SHOT_SCHEMA):
+            return None
+        
+        slides = [self._intro_slide(self._headline(article_text), result["intro_script"].strip())]
+        slides.extend(self._content_slide(slide, slide["script"].strip()) for slide in result["slides"])
+        return slides
+    
+    # === LLM steps ===
+    
+    def _category_step(self, text: str, content_language: str) -> Optional[LLMStep]:
+        """Classification step, or None when the text is too short to classify"""
+        if not text or len(text.strip()) < 50:
+            return None
+        return LLMStep("Category detection", self._category_messages(text, content_language),
+                       self._parse_category, self._default_category, {"max_tokens": 150})
+    
+    def _hookline_step(self, title: str, summary: str, content_language: str) -> LLMStep:
+        return LLMStep("Hookline generation", self._hookline_messages(title, summary, content_language),
+                       lambda reply: reply.strip('"'), lambda: self._default_hookline(content_language))
+    
+    def _storytitle_step(self, title: str, summary: str, content_language: str) -> Optional[LLMStep]:
+        """Hindi story title step, or None when the original title is used as is"""
+        if content_language != "Hindi":
+            return None
+        return LLMStep("Storytitle generation", self._storytitle_messages(title, summary),
+                       lambda reply: reply.strip('"'), title.strip)
+    
+    def _single_shot_step(self, category: str, subcategory: str, emotion: str, article_text: str,
+                          content_language: str, character_sketch: str) -> LLMStep:
+        """All slides in one JSON-mode call; the None fallback lets callers use the multi-call path"""
+        return LLMStep(
+            "Single-shot slide generation",
+            self._single_shot_messages(category, subcategory, emotion, article_text, content_language, character_sketch),
+            lambda reply: self._parse_single_shot(reply, article_text),
+            lambda: None,
+            {"response_format": {"type": "json_object"}}
+        )
+    
+    def _outline_step(self, category: str, subcategory: str, emotion: str,
+                      article_text: str, content_language: str) -> LLMStep:
+        return LLMStep("Slide outline generation",
+                       self._outline_messages(category, subcategory, emotion, article_text, content_language),
+                       self._parse_outline)
+    
+    def _intro_step(self, headline: str, content_language: str) -> LLMStep:
+        return LLMStep("Intro narration", self._intro_messages(headline, content_language), lambda reply: reply)
+    
+    def _narration_step(self, slide: Dict[str, Any], content_language: str, character_sketch: str) -> LLMStep:
+        return LLMStep("Narration generation", self._narration_messages(slide, content_language, character_sketch),
+                       lambda reply: reply, lambda: NARRATION_FALLBACK)
+    
+    def _script_options(self, content_language: str, character_sketch: Optional[str],
+                        single_shot: Optional[bool]) -> Tuple[str, bool]:
+        """Character sketch and single-shot mode for a script, applying the defaults"""
+        sketch = character_sketch or self._default_character_sketch(content_language)
+        return sketch, self.single_shot if single_shot is None else single_shot
+    
+    def _script_output(self, category: str, subcategory: str, emotion: str,
+                       slides: List[Dict[str, str]]) -> Dict[str, Any]:
+        return {"category": category, "subcategory": subcategory, "emotion": emotion, "slides": slides}
+    
+    def _script_slides(self, headline: str, intro_script: str, slides_raw: List[Dict[str, Any]],
+                       narrations: List[str]) -> List[Dict[str, str]]:
+        """Intro slide followed by one narrated slide per outline entry"""
+        slides = [self._intro_slide(headline, intro_script)]
+        slides.extend(self._content_slide(slide, narration) for slide, narration in zip(slides_raw, narrations))
+        return slides
+    
+    # === Narration engine ===
+    
+    def generate_narrations(self, slides_raw: List[Dict[str, Any]], content_language: str,
+                            character_sketch: str, pool: Optional[ThreadPoolExecutor] = None) -> List[str]:
+        """Generate one narration per outline slide concurrently, in slide order"""
+        def narrate(slide: Dict[str, Any]) -> str:
+            return self._run_step(self._narration_step(slide, content_language, character_sketch))
+        
+        if pool is not None:
+            return list(pool.map(narrate, slides_raw))
+        
+        with ThreadPoolExecutor(max_workers=self.narration_concurrency) as own_pool:
+            return list(own_pool.map(narrate, slides_raw))
+    
+    async def generate_narrations_async(self, slides_raw: List[Dict[str, Any]], content_language: str,
+                                        character_sketch: str,
+                                        on_narration: Optional[Callable[[int, str], None]] = None) -> List[str]:
+        """Generate one narration per outline slide concurrently, in slide order"""
+        semaphore = asyncio.Semaphore(self.narration_concurrency)
+        
+        async def narrate(index: int, slide: Dict[str, Any]) -> str:
+            async with semaphore:
+                narration = await self._run_step_async(self._narration_step(slide, content_language, character_sketch))
+            if on_narration:
+                on_narration(index, narration)
+            return narration
+        
+        return list(await asyncio.gather(*(narrate(index, slide) for index, slide in enumerate(slides_raw))))
+    
+    # === Sync generation ===
+    
+    def detect_category_and_subcategory(self, text: str, content_language: str = "English") -> Dict[str, str]:
+        """Detect category, subcategory, and emotion"""
+        step = self._category_step(text, content_language)
+        return self._run_step(step) if step else self._default_category()
+    
+    def generate_hookline(self, title: str, summary: str, content_language: str = "English") -> str:
+        """Generate hookline for the story"""
+        return self._run_step(self._hookline_step(title, summary, content_language))
+    
+    def generate_storytitle(self, title: str, summary: str, content_language: str = "English") -> str:
+        """Generate story title"""
+        step = self._storytitle_step(title, summary, content_language)
+        return self._run_step(step) if step else title.strip()
+    
+    def title_script_generator(self, category: str, subcategory: str, emotion: str, 
+                              article_text: str, content_language: str = "English", 
+                              character_sketch: Optional[str] = None,
+                              single_shot: Optional[bool] = None) -> Dict[str, Any]:
+        """Generate title and script for slides"""
+        character_sketch, use_single_shot = self._script_options(content_language, character_sketch, single_shot)
+        if use_single_shot:
+            slides = self._run_step(self._single_shot_step(category, subcategory, emotion, article_text,
+                                                          content_language, character_sketch))
+            if slides:
+                return self._script_output(category, subcategory, emotion, slides)
+        
+        # Generate slides
+        slides_raw = self._run_step(self._outline_step(category, subcategory, emotion, article_text, content_language))
+        if slides_raw is None:
+            return self._script_output(category, subcategory, emotion, [])
+        
+        # Intro narration and per-slide narrations run concurrently
+        headline = self._headline(article_text)
+        with ThreadPoolExecutor(max_workers=self.narration_concurrency) as pool:
+            intro_future = pool.submit(self._run_step, self._intro_step(headline, content_language))
+            narrations = self.generate_narrations(slides_raw, content_language, character_sketch, pool)
+            slide1_script = intro_future.result()
+        
+        return self._script_output(category, subcategory, emotion,
+                                   self._script_slides(headline, slide1_script, slides_raw, narrations))
+    
+    # === Async generation ===
+    
+    async def detect_category_and_subcategory_async(self, text: str, content_language: str = "English") -> Dict[str, str]:
+        """Detect category, subcategory, and emotion without blocking the event loop"""
+        step = self._category_step(text, content_language)
+        return await self._run_step_async(step) if step else self._default_category()
+    
+    async def generate_hookline_async(self, title: str, summary: str, content_language: str = "English") -> str:
+        """Generate hookline for the story without blocking the event loop"""
+        return await self._run_step_async(self._hookline_step(title, summary, content_language))
+    
+    async def generate_storytitle_async(self, title: str, summary: str, content_language: str = "English") -> str:
+        """Generate story title without blocking the event loop"""
+        step = self._storytitle_step(title, summary, content_language)
+        return await self._run_step_async(step) if step else title.strip()
+    
+    async def title_script_generator_async(self, category: str, subcategory: str, emotion: str,
+                                           article_text: str, content_language: str = "English",
+                                           character_sketch: Optional[str] = None,
+                                           single_shot: Optional[bool] = None,
+                                           on_stage: StageCallback = ignore_stage) -> Dict[str, Any]:
+        """Generate title and script for slides without blocking the event loop, reporting each finished slide"""
+        character_sketch, use_single_shot = self._script_options(content_language, character_sketch, single_shot)
+        if use_single_shot:
+            slides = await self._run_step_async(self._single_shot_step(category, subcategory, emotion, article_text,
+                                                                      content_language, character_sketch))
+            if slides:
+                for index, slide in enumerate(slides):
+                    on_stage("slide", {"index": index, **slide})
+                return self._script_output(category, subcategory, emotion, slides)
+        
+        slides_raw = await self._run_step_async(
+            self._outline_step(category, subcategory, emotion, article_text, content_language)
+        )
+        if slides_raw is None:
+            return self._script_output(category, subcategory, emotion, [])
+        
+        headline = self._headline(article_text)
+        
+        async def intro_script() -> str:
+            script = await self._run_step_async(self._intro_step(headline, content_language))
+            on_stage("slide", {"index": 0, **self._intro_slide(headline, script)})
+            return script
+        
+        def on_narration(index: int, narration: str) -> None:
+            on_stage("slide", {"index": index + 1, **self._content_slide(slides_raw[index], narration)})
+        
+        slide1_script, narrations = await asyncio.gather(
+            intro_script(),
+            self.generate_narrations_async(slides_raw, content_language, character_sketch, on_narration),
+        )
+        
+        return self._script_output(category, subcategory, emotion,
+                                   self._script_slides(headline, slide1_script, slides_raw, narrations))
+    
+    async def generate_story_content_async(self, title: str, summary: str, full_text: str,
+                                           content_language: str = "English",
+                                           single_shot: Optional[bool] = None,
+                                           on_stage: StageCallback = ignore_stage) -> Dict[str, Any]:
+        """
+        Run the story LLM chain concurrently.
+        
+        Hookline and storytitle only need the title and summary, so they run
+        alongside classification; slide scripts start as soon as the category is known.
+        on_stage receives "category", "hookline", "storytitle" and each "slide" as they finish.
+        """
+        
+        async def classify_and_script() -> Dict[str, Any]:
+            result = await self.detect_category_and_subcategory_async(full_text, content_language)
+            on_stage("category", result)
+            return await self.title_script_generator_async(
+                result["category"], result["subcategory"], result["emotion"], full_text, content_language,
+                single_shot=single_shot, on_stage=on_stage
+            )
+        
+        async def hookline_stage() -> str:
+            hookline = await self.generate_hookline_async(title, summary, content_language)
+            on_stage("hookline", {"hookline": hookline})
+            return hookline
+        
+        async def storytitle_stage() -> str:
+            storytitle = await self.generate_storytitle_async(title, summary, content_language)
+            on_stage("storytitle", {"storytitle": storytitle})
+            return storytitle
+        
+        script_output, hookline, storytitle = await asyncio.gather(
+            classify_and_script(),
+            hookline_stage(),
+            storytitle_stage(),
+        )
         
         return {
-            "category": category,
-            "subcategory": subcategory,
-            "emotion": emotion,
-            "slides": slides
+            "category": script_output["category"],
+            "subcategory": script_output["subcategory"],
+            "emotion": script_output["emotion"],
+            "hookline": hookline,
+            "storytitle": storytitle,
+            "slides": script_output.get("slides", [])
         }
@@ -0,0 +1,86 @@
+"""
+Content-addressed TTS audio store for Suvichaar FastAPI Service
+"""
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.core.config import settings
+from app.utils.cache import MemoryCache
+
+
+class TTSAudioStore:
+    """Deterministic S3 keys for synthesized audio, with a local index in front of S3"""
+    
+    def __init__(self, s3_client, bucket: str, s3_prefix: str, cdn_base: str,
+                 index_size: int = settings.TTS_AUDIO_INDEX_SIZE):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.s3_prefix = s3_prefix
+        self.cdn_base = cdn_base
+        self._index = MemoryCache(max_entries=index_size)
+        self._inflight: Dict[str, List] = {}  # digest -> [lock, waiters]
+        self._guard = threading.Lock()
+    
+    @staticmethod
+    def digest(text: str, voice: str, model: str) -> str:
+        """Hash the synthesis inputs into a content address"""
+        payload = "\x1f".join([model, voice, text])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def key_for(self, digest: str) -> str:
+        """S3 key for a content address"""
+        return f"{self.s3_prefix}tts/{digest}.mp3"
+    
+    def url_for(self, digest: str) -> str:
+        """CDN URL for a content address"""
+        return f"{self.cdn_base}{self.key_for(digest)}"
+    
+    @contextmanager
+    def claim(self, digest: str) -> Iterator[None]:
+        """Serialise work on one content address, so duplicate lines synthesize once"""
+        with self._guard:
+            entry = self._inflight.setdefault(digest, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._inflight[digest]
+    
+    def lookup(self, digest: str) -> Optional[str]:
+        """Return the CDN URL if the audio already exists, checking the local index before S3"""
+        url = self._index.get(digest)
+        if url is not None:
+            return url
+        
+        try:
+            self.s3_client.head_object(Bucket=self.bucket, Key=self.key_for(digest))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey", "NotFound"):
+                print(f"Audio store lookup failed for {digest}: {e}")
+            return None
+        except BotoCoreError as e:
+            # Endpoint, connection or credential trouble: bypass the store rather than fail the synthesis
+            print(f"Audio store lookup failed for {digest}: {e}")
+            return None
+        
+        url = self.url_for(digest)
+        self._index.set(digest, url, size=len(url))
+        return url
+    
+    def remember(self, digest: str) -> str:
+        """Record a freshly uploaded content address and return its URL"""
+        url = self.url_for(digest)
+        self._index.set(digest, url, size=len(url))
+        return url
+    
+    def forget(self, digest: str) -> None:
+        """Drop a content address from the local index"""
+        self._index.delete(digest)
@@ -1,16 +1,99 @@
 """
 HTML Processing Service for Suvichaar FastAPI Service
 """
-import re
 import textwrap
 import zipfile
 import io
 import json
+import asyncio
+import threading
+import weakref
 import httpx
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple, Union
 from collections import OrderedDict
 from datetime import datetime, timezone
 from app.core.config import settings
+from app.services.template_engine import CompiledTemplate, TemplateCache, SLIDES_MARKER, SLIDES_SLOT
+from app.utils.cache import MemoryCache
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# AMP slide markup; {audio_url} and {paragraph} are the only dynamic parts
+AMP_SLIDE_MARKUP = """
+        <amp-story-page id="c29cbf94-847a-4bb7-a4eb-47d17d8c2d5a" auto-advance-after="page-c29cbf94-847a-4bb7-a4eb-47d17d8c2d5a-background-audio" class="i-amphtml-layout-container" i-amphtml-layout="container">
+            <amp-story-animation layout="nodisplay" trigger="visibility" class="i-amphtml-layout-nodisplay" hidden="hidden" i-amphtml-layout="nodisplay">
+                <script type="application/json">[{{"selector":"#anim-1a95e072-cada-435a-afea-082ddd65ff10","keyframes":{{"opacity":[0,1]}},"delay":0,"duration":600,"easing":"cubic-bezier(0.2, 0.6, 0.0, 1)","fill":"both"}}]</script>
+            </amp-story-animation>
+            <amp-story-animation layout="nodisplay" trigger="visibility" class="i-amphtml-layout-nodisplay" hidden="hidden" i-amphtml-layout="nodisplay">
+                <script type="application/json">[{{"selector":"#anim-a938fe3f-03cf-47c5-9a84-da919c4f870b","keyframes":{{"transform":["translate3d(-115.2381%, 0px, 0)","translate3d(0px, 0px, 0)"]}},"delay":0,"duration":600,"easing":"cubic-bezier(0.2, 0.6, 0.0, 1)","fill":"both"}}]</script>
+            </amp-story-animation>
+            <amp-story-animation layout="nodisplay" trigger="visibility" class="i-amphtml-layout-nodisplay" hidden="hidden" i-amphtml-layout="nodisplay">
+                <script type="application/json">[{{"selector":"#anim-f7c5981e-ac77-48d5-9b40-7a987a3e2ab0","keyframes":{{"opacity":[0,1]}},"delay":0,"duration":600,"easing":"cubic-bezier(0.2, 0.6, 0.0, 1)","fill":"both"}}]</script>
+            </amp-story-animation>
+            <amp-story-animation layout="nodisplay" trigger="visibility" class="i-amphtml-layout-nodisplay" hidden="hidden" i-amphtml-layout="nodisplay">
+                <script type="application/json">[{{"selector":"#anim-0c1e94dd-ab91-415c-9372-0aa2e7e61630","keyframes":{{"transform":["translate3d(-115.55555%, 0px, 0)","translate3d(0px, 0px, 0)"]}},"delay":0,"duration":600,"easing":"cubic-bezier(0.2, 0.6, 0.0, 1)","fill":"both"}}]</script>
+            </amp-story-animation>
+            <amp-story-grid-layer template="vertical" aspect-ratio="412:618" class="grid-layer i-amphtml-layout-container" i-amphtml-layout="container" style="--aspect-ratio:412/618;">
+                <div class="page-fullbleed-area"><div class="page-safe-area">
+                    <div class="_6120891"><div class="_89d52dd mask" id="el-f00095ab-c147-4f19-9857-72ac678f953f">
+                        <div class="_dc67a5c fill"></div></div></div></div></div>
+            </amp-story-grid-layer>
+            <amp-story-grid-layer template="fill" class="i-amphtml-layout-container" i-amphtml-layout="container">
+                <amp-video autoplay="autoplay" layout="fixed" width="1" height="1" poster="" id="page-c29cbf94-847a-4bb7-a4eb-47d17d8c2d5a-background-audio" cache="google" class="i-amphtml-layout-fixed i-amphtml-layout-size-defined" style="width:1px;height:1px" i-amphtml-layout="fixed">
+                    <source type="audio/mpeg" src="{audio_url}">
+                </amp-video>
+            </amp-story-grid-layer>
+            <amp-story-grid-layer template="vertical" aspect-ratio="412:618" class="grid-layer i-amphtml-layout-container" i-amphtml-layout="container" style="--aspect-ratio:412/618;">
+                <div class="page-fullbleed-area"><div class="page-safe-area">
+                    <div class="_c19e533"><div class="_89d52dd mask" id="el-344ed989-789b-4a01-a124-9ae1d15d67f4">
+                        <div data-leaf-element="true" class="_8aed44c">
+                            <amp-img layout="fill" src="https://media.suvichaar.org/upload/polaris/polarisslide.png" alt="polarisslide.png" disable-inline-width="true" class="i-amphtml-layout-fill i-amphtml-layout-size-defined" i-amphtml-layout="fill"></amp-img>
+                        </div></div></div>
+                    <div class="_3d0c7a9"><div id="anim-1a95e072-cada-435a-afea-082ddd65ff10" class="_75da10d animation-wrapper">
+                        <div id="anim-a938fe3f-03cf-47c5-9a84-da919c4f870b" class="_e559378 animation-wrapper">
+                            <div id="el-2f080472-6c81-40a1-ac00-339cc8981388" class="_5342a26">
+                                <h3 class="_d1a8d0d fill text-wrapper"><span><span class="_14af73e">{paragraph}</span></span></h3>
+                            </div></div></div></div>
+                    <div class="_a336742"><div id="anim-f7c5981e-ac77-48d5-9b40-7a987a3e2ab0" class="_75da10d animation-wrapper">
+                        <div id="anim-0c1e94dd-ab91-415c-9372-0aa2e7e61630" class="_09239f8 animation-wrapper">
+                            <div id="el-1a0d583c-c99b-4156-825b-3188408c0551" class="_ee8f788">
+                                <h2 class="_59f9bb8 fill text-wrapper"><span><span class="_14af73e"></span></span></h2>
+                            </div></div></div></div></div></div>
+            </amp-story-grid-layer>
+        </amp-story-page>
+        """
+
+# Split once at import into static chunks around the two slots, also pre-encoded for streaming
+_SLIDE_HEAD, _slide_rest = AMP_SLIDE_MARKUP.format(audio_url="\x00", paragraph="\x01").split("\x00")
+_SLIDE_MID, _SLIDE_TAIL = _slide_rest.split("\x01")
+_SLIDE_HEAD_BYTES, _SLIDE_MID_BYTES, _SLIDE_TAIL_BYTES = (
+    chunk.encode("utf-8") for chunk in (_SLIDE_HEAD, _SLIDE_MID, _SLIDE_TAIL)
+)
+del _slide_rest
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object handing written bytes back as chunks (for streaming ZIPs)"""
+    
+    def __init__(self):
+        self._chunks = []
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> list:
+        """Return and forget everything written since the last drain"""
+        chunks, self._chunks = self._chunks, []
+        return chunks
 
 
 class HTMLProcessingService:
@@ -21,21 +104,97 @@ class HTMLProcessingService:
         self.category_mapping = settings.CATEGORY_MAPPING
         self.default_bg_image = settings.DEFAULT_BG_IMAGE
         self.default_cover_image = settings.DEFAULT_COVER_IMAGE
+        # One pooled client per event loop, since a client cannot be used from another loop
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._clients_lock = threading.Lock()
+        # Bodies with validators, keyed by URL, for conditional GETs
+        self._response_cache = MemoryCache(
+            max_entries=settings.HTTP_REVALIDATION_CACHE_ENTRIES,
+            max_bytes=settings.HTTP_REVALIDATION_CACHE_BYTES
+        )
+        self.template_cache = TemplateCache()
     
-    async def fetch_template_from_url(self, template_url: str) -> str:
-        """Fetch HTML template from URL"""
+    # === Shared HTTP client ===
+    
+    async def startup(self) -> None:
+        """Open the application-lifetime HTTP client"""
+        self._get_client()
+    
+    async def shutdown(self) -> None:
+        """Close every loop's HTTP client, each on the loop that owns it"""
+        with self._clients_lock:
+            clients = list(self._clients.items())
+            self._clients.clear()
+        current = asyncio.get_running_loop()
+        for loop, client in clients:
+            try:
+                if loop is current:
+                    await client.aclose()
+                elif loop.is_running():
+                    await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), loop))
+            except Exception as e:
+                print(f"Failed to close HTTP client: {e}")
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = self._clients[loop] = self._new_client()
+            return client
+    
+    @staticmethod
+    def _new_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=settings.HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+    
+    async def _conditional_get(self, url: str) -> Dict[str, Any]:
+        """GET a URL, revalidating a cached body with ETag/Last-Modified when we have one"""
+        cached = self._response_cache.get(url)
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
+        response = await self._get_client().get(url, headers=headers)
+        if response.status_code == 304 and cached:
+            return cached
+        response.raise_for_status()
+        
+        entry = {
+            "text": response.text,
+            "content_type": response.headers.get('content-type', '').lower(),
+            "etag": response.headers.get('etag'),
+            "last_modified": response.headers.get('last-modified')
+        }
+        if entry["etag"] or entry["last_modified"]:
+            self._response_cache.set(url, entry, size=len(entry["text"]))
+        return entry
+    
+    async def _fetch_template_response(self, template_url: str) -> Dict[str, Any]:
+        """Fetch HTML template from URL, returning the body with its validators"""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(template_url)
-                response.raise_for_status()
-                
-                # Check if content type is HTML
-                content_type = response.headers.get('content-type', '').lower()
-                if 'text/html' not in content_type and 'application/xhtml' not in content_type:
-                    raise ValueError(f"URL does not return HTML content. Content-Type: {content_type}")
-                
-                return response.text
-                
+            response = await self._conditional_get(template_url)
+            
+            # Check if content type is HTML
+            content_type = response["content_type"]
+            if 'text/html' not in content_type and 'application/xhtml' not in content_type:
+                raise ValueError(f"URL does not return HTML content. Content-Type: {content_type}")
+            
+            return response
+        
         except httpx.TimeoutException:
             raise ValueError("Timeout while fetching template from URL")
         except httpx.HTTPStatusError as e:
@@ -45,20 +204,36 @@ class HTMLProcessingService:
         except Exception as e:
             raise ValueError(f"Unexpected error while fetching template from URL: {str(e)}")
     
+    async def fetch_template_from_url(self, template_url: str) -> str:
+        """Fetch HTML template from URL"""
+        response = await self._fetch_template_response(template_url)
+        return response["text"]
+    
+    async def fetch_compiled_template(self, template_url: str) -> CompiledTemplate:
+        """Fetch a template and compile it once per URL + ETag/Last-Modified"""
+        response = await self._fetch_template_response(template_url)
+        validator = response["etag"] or response["last_modified"]
+        key = self.template_cache.url_key(template_url, validator, response["text"])
+        return self.template_cache.compile(response["text"], key)
+    
+    def compile_template(self, html_text: Union[str, CompiledTemplate]) -> CompiledTemplate:
+        """Compile an inline template, reusing the plan for identical content"""
+        if isinstance(html_text, CompiledTemplate):
+            return html_text
+        return self.template_cache.compile(html_text or "")
+    
     async def fetch_json_from_url(self, json_url: str) -> Dict[str, Any]:
         """Fetch JSON data from URL"""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(json_url)
-                response.raise_for_status()
-                
-                # Check if content type is JSON
-                content_type = response.headers.get('content-type', '').lower()
-                if 'application/json' not in content_type and 'text/json' not in content_type:
-                    raise ValueError(f"URL does not return JSON content. Content-Type: {content_type}")
-                
-                return response.json()
-                
+            response = await self._conditional_get(json_url)
+            
+            # Check if content type is JSON
+            content_type = response["content_type"]
+            if 'application/json' not in content_type and 'text/json' not in content_type:
+                raise ValueError(f"URL does not return JSON content. Content-Type: {content_type}")
+            
+            return json.loads(response["text"])
+        
         except httpx.TimeoutException:
             raise ValueError("Timeout while fetching JSON from URL")
         except httpx.HTTPStatusError as e:
@@ -68,19 +243,28 @@ class HTMLProcessingService:
         except Exception as e:
             raise ValueError(f"Unexpected error while fetching JSON from URL: {str(e)}")
     
-    def replace_placeholders_in_html(self, html_text: str, json_data: Dict[str, Any]) -> str:
+    def replace_placeholders_in_html(self, html_text: Union[str, CompiledTemplate], json_data: Dict[str, Any]) -> str:
         """Replace placeholders in HTML template"""
+        return self.compile_template(html_text).render(self._tab3_values(json_data))
+    
+    def iter_placeholders_in_html(self, html_text: Union[str, CompiledTemplate],
+                                  json_data: Dict[str, Any]) -> Iterator[bytes]:
+        """Streaming variant of replace_placeholders_in_html, yielding UTF-8 chunks"""
+        return self.compile_template(html_text).iter_encoded(self._tab3_values(json_data))
+    
+    def _tab3_values(self, json_data: Dict[str, Any]) -> Dict[str, str]:
+        """Placeholder values for the tab 3 HTML template"""
         storytitle = json_data.get("slide1", {}).get("storytitle", "")
         storytitle_url = json_data.get("slide1", {}).get("audio_url", "")
         hookline = json_data.get("slide2", {}).get("hookline", "")
         hookline_url = json_data.get("slide2", {}).get("audio_url", "")
         
-        html_text = html_text.replace("{{storytitle}}", storytitle)
-        html_text = html_text.replace("{{storytitle_audiourl}}", storytitle_url)
-        html_text = html_text.replace("{{hookline}}", hookline)
-        html_text = html_text.replace("{{hookline_audiourl}}", hookline_url)
-        
-        return html_text
+        return {
+            "storytitle": storytitle,
+            "storytitle_audiourl": storytitle_url,
+            "hookline": hookline,
+            "hookline_audiourl": hookline_url
+        }
     
     def modify_tab4_json(self, original_json: Dict[str, Any]) -> Dict[str, Any]:
         """Modify JSON structure for tab 4 processing"""
@@ -110,56 +294,10 @@ class HTMLProcessingService:
     
     def generate_slide(self, paragraph: str, audio_url: str) -> str:
         """Generate AMP slide HTML"""
-        return f"""
-        <amp-story-page id="c29cbf94-847a-4bb7-a4eb-47d17d8c2d5a" auto-advance-after="page-c29cbf94-847a-4bb7-a4eb-47d17d8c2d5a-background-audio" class="i-amphtml-layout-container" i-amphtml-layout="container">
-            <amp-story-animation layout="nodisplay" trigger="visibility" class="i-amphtml-layout-nodisplay" hidden="hidden" i-amphtml-layout="nodisplay">
-                <script type="application/json">[{{"selector":"#anim-1a95e072-cada-435a-afea-082ddd65ff10","keyframes":{{"opacity":[0,1]}},"delay":0,"duration":600,"easing":"cubic-bezier(0.2, 0.6, 0.0, 1)","fill":"both"}}]</script>
-            </amp-story-animation>
-            <amp-story-animation layout="nodisplay" trigger="visibility" class="i-amphtml-layout-nodisplay" hidden="hidden" i-amphtml-layout="nodisplay">
-                <script type="application/json">[{{"selector":"#anim-a938fe3f-03cf-47c5-9a84-da919c4f870b","keyframes":{{"transform":["translate3d(-115.2381%, 0px, 0)","translate3d(0px, 0px, 0)"]}},"delay":0,"duration":600,"easing":"cubic-bezier(0.2, 0.6, 0.0, 1)","fill":"both"}}]</script>
-            </amp-story-animation>
-            <amp-story-animation layout="nodisplay" trigger="visibility" class="i-amphtml-layout-nodisplay" hidden="hidden" i-amphtml-layout="nodisplay">
-                <script type="application/json">[{{"selector":"#anim-f7c5981e-ac77-48d5-9b40-7a987a3e2ab0","keyframes":{{"opacity":[0,1]}},"delay":0,"duration":600,"easing":"cubic-bezier(0.2, 0.6, 0.0, 1)","fill":"both"}}]</script>
-            </amp-story-animation>
-            <amp-story-animation layout="nodisplay" trigger="visibility" class="i-amphtml-layout-nodisplay" hidden="hidden" i-amphtml-layout="nodisplay">
-                <script type="application/json">[{{"selector":"#anim-0c1e94dd-ab91-415c-9372-0aa2e7e61630","keyframes":{{"transform":["translate3d(-115.55555%, 0px, 0)","translate3d(0px, 0px, 0)"]}},"delay":0,"duration":600,"easing":"cubic-bezier(0.2, 0.6, 0.0, 1)","fill":"both"}}]</script>
-            </amp-story-animation>
-            <amp-story-grid-layer template="vertical" aspect-ratio="412:618" class="grid-layer i-amphtml-layout-container" i-amphtml-layout="container" style="--aspect-ratio:412/618;">
-                <div class="page-fullbleed-area"><div class="page-safe-area">
-                    <div class="_6120891"><div class="_89d52dd mask" id="el-f00095ab-c147-4f19-9857-72ac678f953f">
-                        <div class="_dc67a5c fill"></div></div></div></div></div>
-            </amp-story-grid-layer>
-            <amp-story-grid-layer template="fill" class="i-amphtml-layout-container" i-amphtml-layout="container">
-                <amp-video autoplay="autoplay" layout="fixed" width="1" height="1" poster="" id="page-c29cbf94-847a-4bb7-a4eb-47d17d8c2d5a-background-audio" cache="google" class="i-amphtml-layout-fixed i-amphtml-layout-size-defined" style="width:1px;height:1px" i-amphtml-layout="fixed">
-                    <source type="audio/mpeg" src="{audio_url}">
-                </amp-video>
-            </amp-story-grid-layer>
-            <amp-story-grid-layer template="vertical" aspect-ratio="412:618" class="grid-layer i-amphtml-layout-container" i-amphtml-layout="container" style="--aspect-ratio:412/618;">
-                <div class="page-fullbleed-area"><div class="page-safe-area">
-                    <div class="_c19e533"><div class="_89d52dd mask" id="el-344ed989-789b-4a01-a124-9ae1d15d67f4">
-                        <div data-leaf-element="true" class="_8aed44c">
-                            <amp-img layout="fill" src="https://media.suvichaar.org/upload/polaris/polarisslide.png" alt="polarisslide.png" disable-inline-width="true" class="i-amphtml-layout-fill i-amphtml-layout-size-defined" i-amphtml-layout="fill"></amp-img>
-                        </div></div></div>
-                    <div class="_3d0c7a9"><div id="anim-1a95e072-cada-435a-afea-082ddd65ff10" class="_75da10d animation-wrapper">
-                        <div id="anim-a938fe3f-03cf-47c5-9a84-da919c4f870b" class="_e559378 animation-wrapper">
-                            <div id="el-2f080472-6c81-40a1-ac00-339cc8981388" class="_5342a26">
-                                <h3 class="_d1a8d0d fill text-wrapper"><span><span class="_14af73e">{paragraph}</span></span></h3>
-                            </div></div></div></div>
-                    <div class="_a336742"><div id="anim-f7c5981e-ac77-48d5-9b40-7a987a3e2ab0" class="_75da10d animation-wrapper">
-                        <div id="anim-0c1e94dd-ab91-415c-9372-0aa2e7e61630" class="_09239f8 animation-wrapper">
-                            <div id="el-1a0d583c-c99b-4156-825b-3188408c0551" class="_ee8f788">
-                                <h2 class="_59f9bb8 fill text-wrapper"><span><span class="_14af73e"></span></span></h2>
-                            </div></div></div></div></div></div>
-            </amp-story-grid-layer>
-        </amp-story-page>
-        """
+        return "".join((_SLIDE_HEAD, audio_url, _SLIDE_MID, paragraph, _SLIDE_TAIL))
     
-    def process_amp_template(self, template_html: str, output_data: Dict[str, Any]) -> str:
-        """Process AMP template with output data"""
-        if "<!--INSERT_SLIDES_HERE-->" not in template_html:
-            raise ValueError("Placeholder <!--INSERT_SLIDES_HERE--> not found in uploaded HTML.")
-        
-        all_slides = ""
+    def _amp_slide_values(self, output_data: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+        """Yield (paragraph, audio_url) for each complete slide, in slide order"""
         for key in sorted(output_data.keys(), key=lambda x: int(x.replace("slide", ""))):
             slide_num = key.replace("slide", "")
             data = output_data[key]
@@ -169,46 +307,82 @@ class HTMLProcessingService:
             if para_key in data and audio_key in data:
                 raw = data[para_key].replace("'", "'").replace('"', '&quot;')
                 paragraph = textwrap.shorten(raw, width=180, placeholder="...")
-                audio_url = data[audio_key]
-                all_slides += self.generate_slide(paragraph, audio_url)
-        
-        final_html = template_html.replace("<!--INSERT_SLIDES_HERE-->", all_slides)
-        return final_html
+                yield paragraph, data[audio_key]
+    
+    def iter_slide_chunks(self, output_data: Dict[str, Any]) -> Iterator[str]:
+        """Yield the slides markup as static chunks and slot values, never concatenating"""
+        for paragraph, audio_url in self._amp_slide_values(output_data):
+            yield _SLIDE_HEAD
+            yield audio_url
+            yield _SLIDE_MID
+            yield paragraph
+            yield _SLIDE_TAIL
+    
+    def iter_slide_bytes(self, output_data: Dict[str, Any]) -> Iterator[bytes]:
+        """Encoded variant of iter_slide_chunks using the pre-encoded static chunks"""
+        for paragraph, audio_url in self._amp_slide_values(output_data):
+            yield _SLIDE_HEAD_BYTES
+            yield audio_url.encode("utf-8")
+            yield _SLIDE_MID_BYTES
+            yield paragraph.encode("utf-8")
+            yield _SLIDE_TAIL_BYTES
     
-    def process_content_submission(self, html_template: str, submission_data: Dict[str, Any]) -> str:
-        """Process content submission HTML template"""
-        # Replace user and profile URL
+    def _amp_template(self, template_html: Union[str, CompiledTemplate]) -> CompiledTemplate:
+        """Compile the AMP template and check it has the slides marker"""
+        template = self.compile_template(template_html)
+        if not template.has_slot(SLIDES_SLOT):
+            raise ValueError(f"Placeholder {SLIDES_MARKER} not found in uploaded HTML.")
+        return template
+    
+    def iter_amp_template(self, template_html: Union[str, CompiledTemplate],
+                          output_data: Dict[str, Any]) -> Iterator[bytes]:
+        """Stream the AMP document as UTF-8 chunks without building it in memory"""
+        template = self._amp_template(template_html)
+        slides: Iterable[bytes] = self.iter_slide_bytes(output_data)
+        if template.slots.count(SLIDES_SLOT) > 1:
+            slides = list(slides)
+        return template.iter_encoded({}, {SLIDES_SLOT: slides})
+    
+    def process_amp_template(self, template_html: Union[str, CompiledTemplate], output_data: Dict[str, Any]) -> str:
+        """Process AMP template with output data"""
+        template = self._amp_template(template_html)
+        slides = list(self.iter_slide_chunks(output_data))
+        return "".join(template.iter_chunks({}, {SLIDES_SLOT: slides}))
+    
+    def process_content_submission(self, html_template: Union[str, CompiledTemplate], submission_data: Dict[str, Any],
+                                   extra_placeholders: Optional[Dict[str, str]] = None) -> str:
+        """Process content submission HTML template; extra_placeholders (e.g. resized image URLs) fill the same pass"""
+        # User and profile URL
         selected_user = submission_data.get("selected_user", "Suvichaar")
         user_profile_url = self.user_mapping.get(selected_user, "")
         
-        html_template = html_template.replace("{{user}}", selected_user)
-        html_template = html_template.replace("{{userprofileurl}}", user_profile_url)
-        
-        # Replace timestamps
+        # Timestamps
         now = datetime.now(timezone.utc).isoformat(timespec='seconds')
-        html_template = html_template.replace("{{publishedtime}}", now)
-        html_template = html_template.replace("{{modifiedtime}}", now)
         
-        # Replace content fields
-        html_template = html_template.replace("{{storytitle}}", submission_data.get("story_title", ""))
-        html_template = html_template.replace("{{metadescription}}", submission_data.get("meta_description", ""))
-        html_template = html_template.replace("{{metakeywords}}", submission_data.get("meta_keywords", ""))
-        html_template = html_template.replace("{{contenttype}}", submission_data.get("content_type", ""))
-        html_template = html_template.replace("{{lang}}", submission_data.get("language", ""))
-        html_template = html_template.replace("{{pagetitle}}", submission_data.get("page_title", ""))
-        html_template = html_template.replace("{{canurl}}", submission_data.get("canonical_url", ""))
-        html_template = html_template.replace("{{canurl1}}", submission_data.get("canonical_url1", ""))
+        values = {
+            "user": selected_user,
+            "userprofileurl": user_profile_url,
+            "publishedtime": now,
+            "modifiedtime": now,
+            "storytitle": submission_data.get("story_title", ""),
+            "metadescription": submission_data.get("meta_description", ""),
+            "metakeywords": submission_data.get("meta_keywords", ""),
+            "contenttype": submission_data.get("content_type", ""),
+            "lang": submission_data.get("language", ""),
+            "pagetitle": submission_data.get("page_title", ""),
+            "canurl": submission_data.get("canonical_url", ""),
+            "canurl1": submission_data.get("canonical_url1", "")
+        }
         
-        # Replace image URLs
+        # Image URLs
         image_url = submission_data.get("image_url", "")
         if image_url:
-            html_template = html_template.replace("{{image0}}", image_url)
+            values["image0"] = image_url
         
-        # Cleanup incorrect URL wrapping
-        html_template = re.sub(r'href="\{(https://[^}]+)\}"', r'href="\1"', html_template)
-        html_template = re.sub(r'src="\{(https://[^}]+)\}"', r'src="\1"', html_template)
-        
-        return html_template
+        # Single pass: placeholders, href/src "{https://...}" unwrapping, then the extra placeholders
+        return self.compile_template(html_template).render(
+            values, unwrap_urls=True, late_values=extra_placeholders
+        )
     
     def create_zip_file(self, html_content: str, json_content: Dict[str, Any], 
                         html_filename: str, json_filename: str) -> bytes:
@@ -220,6 +394,18 @@ class HTMLProcessingService:
         buffer.seek(0)
         return buffer.getvalue()
     
+    def iter_zip_file(self, members: Iterable[Tuple[str, Iterable[bytes]]]) -> Iterator[bytes]:
+        """Stream a ZIP archive chunk by chunk; each member is a (filename, byte chunks) pair"""
+        sink = _ChunkSink()
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zipf:
+            for filename, chunks in members:
+                with zipf.open(filename, "w") as member:
+                    for chunk in chunks:
+                        member.write(chunk)
+                        yield from sink.drain()
+                yield from sink.drain()
+        yield from sink.drain()
+    
     def generate_metadata(self, story_title: str, categories: int, filter_tags: list, 
                          nano: str, slug_nano: str, canonical_url: str, canonical_url1: str,
                          cover_image_url: str, meta_keywords: str, meta_description: str, 
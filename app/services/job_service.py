@@ -0,0 +1,328 @@
+"""
+Persistent article/TTS job queue for Suvichaar FastAPI Service
+"""
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, update
+
+from app.core.config import settings
+from app.core.database import SessionLocal, create_tables
+from app.core.executor import executor
+from app.models.database import ContentGeneration, TTSGeneration
+from app.services.pipeline_service import StoryPipeline
+from app.utils.helpers import generate_filename
+
+# Job kind -> table holding its rows
+JOB_MODELS = {"article": ContentGeneration, "tts": TTSGeneration}
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class JobService:
+    """
+    Article and TTS generations queued as ContentGeneration/TTSGeneration rows and run by an
+    asyncio worker pool on the application loop. Rows carry the request, status, current stage
+    and result. A processing job is leased to one worker, which renews the lease while it runs;
+    jobs left pending or with an expired lease (e.g. after a crash) are picked up again, and
+    several processes can share the database without running a job twice.
+    """
+    
+    def __init__(self, pipeline: StoryPipeline, session_factory: Callable = SessionLocal,
+                 workers: int = settings.JOB_WORKERS, lease_seconds: float = settings.JOB_LEASE_SECONDS):
+        self.pipeline = pipeline
+        self.session_factory = session_factory
+        self.workers = max(1, workers)
+        self.lease_seconds = lease_seconds
+        # Lease owner id, unique per process and service instance
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+    
+    # === Lifecycle ===
+    
+    async def startup(self) -> None:
+        """Create the tables, start the workers and requeue pending jobs and expired leases"""
+        await executor.run_io(self._create_tables)
+        self._ensure_workers()
+        for kind, job_id in await executor.run_io(self._reclaim, None):
+            self._queue.put_nowait((kind, job_id))
+    
+    async def shutdown(self) -> None:
+        """Stop the workers; unfinished jobs stay in the database for the next startup"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = None
+        self._queue = None
+    
+    def _create_tables(self) -> None:
+        with self.session_factory() as db:
+            create_tables(db.get_bind())
+    
+    def _ensure_workers(self) -> None:
+        """Start the worker pool on the running loop (the async clients are bound to it)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._tasks = [loop.create_task(self._worker(self._queue)) for _ in range(self.workers)]
+        self._tasks.append(loop.create_task(self._reaper(self._queue)))
+    
+    def _lease_cutoff(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self.lease_seconds)
+    
+    def _reclaim(self, pending_before: Optional[datetime]) -> List[tuple]:
+        """
+        Mark processing jobs whose lease expired pending again and return them, oldest first,
+        along with pending jobs created before pending_before (every pending job when None)
+        """
+        cutoff = self._lease_cutoff()
+        requeued = []
+        with self.session_factory() as db:
+            for kind, model in JOB_MODELS.items():
+                pending = model.status == "pending"
+                if pending_before is not None:
+                    pending = and_(pending, model.created_at < pending_before)
+                expired = and_(model.status == "processing",
+                               or_(model.claimed_at.is_(None), model.claimed_at < cutoff))
+                rows = db.query(model).filter(or_(pending, expired)).order_by(model.id).all()
+                for row in rows:
+                    row.status = "pending"
+                    requeued.append((kind, row.id))
+            db.commit()
+        return requeued
+    
+    async def _reaper(self, queue: asyncio.Queue) -> None:
+        """Requeue jobs abandoned by workers that died, including those in other processes"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 2)
+            try:
+                for kind, job_id in await executor.run_io(self._reclaim, self._lease_cutoff()):
+                    queue.put_nowait((kind, job_id))
+            except Exception as e:
+                print(f"Job reaper error: {e}")
+    
+    # === Jobs ===
+    
+    async def enqueue_article(self, url: str, persona: str, content_language: str,
+                              number_of_slides: int, single_shot: Optional[bool] = None) -> Dict[str, Any]:
+        """Store an article generation job and queue it"""
+        row = ContentGeneration(
+            url=url,
+            persona=persona,
+            content_language=content_language,
+            number_of_slides=number_of_slides,
+            status="pending",
+            result_data={"request": {"single_shot": single_shot}}
+        )
+        return await self._enqueue("article", row)
+    
+    async def enqueue_tts(self, structured_slides: Dict[str, Any], voice: str,
+                          content_generation_id: Optional[int] = None) -> Dict[str, Any]:
+        """Store a TTS generation job and queue it"""
+        row = TTSGeneration(
+            content_generation_id=content_generation_id,
+            voice=voice,
+            status="pending",
+            result_data={"request": {"structured_slides": structured_slides}}
+        )
+        return await self._enqueue("tts", row)
+    
+    async def _enqueue(self, kind: str, row) -> Dict[str, Any]:
+        self._ensure_workers()
+        job = await executor.run_io(self._insert, kind, row)
+        self._queue.put_nowait((kind, job["job_id"]))
+        return job
+    
+    def _insert(self, kind: str, row) -> Dict[str, Any]:
+        with self.session_factory() as db:
+            db.add(row)
+            db.commit()
+            db.refresh(row)
+            return self._to_dict(kind, row)
+    
+    def get_job(self, kind: str, job_id: int) -> Optional[Dict[str, Any]]:
+        """Status, request and result of a job"""
+        with self.session_factory() as db:
+            row = db.get(JOB_MODELS[kind], job_id)
+            return self._to_dict(kind, row) if row else None
+    
+    def list_jobs(self, kind: str, status: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """Jobs of one kind, newest first, without their results"""
+        model = JOB_MODELS[kind]
+        with self.session_factory() as db:
+            query = db.query(model)
+            if status:
+                query = query.filter(model.status == status)
+            rows = query.order_by(model.id.desc()).offset(offset).limit(limit).all()
+            return [self._to_dict(kind, row, include_result=False) for row in rows]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Worker count and queue depth"""
+        return {"workers": self.workers, "queued": self._queue.qsize() if self._queue else 0}
+    
+    @staticmethod
+    def _to_dict(kind: str, row, include_result: bool = True) -> Dict[str, Any]:
+        data = dict(row.result_data or {})
+        job = {
+            "job_id": row.id,
+            "type": kind,
+            "status": row.status,
+            "created_at": _timestamp(row.created_at),
+            "updated_at": _timestamp(row.updated_at),
+            "error": row.error_message,
+            "stage": (data.get("progress") or {}).get("stage"),
+        }
+        if kind == "article":
+            job.update(url=row.url, persona=row.persona, content_language=row.content_language,
+                       number_of_slides=row.number_of_slides)
+        else:
+            job.update(voice=row.voice, content_generation_id=row.content_generation_id)
+        if include_result:
+            job["result"] = data.get("result")
+        return job
+    
+    # === Workers ===
+    
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            kind, job_id = await queue.get()
+            try:
+                await self._process(kind, job_id)
+            except Exception as e:
+                print(f"Job worker error for {kind} job {job_id}: {e}")
+            finally:
+                queue.task_done()
+    
+    async def _process(self, kind: str, job_id: int) -> None:
+        request = await executor.run_io(self._claim, kind, job_id)
+        if request is None:
+            return
+        progress: Dict[str, Any] = {}
+        changed = asyncio.Event()
+        
+        def on_stage(stage: str, data: Dict[str, Any]) -> None:
+            progress.update(stage=stage, at=datetime.now(timezone.utc).isoformat())
+            changed.set()
+        
+        writing = asyncio.Lock()
+        tracker = asyncio.create_task(self._track(kind, job_id, progress, changed, writing))
+        try:
+            result, error = await self._run(kind, job_id, request, on_stage)
+        finally:
+            # Wait out an in-flight renewal so it cannot overwrite the result
+            async with writing:
+                tracker.cancel()
+                await asyncio.gather(tracker, return_exceptions=True)
+        await executor.run_io(self._finish, kind, job_id, result, error, progress)
+    
+    async def _track(self, kind: str, job_id: int, progress: Dict[str, Any],
+                     changed: asyncio.Event, writing: asyncio.Lock) -> None:
+        """Persist the latest stage as it changes, renewing the lease at least three times per lease period"""
+        while True:
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=self.lease_seconds / 3)
+            except asyncio.TimeoutError:
+                pass
+            changed.clear()
+            async with writing:
+                try:
+                    await executor.run_io(self._renew, kind, job_id, dict(progress))
+                except Exception as e:
+                    print(f"Could not renew {kind} job {job_id}: {e}")
+    
+    async def _run(self, kind: str, job_id: int, request: Dict[str, Any],
+                   on_stage: Callable) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Run a claimed job, returning (result, None) or (None, error message)"""
+        try:
+            if kind == "article":
+                structured_output = await self.pipeline.generate_story(
+                    request["url"], request["content_language"], request["number_of_slides"],
+                    single_shot=request.get("single_shot"), on_stage=on_stage
+                )
+                result = {
+                    "structured_output": structured_output,
+                    "filename": generate_filename("structured_slides", "json"),
+                }
+            else:
+                on_stage("synthesis", {})
+                tts_output, remotion_input = await self.pipeline.synthesize(request["structured_slides"], request["voice"])
+                result = {
+                    "tts_output": tts_output,
+                    "remotion_input": remotion_input,
+                    "filename": generate_filename("tts_output", "json"),
+                }
+        except Exception as e:
+            print(f"{kind.capitalize()} job {job_id} failed: {e}")
+            return None, str(e)
+        return result, None
+    
+    def _claim(self, kind: str, job_id: int) -> Optional[Dict[str, Any]]:
+        """Lease a pending (or abandoned) job to this worker and return its request; None if it is gone or taken"""
+        model = JOB_MODELS[kind]
+        claimable = or_(
+            model.status == "pending",
+            and_(model.status == "processing", or_(model.claimed_at.is_(None), model.claimed_at < self._lease_cutoff()))
+        )
+        with self.session_factory() as db:
+            # Conditional update, so only one worker (or process) can win the claim
+            claimed = db.execute(
+                update(model)
+                .where(model.id == job_id, claimable)
+                .values(status="processing", error_message=None,
+                        claimed_by=self.owner, claimed_at=datetime.now(timezone.utc))
+            )
+            if claimed.rowcount != 1:
+                db.rollback()
+                return None
+            row = db.get(model, job_id)
+            request = dict((row.result_data or {}).get("request", {}))
+            if kind == "article":
+                request.update(url=row.url, content_language=row.content_language,
+                               number_of_slides=row.number_of_slides)
+            else:
+                request["voice"] = row.voice
+            db.commit()
+            return request
+    
+    def _owned(self, db, kind: str, job_id: int):
+        """The job's row while this worker still holds its lease, else None"""
+        row = db.get(JOB_MODELS[kind], job_id)
+        if row is None or row.status != "processing" or row.claimed_by != self.owner:
+            return None
+        return row
+    
+    def _renew(self, kind: str, job_id: int, progress: Dict[str, Any]) -> None:
+        """Extend the lease and record the job's current stage"""
+        with self.session_factory() as db:
+            row = self._owned(db, kind, job_id)
+            if row is None:
+                return
+            row.claimed_at = datetime.now(timezone.utc)
+            if progress:
+                row.result_data = {**(row.result_data or {}), "progress": progress}
+            db.commit()
+    
+    def _finish(self, kind: str, job_id: int, result: Optional[Dict[str, Any]], error: Optional[str],
+                progress: Dict[str, Any]) -> None:
+        with self.session_factory() as db:
+            row = self._owned(db, kind, job_id)
+            if row is None:
+                print(f"{kind.capitalize()} job {job_id} lost its lease; discarding this run's result")
+                return
+            row.status = "failed" if error else "completed"
+            row.error_message = error
+            row.result_data = {**(row.result_data or {}), "result": result}
+            if progress:
+                row.result_data["progress"] = progress
+            db.commit()
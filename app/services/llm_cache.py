@@ -0,0 +1,63 @@
+"""
+LLM response cache for Suvichaar FastAPI Service
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.utils.cache import MemoryCache, SQLiteCache, TieredCache
+
+
+class LLMResponseCache:
+    """Content-addressed cache for chat completion results"""
+    
+    def __init__(self, cache: TieredCache, enabled: bool = True):
+        self.cache = cache
+        self.enabled = enabled
+    
+    @staticmethod
+    def make_key(deployment: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        """Hash deployment, messages and request parameters into a cache key"""
+        payload = json.dumps(
+            {"deployment": deployment, "messages": messages, "params": params},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached completion, if any"""
+        if not self.enabled:
+            return None
+        return self.cache.get(key)
+    
+    def set(self, key: str, content: str) -> None:
+        """Store a completion"""
+        if self.enabled:
+            self.cache.set(key, content)
+    
+    def clear(self) -> None:
+        """Drop every cached completion"""
+        self.cache.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes"""
+        return {"enabled": self.enabled, **self.cache.stats()}
+
+
+def build_llm_cache() -> LLMResponseCache:
+    """Create the LLM cache configured in settings"""
+    ttl = settings.LLM_CACHE_TTL_SECONDS or None
+    memory = MemoryCache(
+        max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+        max_bytes=settings.LLM_CACHE_MAX_BYTES,
+        ttl=ttl
+    )
+    disk = None
+    if settings.LLM_CACHE_SQLITE_PATH:
+        disk = SQLiteCache(settings.LLM_CACHE_SQLITE_PATH, max_entries=settings.LLM_CACHE_SQLITE_MAX_ENTRIES, ttl=ttl)
+    return LLMResponseCache(TieredCache(memory, disk), enabled=settings.LLM_CACHE_ENABLED)
+
+
+# Process-wide cache shared by every ArticleService
+llm_cache = build_llm_cache()
@@ -0,0 +1,217 @@
+"""
+Azure OpenAI deployment pool for Suvichaar FastAPI Service
+"""
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from openai import AzureOpenAI, AsyncAzureOpenAI, DEFAULT_MAX_RETRIES
+
+from app.core.config import settings
+from app.services.rate_limiter import LLMRateLimiter, RETRYABLE_ERRORS, build_llm_rate_limiter, estimate_tokens
+
+
+class Deployment:
+    """One Azure OpenAI deployment: its clients, its own quota limiter and routing/health state"""
+    
+    def __init__(self, name: str, deployment: str, client: Any, async_client: Any,
+                 limiter: LLMRateLimiter, weight: float = 1.0):
+        self.name = name
+        self.deployment = deployment
+        self.client = client
+        self.async_client = async_client
+        self.limiter = limiter
+        self.weight = weight if weight > 0 else 1.0
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Routing, health and rate limit state"""
+        return {
+            "name": self.name,
+            "deployment": self.deployment,
+            "weight": self.weight,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "ejected_for": round(max(0.0, self.ejected_until - time.monotonic()), 3),
+            "rate_limit": self.limiter.stats(),
+        }
+
+
+class DeploymentPool:
+    """
+    Routes chat completions to the deployment with the fewest outstanding requests per unit of
+    weight, preferring ones neither ejected nor paused by their limiter. Repeated 429/5xx/connection
+    errors eject a deployment for a while; a failed call moves on to the next best deployment.
+    """
+    
+    def __init__(self, deployments: List[Deployment], max_attempts: int = 1,
+                 eject_after: int = 3, eject_seconds: float = 30.0,
+                 base_delay: float = 1.0, max_delay: float = 30.0):
+        if not deployments:
+            raise ValueError("DeploymentPool needs at least one deployment")
+        self.deployments = deployments
+        self.max_attempts = max(1, max_attempts)
+        self.eject_after = max(1, eject_after)
+        self.eject_seconds = eject_seconds
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+    
+    # === Calls ===
+    
+    def complete(self, messages: List[Dict[str, str]], params: Dict[str, Any]) -> Any:
+        """Run a chat completion on the best deployment, failing over on retryable errors"""
+        estimated = estimate_tokens(messages, params)
+        tried: Set[str] = set()
+        for attempt in range(self.max_attempts):
+            deployment = self._acquire(tried)
+            try:
+                response = deployment.limiter.call(
+                    # Raw responses expose the x-ratelimit-* headers the limiter adapts to
+                    lambda: deployment.client.chat.completions.with_raw_response.create(
+                        model=deployment.deployment, messages=messages, **params
+                    ),
+                    estimated
+                )
+            except Exception as e:
+                delay = self._on_failure(deployment, e, attempt, tried)
+                if delay is None:
+                    raise
+            else:
+                self._on_success(deployment)
+                return response
+            finally:
+                self._release(deployment)
+            time.sleep(delay)
+    
+    async def complete_async(self, messages: List[Dict[str, str]], params: Dict[str, Any]) -> Any:
+        """Await a chat completion on the best deployment, failing over on retryable errors"""
+        estimated = estimate_tokens(messages, params)
+        tried: Set[str] = set()
+        for attempt in range(self.max_attempts):
+            deployment = self._acquire(tried)
+            try:
+                response = await deployment.limiter.call_async(
+                    lambda: deployment.async_client.chat.completions.with_raw_response.create(
+                        model=deployment.deployment, messages=messages, **params
+                    ),
+                    estimated
+                )
+            except Exception as e:
+                delay = self._on_failure(deployment, e, attempt, tried)
+                if delay is None:
+                    raise
+            else:
+                self._on_success(deployment)
+                return response
+            finally:
+                self._release(deployment)
+            await asyncio.sleep(delay)
+    
+    # === Routing and health ===
+    
+    def _acquire(self, tried: Set[str]) -> Deployment:
+        """Pick a deployment not yet tried by this call and count it as outstanding"""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [d for d in self.deployments if d.name not in tried] or self.deployments
+            healthy = [d for d in candidates if d.ejected_until <= now]
+            if not healthy:
+                # Everything is ejected: use the deployment that recovers first
+                healthy = [min(candidates, key=lambda d: d.ejected_until)]
+            chosen = min(healthy, key=lambda d: (
+                d.limiter.paused_until > now, (d.outstanding + 1) / d.weight, -d.weight
+            ))
+            chosen.outstanding += 1
+            chosen.requests += 1
+            return chosen
+    
+    def _release(self, deployment: Deployment) -> None:
+        with self._lock:
+            deployment.outstanding -= 1
+    
+    def _on_success(self, deployment: Deployment) -> None:
+        with self._lock:
+            deployment.consecutive_failures = 0
+    
+    def _on_failure(self, deployment: Deployment, error: Exception, attempt: int, tried: Set[str]) -> Optional[float]:
+        """Record a failure and return the delay before the next attempt, or None when the error is final"""
+        if not isinstance(error, RETRYABLE_ERRORS):
+            return None  # the request itself is bad; another deployment would reject it too
+        with self._lock:
+            deployment.failures += 1
+            deployment.consecutive_failures += 1
+            if deployment.consecutive_failures >= self.eject_after:
+                deployment.consecutive_failures = 0
+                deployment.ejections += 1
+                deployment.ejected_until = time.monotonic() + self.eject_seconds
+                print(f"Ejecting Azure OpenAI deployment {deployment.name} for {self.eject_seconds}s: {error}")
+            tried.add(deployment.name)
+            exhausted = len(tried) >= len(self.deployments)
+            if exhausted:
+                tried.clear()
+        if attempt + 1 >= self.max_attempts:
+            return None
+        # Fail over immediately; back off only once every deployment has failed this call
+        if not exhausted:
+            return 0.0
+        return min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Per-deployment routing, health and rate limit state"""
+        with self._lock:
+            return {"deployments": [deployment.stats() for deployment in self.deployments]}
+
+
+def build_deployment_pool() -> DeploymentPool:
+    """
+    Create the pool configured in settings: AZURE_OPENAI_DEPLOYMENTS, or the single
+    AZURE_OPENAI_ENDPOINT deployment when that list is empty
+    """
+    configs = settings.AZURE_OPENAI_DEPLOYMENTS or [{"name": "default"}]
+    single = len(configs) == 1
+    max_retries = 0 if settings.LLM_RATE_LIMIT_ENABLED else DEFAULT_MAX_RETRIES
+    deployments = []
+    for index, config in enumerate(configs):
+        client_args = {
+            "azure_endpoint": config.get("endpoint", settings.AZURE_OPENAI_ENDPOINT),
+            "api_key": config.get("api_key", settings.AZURE_OPENAI_API_KEY),
+            "api_version": config.get("api_version", settings.AZURE_OPENAI_API_VERSION),
+            # The limiter owns retries (with backoff shared across callers), so the SDK's are disabled
+            "max_retries": max_retries,
+        }
+        deployments.append(Deployment(
+            name=config.get("name", f"deployment{index + 1}"),
+            deployment=config.get("deployment", settings.AZURE_OPENAI_DEPLOYMENT_NAME),
+            client=AzureOpenAI(**client_args),
+            async_client=AsyncAzureOpenAI(**client_args),
+            # With several deployments a failed call fails over instead of retrying in place
+            limiter=build_llm_rate_limiter(
+                requests_per_minute=config.get("requests_per_minute"),
+                tokens_per_minute=config.get("tokens_per_minute"),
+                max_concurrency=config.get("max_concurrency"),
+                max_attempts=None if single else 1
+            ),
+            weight=float(config.get("weight", 1))
+        ))
+    return DeploymentPool(
+        deployments,
+        max_attempts=1 if single else settings.LLM_MAX_ATTEMPTS,
+        eject_after=settings.LLM_EJECT_AFTER_FAILURES,
+        eject_seconds=settings.LLM_EJECT_SECONDS,
+        base_delay=settings.LLM_RETRY_BASE_DELAY,
+        max_delay=settings.LLM_RETRY_MAX_DELAY
+    )
+
+
+# Process-wide pool shared by every ArticleService
+llm_pool = build_deployment_pool()
@@ -0,0 +1,123 @@
+"""
+Story generation pipeline for Suvichaar FastAPI Service
+"""
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.cancellation import CancellationToken
+from app.core.config import settings
+from app.services.article_service import ArticleService, StageCallback, ignore_stage
+from app.services.tts_service import TTSService
+from app.utils.helpers import create_structured_output, generate_filename
+
+# Placeholder image used for Remotion input
+REMOTION_IMAGE_URL = "https://media.suvichaar.org/upload/polaris/polariscover.png"
+
+
+class StoryPipeline:
+    """Article URL -> structured slides -> optional TTS, for single requests and batches"""
+    
+    def __init__(self, article_service: ArticleService, tts_service: TTSService,
+                 batch_concurrency: int = settings.BATCH_CONCURRENCY):
+        self.article_service = article_service
+        self.tts_service = tts_service
+        self.batch_concurrency = max(1, batch_concurrency)
+    
+    async def generate_story(self, url: str, content_language: str, number_of_slides: int,
+                             single_shot: Optional[bool] = None,
+                             on_stage: StageCallback = ignore_stage) -> Dict[str, str]:
+        """Extract an article and generate its structured slide output, reporting each stage to on_stage"""
+        # Extract and analyze article
+        title, summary, full_text = await self.article_service.extract_article_async(url)
+        on_stage("extraction", {"title": title, "summary": summary})
+        sentiment = await self.article_service.get_sentiment_async(summary or full_text)
+        on_stage("sentiment", {"sentiment": sentiment})
+        
+        # Classification, hookline, storytitle and slide content run concurrently
+        output = await self.article_service.generate_story_content_async(
+            title, summary, full_text, content_language, single_shot=single_shot, on_stage=on_stage
+        )
+        
+        # Create structured output
+        structured_output = create_structured_output(
+            output["storytitle"], output["hookline"], output.get("slides", []), number_of_slides
+        )
+        
+        # Hindi transliteration if needed
+        if content_language == "Hindi":
+            structured_output = await self.tts_service.transliterate_to_devanagari_async(structured_output)
+            on_stage("transliteration", {"structured_output": structured_output})
+        
+        return structured_output
+    
+    async def stream_story(self, url: str, content_language: str, number_of_slides: int,
+                           single_shot: Optional[bool] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (stage, data) as each pipeline stage finishes, ending with "complete" or "error".
+        Closing the iterator early (e.g. on client disconnect) cancels the remaining LLM calls.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        
+        async def run() -> None:
+            try:
+                structured_output = await self.generate_story(
+                    url, content_language, number_of_slides, single_shot, on_stage=lambda *event: events.put_nowait(event)
+                )
+                events.put_nowait(("complete", {
+                    "structured_output": structured_output,
+                    "filename": generate_filename("structured_slides", "json"),
+                }))
+            except Exception as e:
+                events.put_nowait(("error", {"detail": str(e)}))
+        
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                stage, data = await events.get()
+                yield stage, data
+                if stage in ("complete", "error"):
+                    return
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+    
+    async def synthesize(self, structured_slides: Dict[str, Any], voice: str,
+                         token: Optional[CancellationToken] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Generate TTS for every slide and the matching Remotion input"""
+        tts_output = await self.tts_service.synthesize_and_upload_async(structured_slides, voice, token=token)
+        remotion_input = self.tts_service.generate_remotion_input(tts_output, REMOTION_IMAGE_URL)
+        return tts_output, remotion_input
+    
+    async def run_batch(self, urls: List[str], content_language: str, number_of_slides: int,
+                        single_shot: Optional[bool] = None, voice: Optional[str] = None,
+                        concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run the pipeline for many URLs with bounded concurrency. Failures are reported per item
+        and never abort the batch. TTS runs only when a voice is given.
+        """
+        semaphore = asyncio.Semaphore(max(1, min(concurrency or self.batch_concurrency, self.batch_concurrency)))
+        
+        async def run_one(index: int, url: str) -> Dict[str, Any]:
+            result: Dict[str, Any] = {"index": index, "url": url, "success": False}
+            async with semaphore:
+                try:
+                    structured_output = await self.generate_story(url, content_language, number_of_slides, single_shot)
+                    result["structured_output"] = structured_output
+                    result["filename"] = generate_filename("structured_slides", "json")
+                    if voice:
+                        result["tts_output"], result["remotion_input"] = await self.synthesize(structured_output, voice)
+                    result["success"] = True
+                except Exception as e:
+                    result["error"] = str(e)
+            return result
+        
+        results = await asyncio.gather(*(run_one(index, url) for index, url in enumerate(urls)))
+        failed = sum(1 for result in results if not result["success"])
+        return {
+            "total_items": len(results),
+            "processed_items": len(results) - failed,
+            "failed_items": failed,
+            "results": list(results),
+        }
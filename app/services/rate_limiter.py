@@ -0,0 +1,344 @@
+"""
+Azure OpenAI rate limiting for Suvichaar FastAPI Service
+"""
+import asyncio
+import random
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
+
+import openai
+
+from app.core.config import settings
+
+
+# Completion budget assumed for TPM accounting when a request sets no max_tokens
+DEFAULT_COMPLETION_TOKENS = 500
+# Errors worth another attempt: throttling, server errors, timeouts and dropped connections
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+# Minimum seconds between two multiplicative decreases, so one burst of 429s halves once
+_DECREASE_COOLDOWN = 1.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)?")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}
+
+
+def estimate_tokens(messages: List[Dict[str, str]], params: Mapping[str, Any]) -> int:
+    """Prompt plus completion tokens for a request, at roughly four characters per token"""
+    prompt_chars = sum(len(message.get("content") or "") for message in messages)
+    return prompt_chars // 4 + int(params.get("max_tokens") or DEFAULT_COMPLETION_TOKENS)
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds in a header value such as 20, 1.5s, 6m0s or 250ms"""
+    parts = _DURATION_PART.findall(value or "")
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit or None] for number, unit in parts)
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Server-requested delay from retry-after-ms / retry-after"""
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    try:
+        return float(headers["retry-after"]) if headers.get("retry-after") else None
+    except ValueError:
+        return None  # HTTP-date form; fall back to backoff
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        return int(float(headers[name])) if headers.get(name) else None
+    except ValueError:
+        return None
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class TokenBucket:
+    """Continuously refilling per-minute budget; a rate of 0 means unlimited. Callers hold the limiter lock."""
+    
+    def __init__(self, per_minute: float):
+        self.per_minute = float(per_minute)
+        self.tokens = self.per_minute
+        self.updated = time.monotonic()
+    
+    @property
+    def unlimited(self) -> bool:
+        """Whether no quota is configured or learned"""
+        return self.per_minute <= 0
+    
+    def _refill(self, now: float) -> None:
+        if not self.unlimited:
+            self.tokens = min(self.per_minute, self.tokens + (now - self.updated) * self.per_minute / 60)
+        self.updated = now
+    
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount is available; requests larger than the quota wait for a full bucket"""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        needed = min(amount, self.per_minute)
+        return 0.0 if self.tokens >= needed else (needed - self.tokens) * 60 / self.per_minute
+    
+    def take(self, amount: float) -> None:
+        """Spend amount (the balance may go negative for oversized requests)"""
+        if not self.unlimited:
+            self.tokens -= amount
+    
+    def credit(self, amount: float) -> None:
+        """Return (or, if negative, charge) the difference between estimated and actual use"""
+        if not self.unlimited:
+            self.tokens = min(self.per_minute, self.tokens + amount)
+    
+    def observe(self, limit: Optional[int], remaining: Optional[int], now: float) -> None:
+        """Align with the quota the server reports"""
+        if limit:
+            if self.unlimited:
+                # First quota learned: start from what the server says is left, else a full bucket
+                self.tokens = float(limit if remaining is None else remaining)
+                self.updated = now
+            else:
+                self._refill(now)
+            # Keep the current fill, clamped to the new capacity
+            self.per_minute = float(limit)
+            self.tokens = min(self.tokens, self.per_minute)
+        if remaining is not None and not self.unlimited:
+            self._refill(now)
+            self.tokens = min(self.tokens, remaining)
+    
+    def available(self) -> Optional[int]:
+        """Current balance, or None when unlimited"""
+        if self.unlimited:
+            return None
+        self._refill(time.monotonic())
+        return int(self.tokens)
+
+
+class LLMRateLimiter:
+    """
+    Shared RPM/TPM token buckets and an AIMD concurrency limit for chat completions.
+    Every response's x-ratelimit-* headers realign the buckets. A 429 halves the concurrency
+    limit and pauses all callers for Retry-After; each success grows it by roughly one slot per
+    round of requests. Throttles, 5xx and connection errors are retried with jittered backoff.
+    """
+    
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0,
+                 max_concurrency: int = 32, min_concurrency: int = 2, max_attempts: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 30.0, enabled: bool = True):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.enabled = enabled
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.calls = 0
+        self.throttled = 0
+        self.retries = 0
+        self.failed = 0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        # Released slots wake blocked threads through the condition and async callers through their futures
+        self._slot_free = threading.Condition(self._lock)
+        self._async_waiters: List[asyncio.Future] = []
+    
+    # === Calls ===
+    
+    def call(self, request: Callable[[], Any], estimated_tokens: int) -> Any:
+        """Run request (returning a raw API response) within the limits and return the parsed response"""
+        if not self.enabled:
+            return request().parse()
+        
+        for attempt in range(self.max_attempts):
+            self._acquire(estimated_tokens)
+            try:
+                raw = request()
+                parsed = raw.parse()
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+            else:
+                self._on_success(raw.headers, estimated_tokens, parsed)
+                return parsed
+            finally:
+                self._release()
+            time.sleep(delay)
+    
+    async def call_async(self, request: Callable[[], Awaitable[Any]], estimated_tokens: int) -> Any:
+        """Await request (returning a raw API response) within the limits and return the parsed response"""
+        if not self.enabled:
+            return (await request()).parse()
+        
+        for attempt in range(self.max_attempts):
+            await self._acquire_async(estimated_tokens)
+            try:
+                raw = await request()
+                parsed = raw.parse()
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+            else:
+                self._on_success(raw.headers, estimated_tokens, parsed)
+                return parsed
+            finally:
+                self._release()
+            await asyncio.sleep(delay)
+    
+    # === Accounting ===
+    
+    def _acquire(self, estimated_tokens: int) -> None:
+        """Block until a slot and the request's budget are free, then take them"""
+        with self._slot_free:
+            while True:
+                wait = self._budget_wait(estimated_tokens)
+                if wait > 0:
+                    self._slot_free.wait(wait)
+                elif self.in_flight >= int(self.limit):
+                    self._slot_free.wait()
+                else:
+                    self._take(estimated_tokens)
+                    return
+    
+    async def _acquire_async(self, estimated_tokens: int) -> None:
+        """Wait until a slot and the request's budget are free, then take them"""
+        while True:
+            waiter = None
+            with self._lock:
+                wait = self._budget_wait(estimated_tokens)
+                if wait <= 0:
+                    if self.in_flight < int(self.limit):
+                        self._take(estimated_tokens)
+                        return
+                    waiter = asyncio.get_running_loop().create_future()
+                    self._async_waiters.append(waiter)
+            if waiter is None:
+                await asyncio.sleep(wait)
+                continue
+            try:
+                await waiter
+            finally:
+                with self._lock:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+    
+    def _budget_wait(self, estimated_tokens: int) -> float:
+        """Seconds until a pause ends and both buckets can pay for the request; callers hold the lock"""
+        now = time.monotonic()
+        return max(
+            self.paused_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(estimated_tokens, now)
+        )
+    
+    def _take(self, estimated_tokens: int) -> None:
+        self.in_flight += 1
+        self.calls += 1
+        self.requests.take(1)
+        self.tokens.take(estimated_tokens)
+    
+    def _release(self) -> None:
+        """Free a slot and wake every waiter to recheck it"""
+        with self._lock:
+            self.in_flight -= 1
+            self._slot_free.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for waiter in waiters:
+            # Callers may run on other threads' loops; futures are only touched from their own loop
+            waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+    
+    def _on_success(self, headers: Mapping[str, str], estimated_tokens: int, parsed: Any) -> None:
+        """Additive increase, and correct the TPM bucket with the reported usage"""
+        used = getattr(getattr(parsed, "usage", None), "total_tokens", None)
+        with self._lock:
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            if isinstance(used, int):
+                self.tokens.credit(estimated_tokens - used)
+            self._observe(headers, time.monotonic())
+    
+    def _on_error(self, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None when the error is final"""
+        if not isinstance(error, RETRYABLE_ERRORS):
+            with self._lock:
+                self.failed += 1
+            return None
+        
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        retry_after = retry_after_seconds(headers)
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, self.base_delay)
+        else:
+            delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+        
+        final = attempt + 1 >= self.max_attempts
+        with self._lock:
+            now = time.monotonic()
+            if final:
+                self.failed += 1
+            else:
+                self.retries += 1
+            if isinstance(error, openai.RateLimitError):
+                # Multiplicative decrease, once per burst of throttles
+                self.throttled += 1
+                if now - self._last_decrease >= _DECREASE_COOLDOWN:
+                    self.limit = max(float(self.min_concurrency), self.limit / 2)
+                    self._last_decrease = now
+                if retry_after is not None:
+                    self.paused_until = max(self.paused_until, now + retry_after)
+                self._observe(headers, now)
+        return None if final else delay
+    
+    def _observe(self, headers: Mapping[str, str], now: float) -> None:
+        """Apply x-ratelimit-* headers; an exhausted quota pauses callers until its reset"""
+        for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+            remaining = _header_int(headers, f"x-ratelimit-remaining-{kind}")
+            bucket.observe(_header_int(headers, f"x-ratelimit-limit-{kind}"), remaining, now)
+            if remaining == 0:
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}")) or 1.0
+                self.paused_until = max(self.paused_until, now + reset)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Current limits, bucket balances and retry counters"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "concurrency_limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "requests_available": self.requests.available(),
+                "tokens_available": self.tokens.available(),
+                "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 3),
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "failed": self.failed,
+            }
+
+
+def build_llm_rate_limiter(requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None,
+                           max_concurrency: Optional[int] = None,
+                           max_attempts: Optional[int] = None) -> LLMRateLimiter:
+    """Create a rate limiter for one deployment, defaulting to the limits configured in settings"""
+    return LLMRateLimiter(
+        requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute,
+        tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute,
+        max_concurrency=max_concurrency or settings.LLM_MAX_CONCURRENCY,
+        min_concurrency=settings.LLM_MIN_CONCURRENCY,
+        max_attempts=max_attempts or settings.LLM_MAX_ATTEMPTS,
+        base_delay=settings.LLM_RETRY_BASE_DELAY,
+        max_delay=settings.LLM_RETRY_MAX_DELAY,
+        enabled=settings.LLM_RATE_LIMIT_ENABLED
+    )
@@ -1,6 +1,8 @@
 """
 S3 Service for Suvichaar FastAPI Service
 """
+import io
+import asyncio
 import os
 import uuid
 import json
@@ -9,22 +11,151 @@ import requests
 import boto3
 import random
 import string
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from urllib.parse import urlparse
 from datetime import datetime, timezone
+from app.core.aws import get_s3_client, get_s3_upload_pool
 from app.core.config import settings
 
 
+# Published stories live in their own bucket, served from the bucket endpoint
+STORIES_BUCKET = "suvichaarstories"
+
+
+class UploadItem(NamedTuple):
+    """One object to upload: S3 key, body and content type (bucket defaults to AWS_BUCKET)"""
+    key: str
+    body: bytes
+    content_type: str
+    bucket: Optional[str] = None
+
+
+class UploadResult(NamedTuple):
+    """Outcome of one item in a batch upload"""
+    key: str
+    url: Optional[str]
+    error: Optional[str] = None
+
+
+class S3StreamingUpload:
+    """Incremental S3 upload: put_object for small bodies, multipart once a body outgrows one part"""
+    
+    def __init__(self, s3_client, bucket: str, key: str, content_type: str,
+                 part_size: int = settings.S3_MULTIPART_PART_SIZE):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.part_size = max(part_size, 5 * 1024 * 1024)  # S3 minimum for non-final parts
+        self.bytes_written = 0
+        self._buffer = io.BytesIO()
+        self._upload_id: Optional[str] = None
+        self._parts = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.complete()
+        else:
+            self.abort()
+        return False
+    
+    def write(self, chunk: bytes) -> None:
+        """Buffer a chunk, shipping a multipart part whenever a full part is buffered"""
+        if not chunk:
+            return
+        self._buffer.write(chunk)
+        self.bytes_written += len(chunk)
+        if self._buffer.tell() >= self.part_size:
+            self._upload_part(self._buffer.getvalue())
+            self._buffer = io.BytesIO()
+    
+    def complete(self) -> None:
+        """Finish the upload with whatever is still buffered"""
+        if self._upload_id is None:
+            self._buffer.seek(0)
+            self.s3_client.put_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Body=self._buffer,
+                ContentType=self.content_type,
+            )
+        else:
+            if self._buffer.tell():
+                self._upload_part(self._buffer.getvalue())
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        self._buffer = io.BytesIO()
+    
+    def abort(self) -> None:
+        """Discard buffered data and any multipart parts already sent"""
+        self._buffer = io.BytesIO()
+        if self._upload_id is not None:
+            try:
+                self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+            except Exception as e:
+                print(f"Multipart abort failed for {self.key}: {e}")
+            self._upload_id = None
+    
+    def tee(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Yield chunks to a consumer while uploading them. An S3 failure only drops the upload;
+        the upload is aborted if the consumer stops early (e.g. the client disconnects).
+        """
+        uploading = True
+        try:
+            for chunk in chunks:
+                if uploading:
+                    try:
+                        self.write(chunk)
+                    except Exception as e:
+                        print(f"S3 streaming upload failed for {self.key}: {e}")
+                        self.abort()
+                        uploading = False
+                yield chunk
+        except BaseException:
+            if uploading:
+                self.abort()
+            raise
+        
+        if uploading:
+            try:
+                self.complete()
+            except Exception as e:
+                print(f"S3 streaming upload failed for {self.key}: {e}")
+                self.abort()
+    
+    def _upload_part(self, data: bytes) -> None:
+        if self._upload_id is None:
+            response = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                ContentType=self.content_type,
+            )
+            self._upload_id = response["UploadId"]
+        part_number = len(self._parts) + 1
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+
 class S3Service:
     """Service for S3 operations"""
     
-    def __init__(self):
-        self.s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_ACCESS_KEY,
-            aws_secret_access_key=settings.AWS_SECRET_KEY,
-            region_name=settings.AWS_REGION,
-        )
+    def __init__(self, s3_client=None, upload_pool=None):
+        self.s3_client = s3_client or get_s3_client()
+        self.upload_pool = upload_pool or get_s3_upload_pool()
         self.bucket = settings.AWS_BUCKET
         self.s3_prefix = settings.S3_PREFIX
         self.cdn_base = settings.CDN_BASE
@@ -44,32 +175,26 @@ class S3Service:
         except Exception as e:
             raise Exception(f"S3 upload failed: {str(e)}")
     
+    def html_story_item(self, html_content: str, slug: str) -> UploadItem:
+        """Upload item for a published HTML story"""
+        return UploadItem(f"{slug}.html", html_content.encode("utf-8"), "text/html", STORIES_BUCKET)
+    
+    def metadata_item(self, metadata: Dict[str, Any], slug: str) -> UploadItem:
+        """Upload item for a published story's metadata JSON"""
+        json_content = json.dumps(metadata, indent=2, ensure_ascii=False)
+        return UploadItem(f"{slug}_metadata.json", json_content.encode("utf-8"), "application/json", STORIES_BUCKET)
+    
     def upload_html_story(self, html_content: str, slug: str) -> str:
         """Upload HTML story to S3"""
         try:
-            s3_key = f"{slug}.html"
-            self.s3_client.put_object(
-                Bucket="suvichaarstories",
-                Key=s3_key,
-                Body=html_content.encode("utf-8"),
-                ContentType="text/html",
-            )
-            return f"https://suvichaarstories.s3.amazonaws.com/{s3_key}"
+            return self.upload_item(self.html_story_item(html_content, slug))
         except Exception as e:
             raise Exception(f"HTML upload failed: {str(e)}")
     
     def upload_metadata(self, metadata: Dict[str, Any], slug: str) -> str:
         """Upload metadata JSON to S3"""
         try:
-            s3_key = f"{slug}_metadata.json"
-            json_content = json.dumps(metadata, indent=2, ensure_ascii=False)
-            self.s3_client.put_object(
-                Bucket="suvichaarstories",
-                Key=s3_key,
-                Body=json_content.encode("utf-8"),
-                ContentType="application/json",
-            )
-            return f"https://suvichaarstories.s3.amazonaws.com/{s3_key}"
+            return self.upload_item(self.metadata_item(metadata, slug))
         except Exception as e:
             raise Exception(f"Metadata upload failed: {str(e)}")
     
@@ -95,7 +220,7 @@ class S3Service:
             )
             
             return f"{self.cdn_base}{s3_key}"
-            
+        
         except Exception as e:
             raise Exception(f"Image upload failed: {str(e)}")
     
@@ -160,8 +285,7 @@ class S3Service:
     def upload_thumbnail(self, thumbnail_bytes: bytes) -> str:
         """Upload thumbnail to S3"""
         try:
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            key = f"{self.s3_prefix}cover_{ts}.png"
+            key = f"{self.s3_prefix}{self.unique_name('cover')}.png"
             
             self.s3_client.put_object(
                 Bucket=self.bucket,
@@ -174,56 +298,93 @@ class S3Service:
         except Exception as e:
             raise Exception(f"Thumbnail upload failed: {str(e)}")
     
+    def cdn_url(self, s3_key: str) -> str:
+        """CloudFront URL for an S3 key"""
+        return f"{self.cdn_base}{s3_key}"
+    
+    def item_url(self, item: UploadItem) -> str:
+        """Public URL of an upload item: CloudFront for AWS_BUCKET, the bucket endpoint otherwise"""
+        if item.bucket is None:
+            return self.cdn_url(item.key)
+        return f"https://{item.bucket}.s3.amazonaws.com/{item.key}"
+    
+    def upload_item(self, item: UploadItem) -> str:
+        """Upload one item and return its URL"""
+        self.s3_client.put_object(
+            Bucket=item.bucket or self.bucket,
+            Key=item.key,
+            Body=item.body,
+            ContentType=item.content_type,
+        )
+        return self.item_url(item)
+    
+    def _upload_result(self, item: UploadItem) -> UploadResult:
+        try:
+            return UploadResult(item.key, self.upload_item(item))
+        except Exception as e:
+            return UploadResult(item.key, None, str(e))
+    
+    def upload_batch(self, items: List[UploadItem]) -> List[UploadResult]:
+        """Upload items concurrently on the shared upload pool; results are in item order"""
+        if len(items) <= 1:
+            return [self._upload_result(item) for item in items]
+        return list(self.upload_pool.map(self._upload_result, items))
+    
+    async def upload_batch_async(self, items: List[UploadItem]) -> List[UploadResult]:
+        """Awaitable upload_batch that keeps the event loop free"""
+        loop = asyncio.get_running_loop()
+        return list(await asyncio.gather(*(
+            loop.run_in_executor(self.upload_pool, self._upload_result, item) for item in items
+        )))
+    
+    @staticmethod
+    def unique_name(prefix: str) -> str:
+        """prefix_timestamp_uuid; the uuid keeps keys from requests in the same second apart"""
+        return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex}"
+    
+    def processed_file_items(self, html_content: str, json_content: Dict[str, Any],
+                             filename_prefix: str = "processed") -> List[UploadItem]:
+        """HTML and JSON upload items for processed files, sharing one unique name"""
+        name = self.unique_name(filename_prefix)
+        json_str = json.dumps(json_content, indent=2, ensure_ascii=False)
+        return [
+            UploadItem(f"{self.s3_prefix}{name}.html",
+                       html_content.encode("utf-8"), "text/html; charset=utf-8"),
+            UploadItem(f"{self.s3_prefix}{name}.json",
+                       json_str.encode("utf-8"), "application/json; charset=utf-8"),
+        ]
+    
+    def amp_html_item(self, html_content: str, filename_prefix: str = "amp_story") -> UploadItem:
+        """Uniquely named upload item for an AMP HTML file"""
+        return UploadItem(f"{self.s3_prefix}{self.unique_name(filename_prefix)}.html",
+                          html_content.encode("utf-8"), "text/html; charset=utf-8")
+    
     def upload_processed_files(self, html_content: str, json_content: Dict[str, Any], filename_prefix: str = "processed") -> tuple[str, str]:
         """Upload processed HTML and JSON files to S3 and return CloudFront URLs"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Upload HTML file
-            html_filename = f"{filename_prefix}_{timestamp}.html"
-            html_s3_key = f"{self.s3_prefix}{html_filename}"
-            self.s3_client.put_object(
-                Bucket=self.bucket,
-                Key=html_s3_key,
-                Body=html_content.encode("utf-8"),
-                ContentType="text/html; charset=utf-8",
-            )
-            html_url = f"{self.cdn_base}{html_s3_key}"
-            
-            # Upload JSON file
-            json_filename = f"{filename_prefix}_{timestamp}.json"
-            json_s3_key = f"{self.s3_prefix}{json_filename}"
-            json_str = json.dumps(json_content, indent=2, ensure_ascii=False)
-            self.s3_client.put_object(
-                Bucket=self.bucket,
-                Key=json_s3_key,
-                Body=json_str.encode("utf-8"),
-                ContentType="application/json; charset=utf-8",
+            html_result, json_result = self.upload_batch(
+                self.processed_file_items(html_content, json_content, filename_prefix)
             )
-            json_url = f"{self.cdn_base}{json_s3_key}"
-            
-            return html_url, json_url
+            for result in (html_result, json_result):
+                if result.error:
+                    raise Exception(f"{result.key}: {result.error}")
             
+            return html_result.url, json_result.url
+        
         except Exception as e:
             raise Exception(f"Processed files upload failed: {str(e)}")
     
+    def open_streaming_upload(self, filename_prefix: str, extension: str,
+                              content_type: str) -> Tuple[S3StreamingUpload, str]:
+        """Start a uniquely named streaming upload and return it with its CloudFront URL"""
+        s3_key = f"{self.s3_prefix}{self.unique_name(filename_prefix)}.{extension}"
+        upload = S3StreamingUpload(self.s3_client, self.bucket, s3_key, content_type)
+        return upload, self.cdn_url(s3_key)
+    
     def upload_amp_html(self, html_content: str, filename_prefix: str = "amp_story") -> str:
         """Upload AMP HTML file to S3 and return CloudFront URL"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Upload HTML file
-            html_filename = f"{filename_prefix}_{timestamp}.html"
-            html_s3_key = f"{self.s3_prefix}{html_filename}"
-            self.s3_client.put_object(
-                Bucket=self.bucket,
-                Key=html_s3_key,
-                Body=html_content.encode("utf-8"),
-                ContentType="text/html; charset=utf-8",
-            )
-            html_url = f"{self.cdn_base}{html_s3_key}"
-            
-            return html_url
-            
+            return self.upload_item(self.amp_html_item(html_content, filename_prefix))
+        
         except Exception as e:
             raise Exception(f"AMP HTML upload failed: {str(e)}")
\ No newline at end of file
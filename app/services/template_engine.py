@@ -0,0 +1,188 @@
+"""
+Compiled HTML/AMP templates for Suvichaar FastAPI Service
+"""
+import hashlib
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.cache import MemoryCache
+
+
+SLIDES_MARKER = "<!--INSERT_SLIDES_HERE-->"
+SLIDES_SLOT = "__slides__"
+
+# One tokenizer for {{name}} slots, the slides marker, and href/src values wrapped in
+# braces (href="{https://...}" or href="{{{name}}}") that submissions unwrap.
+_TOKEN_PATTERN = re.compile(
+    r'(?P<attr>href|src)="\{(?P<inner>(?:https://|\{\{\w+\}\})(?:\{\{\w+\}\}|[^}])*)\}"'
+    r"|\{\{(?P<name>\w+)\}\}"
+    r"|(?P<slides>" + re.escape(SLIDES_MARKER) + ")"
+)
+_SLOT_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+_WRAPPED_URL = re.compile(r"https://[^}]+")
+
+_TEXT, _SLOT, _WRAPPED = 0, 1, 2
+
+
+def _split_slots(source: str) -> List[Tuple]:
+    """Split text into literal and {{name}} slot parts"""
+    parts = []
+    position = 0
+    for match in _SLOT_PATTERN.finditer(source):
+        if match.start() > position:
+            parts.append((_TEXT, source[position:match.start()]))
+        parts.append((_SLOT, match.group(1), match.group(0)))
+        position = match.end()
+    if position < len(source):
+        parts.append((_TEXT, source[position:]))
+    return parts
+
+
+class CompiledTemplate:
+    """A template split once into literal segments and named slots, rendered with a single join"""
+    
+    __slots__ = ("source", "parts", "slots", "_encoded_text")
+    
+    def __init__(self, source: str):
+        self.source = source
+        self.parts: List[Tuple] = []
+        self.slots: List[str] = []
+        self._encoded_text: Optional[List[Optional[bytes]]] = None
+        
+        position = 0
+        for match in _TOKEN_PATTERN.finditer(source):
+            if match.start() > position:
+                self.parts.append((_TEXT, source[position:match.start()]))
+            if match.group("attr"):
+                inner = _split_slots(match.group("inner"))
+                static = None
+                if all(part[0] == _TEXT for part in inner) and _WRAPPED_URL.fullmatch(match.group("inner")):
+                    static = f'{match.group("attr")}="{match.group("inner")}"'
+                self.parts.append((_WRAPPED, match.group("attr"), inner, match.group(0), static))
+                self.slots.extend(part[1] for part in inner if part[0] == _SLOT)
+            else:
+                name = match.group("name") or SLIDES_SLOT
+                self.parts.append((_SLOT, name, match.group(0)))
+                self.slots.append(name)
+            position = match.end()
+        if position < len(source):
+            self.parts.append((_TEXT, source[position:]))
+    
+    def has_slot(self, name: str) -> bool:
+        """Whether the template contains the given slot"""
+        return name in self.slots
+    
+    def render(self, values: Mapping[str, str], unwrap_urls: bool = False,
+               late_values: Optional[Mapping[str, str]] = None) -> str:
+        """
+        Fill slots in a single pass; slots without a value keep their original text.
+        
+        With unwrap_urls, href/src values of the form "{https://...}" lose their braces,
+        as the old post-render re.sub cleanup did. late_values fill slots like that
+        cleanup's follow-up replaces did: they never trigger unwrapping.
+        """
+        late_values = late_values or {}
+        out = []
+        append = out.append
+        for part in self.parts:
+            kind = part[0]
+            if kind == _TEXT:
+                append(part[1])
+            elif kind == _SLOT:
+                name = part[1]
+                append(values.get(name) if name in values else late_values.get(name, part[2]))
+            elif unwrap_urls and part[4] is not None:
+                append(part[4])
+            else:
+                append(self._render_wrapped(part, values, late_values, unwrap_urls))
+        return "".join(out)
+    
+    def iter_chunks(self, values: Mapping[str, str],
+                    streams: Optional[Mapping[str, Iterable[str]]] = None) -> Iterator[str]:
+        """Yield the document as chunks; streams splice an iterable of chunks into a slot"""
+        streams = streams or {}
+        for part in self.parts:
+            kind = part[0]
+            if kind == _TEXT:
+                yield part[1]
+            elif kind == _SLOT and part[1] in streams:
+                yield from streams[part[1]]
+            elif kind == _SLOT:
+                yield values.get(part[1], part[2])
+            else:
+                yield self._render_wrapped(part, values, {}, False)
+    
+    def iter_encoded(self, values: Mapping[str, str],
+                     streams: Optional[Mapping[str, Iterable[bytes]]] = None) -> Iterator[bytes]:
+        """Like iter_chunks, but yields UTF-8 bytes; literal segments are encoded once per template"""
+        if self._encoded_text is None:
+            self._encoded_text = [part[1].encode("utf-8") if part[0] == _TEXT else None for part in self.parts]
+        streams = streams or {}
+        for part, encoded in zip(self.parts, self._encoded_text):
+            kind = part[0]
+            if encoded is not None:
+                yield encoded
+            elif kind == _SLOT and part[1] in streams:
+                yield from streams[part[1]]
+            elif kind == _SLOT:
+                yield values.get(part[1], part[2]).encode("utf-8")
+            else:
+                yield self._render_wrapped(part, values, {}, False).encode("utf-8")
+    
+    @staticmethod
+    def _render_wrapped(part: Tuple, values: Mapping[str, str], late_values: Mapping[str, str],
+                        unwrap_urls: bool) -> str:
+        """Render an href/src value wrapped in braces, unwrapping it when it resolves to a URL"""
+        _, attr, inner, raw, _ = part
+        pieces = []
+        resolved = True
+        for inner_part in inner:
+            if inner_part[0] == _TEXT:
+                pieces.append(inner_part[1])
+            elif inner_part[1] in values:
+                pieces.append(values[inner_part[1]])
+            else:
+                resolved = False
+                pieces.append(late_values.get(inner_part[1], inner_part[2]))
+        content = "".join(pieces)
+        if unwrap_urls and resolved and _WRAPPED_URL.fullmatch(content):
+            return f'{attr}="{content}"'
+        return f'{attr}="{{{content}}}"'
+
+
+class TemplateCache:
+    """Bounded cache of compiled templates keyed by URL + validator, or by content hash"""
+    
+    def __init__(self, max_entries: int = settings.TEMPLATE_CACHE_ENTRIES,
+                 max_bytes: int = settings.TEMPLATE_CACHE_BYTES):
+        self._cache = MemoryCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def content_key(source: str) -> str:
+        """Cache key for an inline template"""
+        return "sha256:" + hashlib.sha256(source.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def url_key(url: str, validator: Optional[str], source: str) -> str:
+        """Cache key for a fetched template; falls back to content hash without an ETag/Last-Modified"""
+        return f"url:{url}|{validator}" if validator else TemplateCache.content_key(source)
+    
+    def compile(self, source: str, key: Optional[str] = None) -> CompiledTemplate:
+        """Return the compiled template for source, compiling at most once per key"""
+        key = key or self.content_key(source)
+        template = self._cache.get(key)
+        if template is not None and template.source == source:
+            self.hits += 1
+            return template
+        
+        self.misses += 1
+        template = CompiledTemplate(source)
+        self._cache.set(key, template, size=len(source))
+        return template
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and cache size"""
+        return {"hits": self.hits, "misses": self.misses, **self._cache.stats()}
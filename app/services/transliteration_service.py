@@ -0,0 +1,137 @@
+"""
+Transliteration Service for Suvichaar FastAPI Service
+"""
+import json
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.utils.cache import MemoryCache
+
+
+class TransliterationService:
+    """Batched Hindi (Latin script) to Devanagari transliteration"""
+    
+    def __init__(self, article_service=None):
+        self._article_service = article_service
+        self.max_attempts = max(1, settings.TRANSLITERATION_MAX_ATTEMPTS)
+        # Transliterations keyed by source text; a size of 0 disables the cache
+        size = settings.TRANSLITERATION_CACHE_SIZE
+        self.cache: Optional[MemoryCache] = MemoryCache(max_entries=size) if size > 0 else None
+    
+    @property
+    def article_service(self):
+        """Shared ArticleService used for LLM calls, created on first use"""
+        if self._article_service is None:
+            from app.services.article_service import ArticleService
+            self._article_service = ArticleService()
+        return self._article_service
+    
+    @staticmethod
+    def is_transliterable(key: str, value: str) -> bool:
+        """Only slide paragraphs are transliterated"""
+        return key.startswith("s") and "paragraph1" in key and bool(value.strip())
+    
+    def transliterate(self, json_data: Dict[str, str]) -> Dict[str, str]:
+        """Transliterate slide paragraphs with one keyed-JSON request per attempt"""
+        translated: Dict[str, str] = {}
+        pending = self._pending_sources(json_data, translated)
+        
+        for _ in range(self.max_attempts):
+            if not pending:
+                break
+            try:
+                content = self.article_service.complete(
+                    self._batch_messages(pending),
+                    # A partial or invalid batch is never cached, so the retry reaches the model again
+                    validate=lambda reply: not self._missing(pending, self._parse_batch(reply))
+                )
+            except Exception as e:
+                print(f"Batch transliteration failed: {e}")
+                continue
+            pending = self._collect(pending, content, translated)
+        
+        return self._merge(json_data, translated)
+    
+    async def transliterate_async(self, json_data: Dict[str, str]) -> Dict[str, str]:
+        """Transliterate slide paragraphs without blocking the event loop"""
+        translated: Dict[str, str] = {}
+        pending = self._pending_sources(json_data, translated)
+        
+        for _ in range(self.max_attempts):
+            if not pending:
+                break
+            try:
+                content = await self.article_service.complete_async(
+                    self._batch_messages(pending),
+                    # A partial or invalid batch is never cached, so the retry reaches the model again
+                    validate=lambda reply: not self._missing(pending, self._parse_batch(reply))
+                )
+            except Exception as e:
+                print(f"Batch transliteration failed: {e}")
+                continue
+            pending = self._collect(pending, content, translated)
+        
+        return self._merge(json_data, translated)
+    
+    def _pending_sources(self, json_data: Dict[str, str], translated: Dict[str, str]) -> Dict[str, str]:
+        """Fill cache hits into translated and map request keys to the unique texts still needed"""
+        pending: Dict[str, str] = {}
+        for k, v in json_data.items():
+            if not self.is_transliterable(k, v) or v in translated or v in pending.values():
+                continue
+            cached = self.cache.get(v) if self.cache is not None else None
+            if cached is not None:
+                translated[v] = cached
+            else:
+                pending[k] = v
+        return pending
+    
+    def _batch_messages(self, pending: Dict[str, str]) -> List[Dict[str, str]]:
+        """Build one keyed-JSON transliteration request"""
+        prompt = (
+            "Transliterate each Hindi sentence (written in Latin script) in this JSON object into Hindi "
+            "Devanagari script. Return ONLY a JSON object with exactly the same keys, each mapped to the "
+            "transliterated text:\n\n"
+            + json.dumps(pending, ensure_ascii=False, indent=2)
+        )
+        return [
+            {"role": "system", "content": "You are a Hindi transliteration expert."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    @staticmethod
+    def _parse_batch(content: str) -> Dict[str, object]:
+        """Parse a keyed-JSON response, treating anything but a JSON object as empty"""
+        content = content.strip("```json").strip("```").strip()
+        try:
+            result = json.loads(content)
+        except ValueError:
+            return {}
+        return result if isinstance(result, dict) else {}
+    
+    @staticmethod
+    def _missing(pending: Dict[str, str], result: Dict[str, object]) -> Dict[str, str]:
+        """Pending keys without a usable transliteration in result"""
+        return {k: source for k, source in pending.items()
+                if not (isinstance(result.get(k), str) and result[k].strip())}
+    
+    def _collect(self, pending: Dict[str, str], content: str, translated: Dict[str, str]) -> Dict[str, str]:
+        """Cache every valid key from a response and return the keys still missing"""
+        result = self._parse_batch(content)
+        missing = self._missing(pending, result)
+        for k, source in pending.items():
+            if k not in missing:
+                translated[source] = result[k].strip()
+                if self.cache is not None:
+                    self.cache.set(source, result[k].strip())
+        return missing
+    
+    def _merge(self, json_data: Dict[str, str], translated: Dict[str, str]) -> Dict[str, str]:
+        """Rebuild the input with transliterations, keeping the original text as fallback"""
+        updated = {}
+        for k, v in json_data.items():
+            if self.is_transliterable(k, v):
+                updated[k] = translated.get(v, v)
+            else:
+                updated[k] = v
+        return updated
@@ -3,77 +3,143 @@ TTS Service for Suvichaar FastAPI Service
 """
 import os
 import uuid
+import asyncio
 import requests
 import boto3
-from typing import Dict, Any, OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, OrderedDict
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from app.core.aws import get_s3_client
+from app.core.cancellation import CancellationToken, RequestCancelled
 from app.core.config import settings
+from app.core.executor import executor
+from app.services.audio_store import TTSAudioStore
+from app.services.s3_service import S3StreamingUpload
+from app.services.transliteration_service import TransliterationService
+
+
+TTS_MODEL = "tts-1-hd"
 
 
 class TTSService:
     """Service for Text-to-Speech generation and S3 upload"""
     
-    def __init__(self):
-        self.s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_ACCESS_KEY,
-            aws_secret_access_key=settings.AWS_SECRET_KEY,
-            region_name=settings.AWS_REGION,
-        )
+    def __init__(self, article_service=None, s3_client=None):
+        self.s3_client = s3_client or get_s3_client()
         self.azure_tts_url = settings.AZURE_TTS_URL
         self.azure_api_key = settings.AZURE_API_KEY
         self.s3_prefix = settings.S3_PREFIX
         self.cdn_base = settings.CDN_BASE
+        self.concurrency = max(1, settings.TTS_CONCURRENCY)
+        self.audio_store = None
+        if settings.TTS_AUDIO_CACHE_ENABLED:
+            self.audio_store = TTSAudioStore(self.s3_client, settings.AWS_BUCKET, self.s3_prefix, self.cdn_base)
+        self.transliterator = TransliterationService(article_service)
     
-    def synthesize_and_upload(self, paragraphs: Dict[str, str], voice: str) -> Dict[str, Any]:
-        """Synthesize text to speech and upload to S3"""
-        result = OrderedDict()
-        os.makedirs("temp", exist_ok=True)
+    def _synthesis_jobs(self, paragraphs: Dict[str, str]) -> List[Tuple[str, str, str]]:
+        """Plan (slide key, text key, text) for each line, in output slide order"""
+        jobs = []
         
-        slide_index = 1
-        
-        # Slide 1: storytitle
-        if "storytitle" in paragraphs:
-            storytitle = paragraphs["storytitle"]
-            audio_url = self._generate_audio(storytitle, voice)
-            result[f"slide{slide_index}"] = {
-                "storytitle": storytitle,
-                "audio_url": audio_url,
-                "voice": voice
-            }
-            slide_index += 1
-        
-        # Slide 2: hookline
-        if "hookline" in paragraphs:
-            hookline = paragraphs["hookline"]
-            audio_url = self._generate_audio(hookline, voice)
-            result[f"slide{slide_index}"] = {
-                "hookline": hookline,
-                "audio_url": audio_url,
-                "voice": voice
-            }
-            slide_index += 1
+        # Slide 1: storytitle, Slide 2: hookline
+        for key in ("storytitle", "hookline"):
+            if key in paragraphs:
+                jobs.append((f"slide{len(jobs) + 1}", key, paragraphs[key]))
         
         # Slide 3 onwards: s1paragraph1 to s9paragraph1
         for i in range(1, 10):  # s1 to s9
             key = f"s{i}paragraph1"
-            if key not in paragraphs:
-                continue
-            
-            text = paragraphs[key]
-            audio_url = self._generate_audio(text, voice)
-            
-            result[f"slide{slide_index}"] = {
-                key: text,
+            if key in paragraphs:
+                jobs.append((f"slide{len(jobs) + 1}", key, paragraphs[key]))
+        
+        return jobs
+    
+    def _assemble_slides(self, jobs: List[Tuple[str, str, str]], audio_urls: List[str], voice: str) -> Dict[str, Any]:
+        """Build the ordered slide output from planned jobs and their audio URLs"""
+        result = OrderedDict()
+        for (slide_key, text_key, text), audio_url in zip(jobs, audio_urls):
+            result[slide_key] = {
+                text_key: text,
                 "audio_url": audio_url,
                 "voice": voice
             }
-            slide_index += 1
-        
         return result
     
-    def _generate_audio(self, text: str, voice: str) -> str:
-        """Generate audio from text using Azure TTS"""
+    def synthesize_and_upload(self, paragraphs: Dict[str, str], voice: str) -> Dict[str, Any]:
+        """Synthesize text to speech and upload to S3"""
+        jobs = self._synthesis_jobs(paragraphs)
+        if not jobs:
+            return OrderedDict()
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            audio_urls = list(pool.map(lambda job: self._generate_audio(job[2], voice), jobs))
+        
+        return self._assemble_slides(jobs, audio_urls, voice)
+    
+    async def synthesize_and_upload_async(self, paragraphs: Dict[str, str], voice: str,
+                                          token: Optional[CancellationToken] = None) -> Dict[str, Any]:
+        """
+        Synthesize and upload every slide concurrently without blocking the event loop.
+        If cancelled, queued syntheses never start, running ones stop at their next chunk
+        (aborting their multipart upload) and one-off audio already uploaded is deleted.
+        """
+        jobs = self._synthesis_jobs(paragraphs)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        token = token or CancellationToken()
+        uploaded_keys: List[str] = []
+        
+        async def synthesize(text: str) -> str:
+            async with semaphore:
+                token.raise_if_cancelled()
+                return await executor.run_io(self._generate_audio, text, voice, token, uploaded_keys)
+        
+        try:
+            audio_urls = await asyncio.gather(*(synthesize(text) for _, _, text in jobs))
+        except (asyncio.CancelledError, RequestCancelled):
+            token.cancel()
+            await executor.run_io(self._delete_objects, list(uploaded_keys))
+            raise
+        return self._assemble_slides(jobs, audio_urls, voice)
+    
+    def _generate_audio(self, text: str, voice: str, token: Optional[CancellationToken] = None,
+                        uploaded_keys: Optional[List[str]] = None) -> str:
+        """Generate audio from text using Azure TTS, reusing identical earlier syntheses"""
+        if self.audio_store is None:
+            s3_key = f"{self.s3_prefix}tts_{uuid.uuid4().hex}.mp3"
+            url = self._synthesize_to_s3(text, voice, s3_key, token)
+            if uploaded_keys is not None:
+                uploaded_keys.append(s3_key)
+            if token is not None and token.cancelled:
+                # Finished after the request's cleanup ran, so remove it here
+                self._delete_objects([s3_key])
+                raise RequestCancelled("Request cancelled")
+            return url
+        
+        # Content-addressed audio is reusable by later requests, so it is kept on cancellation
+        digest = self.audio_store.digest(text, voice, TTS_MODEL)
+        with self.audio_store.claim(digest):
+            cached_url = self.audio_store.lookup(digest)
+            if cached_url:
+                return cached_url
+            
+            self._synthesize_to_s3(text, voice, self.audio_store.key_for(digest), token)
+            return self.audio_store.remember(digest)
+    
+    def _delete_objects(self, keys: List[str]) -> None:
+        """Best-effort removal of audio uploaded for a cancelled request"""
+        for start in range(0, len(keys), 1000):
+            try:
+                self.s3_client.delete_objects(
+                    Bucket=settings.AWS_BUCKET,
+                    Delete={"Objects": [{"Key": key} for key in keys[start:start + 1000]], "Quiet": True}
+                )
+            except Exception as e:
+                print(f"Cleanup of cancelled TTS audio failed: {e}")
+    
+    def _synthesize_to_s3(self, text: str, voice: str, s3_key: str,
+                          token: Optional[CancellationToken] = None) -> str:
+        """Synthesize text with Azure TTS and stream the audio to the given S3 key"""
+        if token is not None:
+            token.raise_if_cancelled()
         try:
             response = requests.post(
                 self.azure_tts_url,
@@ -82,26 +148,27 @@ class TTSService:
                     "api-key": self.azure_api_key
                 },
                 json={
-                    "model": "tts-1-hd",
+                    "model": TTS_MODEL,
                     "input": text,
                     "voice": voice
-                }
+                },
+                stream=True
             )
-            response.raise_for_status()
-            
-            filename = f"tts_{uuid.uuid4().hex}.mp3"
-            local_path = os.path.join("temp", filename)
             
-            with open(local_path, "wb") as f:
-                f.write(response.content)
-            
-            s3_key = f"{self.s3_prefix}{filename}"
-            self.s3_client.upload_file(local_path, settings.AWS_BUCKET, s3_key)
-            cdn_url = f"{self.cdn_base}{s3_key}"
-            
-            os.remove(local_path)
-            return cdn_url
+            # Pipe the response body into S3 without touching local disk
+            with response:
+                response.raise_for_status()
+                
+                with S3StreamingUpload(self.s3_client, settings.AWS_BUCKET, s3_key, "audio/mpeg") as upload:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        if token is not None:
+                            token.raise_if_cancelled()
+                        upload.write(chunk)
             
+            return f"{self.cdn_base}{s3_key}"
+        
+        except RequestCancelled:
+            raise
         except Exception as e:
             raise Exception(f"TTS generation failed: {str(e)}")
     
@@ -157,30 +224,8 @@ class TTSService:
     
     def transliterate_to_devanagari(self, json_data: Dict[str, str]) -> Dict[str, str]:
         """Transliterate Hindi text to Devanagari script"""
-        from app.services.article_service import ArticleService
-        
-        article_service = ArticleService()
-        updated = {}
-        
-        for k, v in json_data.items():
-            # Only transliterate slide paragraphs
-            if k.startswith("s") and "paragraph1" in k and v.strip():
-                prompt = f"""Transliterate this Hindi sentence (written in Latin script) into Hindi Devanagari script. Return only the transliterated text:\n\n{v}"""
-                
-                try:
-                    response = article_service.client.chat.completions.create(
-                        model=article_service.deployment_name,
-                        messages=[
-                            {"role": "system", "content": "You are a Hindi transliteration expert."},
-                            {"role": "user", "content": prompt.strip()}
-                        ]
-                    )
-                    devanagari = response.choices[0].message.content.strip()
-                    updated[k] = devanagari
-                except Exception as e:
-                    # Fallback: use original if error occurs
-                    updated[k] = v
-            else:
-                updated[k] = v
-        
-        return updated
+        return self.transliterator.transliterate(json_data)
+    
+    async def transliterate_to_devanagari_async(self, json_data: Dict[str, str]) -> Dict[str, str]:
+        """Transliterate Hindi text to Devanagari script without blocking the event loop"""
+        return await self.transliterator.transliterate_async(json_data)
@@ -0,0 +1,210 @@
+"""
+Background S3 upload queue for Suvichaar FastAPI Service
+"""
+import asyncio
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.executor import executor
+from app.services.s3_service import S3Service, UploadItem
+
+
+class UploadJob:
+    """A group of objects uploaded together, tracked for the status endpoint"""
+    
+    def __init__(self, items: List[UploadItem], urls: List[str]):
+        self.job_id = uuid.uuid4().hex
+        self.items = items
+        self.urls = urls
+        self.uploaded = [False] * len(items)
+        self.status = "queued"
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.next_attempt_at: Optional[float] = None
+    
+    @property
+    def finished(self) -> bool:
+        """Whether the job reached a terminal state"""
+        return self.status in ("completed", "failed")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Status snapshot without the bodies"""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "next_attempt_at": self.next_attempt_at,
+            "files": [
+                {"key": item.key, "url": url, "uploaded": done}
+                for item, url, done in zip(self.items, self.urls, self.uploaded)
+            ],
+        }
+
+
+class UploadQueue:
+    """
+    asyncio worker pool running on its own event loop thread, so uploads outlive the request
+    that queued them. Failed jobs are re-queued with jittered exponential backoff.
+    """
+    
+    def __init__(self, s3_service: S3Service, workers: int = settings.UPLOAD_QUEUE_WORKERS,
+                 max_attempts: int = settings.UPLOAD_MAX_ATTEMPTS,
+                 base_delay: float = settings.UPLOAD_RETRY_BASE_DELAY,
+                 max_delay: float = settings.UPLOAD_RETRY_MAX_DELAY,
+                 history: int = settings.UPLOAD_JOB_HISTORY):
+        self.s3_service = s3_service
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.history = history
+        self._jobs: "OrderedDict[str, UploadJob]" = OrderedDict()
+        self._guard = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._ready = threading.Event()
+    
+    # === Lifecycle ===
+    
+    def start(self) -> None:
+        """Start the worker loop thread if it is not running"""
+        with self._guard:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name="s3-upload-queue", daemon=True)
+            self._thread.start()
+        self._ready.wait()
+    
+    def stop(self, timeout: float = settings.UPLOAD_SHUTDOWN_TIMEOUT) -> None:
+        """Wait up to timeout for pending jobs, then stop the worker loop"""
+        thread, loop = self._thread, self._loop
+        if thread is None or loop is None or not thread.is_alive():
+            return
+        deadline = time.monotonic() + timeout
+        while self.pending() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        if self.pending():
+            print(f"Upload queue stopped with {self.pending()} pending jobs")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        self._thread = None
+    
+    async def startup(self) -> None:
+        """Start the queue with the application"""
+        self.start()
+    
+    async def shutdown(self) -> None:
+        """Drain and stop the queue with the application"""
+        await asyncio.to_thread(self.stop)
+    
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        workers = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            loop.run_until_complete(asyncio.gather(*workers, return_exceptions=True))
+            loop.close()
+            self._loop = None
+    
+    # === Jobs ===
+    
+    def submit(self, items: List[UploadItem]) -> UploadJob:
+        """Queue items for upload; their CloudFront URLs are final as soon as this returns"""
+        self.start()
+        job = UploadJob(items, [self.s3_service.item_url(item) for item in items])
+        with self._guard:
+            self._jobs[job.job_id] = job
+            self._trim_history()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return job
+    
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status snapshot of a job, if it is still tracked"""
+        job = self._jobs.get(job_id)
+        return job.to_dict() if job else None
+    
+    def pending(self) -> int:
+        """Jobs not yet completed or failed"""
+        with self._guard:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Job counts by status"""
+        counts: Dict[str, int] = {}
+        with self._guard:
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {"workers": self.workers, "jobs": counts}
+    
+    def _trim_history(self) -> None:
+        excess = len(self._jobs) - self.history
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:excess]:
+            del self._jobs[job_id]
+    
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._process(job)
+            except Exception as e:
+                print(f"Upload worker error for job {job.job_id}: {e}")
+            finally:
+                self._queue.task_done()
+    
+    async def _process(self, job: UploadJob) -> None:
+        job.status = "uploading"
+        job.attempts += 1
+        job.next_attempt_at = None
+        job.updated_at = time.time()
+        try:
+            await executor.run_io(self._upload_pending, job)
+        except Exception as e:
+            job.error = str(e)
+            job.updated_at = time.time()
+            if job.attempts >= self.max_attempts:
+                job.status = "failed"
+                print(f"Upload job {job.job_id} failed after {job.attempts} attempts: {e}")
+                return
+            delay = min(self.max_delay, self.base_delay * 2 ** (job.attempts - 1)) * random.uniform(0.5, 1.0)
+            job.status = "retrying"
+            job.next_attempt_at = time.time() + delay
+            asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, job)
+            return
+        
+        job.status = "completed"
+        job.error = None
+        job.updated_at = time.time()
+    
+    def _upload_pending(self, job: UploadJob) -> None:
+        """Upload, as one batch, the items not yet uploaded by an earlier attempt"""
+        pending = [index for index, done in enumerate(job.uploaded) if not done]
+        results = self.s3_service.upload_batch([job.items[index] for index in pending])
+        errors = []
+        for index, result in zip(pending, results):
+            if result.error:
+                errors.append(f"{result.key}: {result.error}")
+            else:
+                job.uploaded[index] = True
+        if errors:
+            raise Exception("; ".join(errors))
@@ -0,0 +1,235 @@
+"""
+Cache primitives for Suvichaar FastAPI Service
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class MemoryCache:
+    """In-process LRU cache with TTL, entry-count and byte-size limits"""
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 0, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live value, or None if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, size: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        """Store a value and evict least recently used entries past the limits"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        size = size if size is not None else len(json.dumps(value, ensure_ascii=False))
+        if self.max_bytes and size > self.max_bytes:
+            self.delete(key)  # too large to keep, but the previous value for key is stale
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, value, size)
+            self._size += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or (self.max_bytes and self._size > self.max_bytes)
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+    
+    def delete(self, key: str) -> None:
+        """Remove a key if present"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+    
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Current size and eviction counters"""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "evictions": self.evictions}
+    
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._size -= size
+
+
+class SQLiteCache:
+    """On-disk cache tier backed by SQLite, with TTL and LRU eviction by entry count"""
+    
+    def __init__(self, path: str, max_entries: int = 10000, ttl: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+            self._conn.commit()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live value, or None if it is missing or expired"""
+        return self.get_with_ttl(key)[0]
+    
+    def get_with_ttl(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """(value, seconds until it expires or None if it never does); (None, None) when missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None, None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None, None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(value), (expires_at - now if expires_at is not None else None)
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value and evict expired and least recently used rows"""
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at, now)
+            )
+            self._conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            if count > self.max_entries:
+                overflow = count - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+    
+    def delete(self, key: str) -> None:
+        """Remove a key if present"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+    
+    def clear(self) -> None:
+        """Drop every row"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Current size and eviction counters"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return {"entries": count, "path": self.path, "evictions": self.evictions}
+
+
+class TieredCache:
+    """Memory LRU in front of an optional SQLite tier, with hit/miss counters"""
+    
+    def __init__(self, memory: MemoryCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.sets = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Look up memory first, then disk, promoting disk hits into memory"""
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+        
+        if self.disk is not None:
+            try:
+                value, remaining = self.disk.get_with_ttl(key)
+            except sqlite3.Error as e:
+                print(f"Disk cache read failed: {e}")
+                value = remaining = None
+            if value is not None:
+                # Never let the memory copy outlive the disk entry
+                ttl = self.memory.ttl
+                if remaining is not None:
+                    ttl = remaining if not ttl else min(ttl, remaining)
+                self.memory.set(key, value, ttl=ttl)
+                self._count("disk_hits")
+                return value
+        
+        self._count("misses")
+        return None
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Write through to every tier"""
+        self.memory.set(key, value, ttl=ttl)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, ttl=ttl)
+            except sqlite3.Error as e:
+                print(f"Disk cache write failed: {e}")
+        self._count("sets")
+    
+    def delete(self, key: str) -> None:
+        """Remove a key from every tier"""
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+    
+    def clear(self) -> None:
+        """Drop every entry from every tier"""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus per-tier sizes"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None
+        }
+    
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
@@ -185,6 +185,11 @@ def create_success_response(data: Any, message: str = "Success") -> Dict[str, An
     }
 
 
+def format_sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 def create_error_response(error: str, detail: str = None, status_code: int = 400) -> Dict[str, Any]:
     """Create standardized error response"""
     return {
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass content submission rendering vs the old replace/re.sub chain
+"""
+import os
+import re
+import time
+
+for name, value in {
+    "AZURE_OPENAI_ENDPOINT": "https://example.openai.azure.com",
+    "AZURE_OPENAI_API_KEY": "benchmark",
+    "AZURE_TTS_URL": "https://example",
+    "AZURE_API_KEY": "benchmark",
+    "AWS_ACCESS_KEY": "benchmark",
+    "AWS_SECRET_KEY": "benchmark",
+    "AWS_BUCKET": "benchmark",
+    "CDN_BASE": "https://cdn.example.com/",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.services.html_service import HTMLProcessingService
+
+ITERATIONS = 2000
+
+VALUES = {
+    "user": "Suvichaar",
+    "userprofileurl": "https://www.suvichaar.org/authors/suvichaar",
+    "publishedtime": "2025-01-01T00:00:00+00:00",
+    "modifiedtime": "2025-01-01T00:00:00+00:00",
+    "storytitle": "Benchmark story title",
+    "metadescription": "A story used to benchmark template rendering",
+    "metakeywords": "benchmark, amp, story",
+    "contenttype": "News",
+    "lang": "en-US",
+    "pagetitle": "Benchmark story title | Suvichaar",
+    "canurl": "https://suvichaar.org/stories/benchmark_abc",
+    "canurl1": "https://stories.suvichaar.org/benchmark_abc.html",
+    "image0": "https://media.suvichaar.org/upload/cover.jpg",
+}
+
+RESIZED = {
+    "potraitcoverurl": "https://cdn.example.com/resized/640x853.jpg",
+    "msthumbnailcoverurl": "https://cdn.example.com/resized/300x300.jpg",
+}
+
+
+def build_template(slides: int = 40) -> str:
+    """A realistic prefinal AMP story with placeholders and brace-wrapped URLs"""
+    head = (
+        '<html lang="{{lang}}"><head><title>{{pagetitle}}</title>'
+        '<link rel="canonical" href="{{{canurl}}}">'
+        '<meta name="description" content="{{metadescription}}">'
+        '<meta name="keywords" content="{{metakeywords}}">'
+        '<meta property="article:published_time" content="{{publishedtime}}">'
+        '<meta property="article:modified_time" content="{{modifiedtime}}">'
+        '<link rel="author" href="{https://www.suvichaar.org/about}">'
+        '</head><body><amp-story standalone title="{{storytitle}}" publisher="{{user}}" '
+        'poster-portrait-src="{{potraitcoverurl}}" publisher-logo-src="{{msthumbnailcoverurl}}">'
+    )
+    slide = (
+        '<amp-story-page id="s{n}"><amp-img src="{{{image0}}}" layout="fill"></amp-img>'
+        '<amp-story-grid-layer template="vertical"><h1>{{storytitle}}</h1>'
+        '<p>Slide {n} of {{contenttype}} by <a href="{{userprofileurl}}">{{user}}</a></p>'
+        '<a href="{https://suvichaar.org/next}">Next</a></amp-story-grid-layer></amp-story-page>'
+    )
+    tail = '<a href="{{{canurl1}}}">Read more</a></amp-story></body></html>'
+    return head + "".join(slide.replace("{n}", str(i)) for i in range(slides)) + tail
+
+
+def legacy_render(template: str) -> str:
+    """The original str.replace chain, cleanup re.sub calls and resized URL replaces"""
+    html = template
+    for name, value in VALUES.items():
+        html = html.replace("{{" + name + "}}", value)
+    html = re.sub(r'href="\{(https://[^}]+)\}"', r'href="\1"', html)
+    html = re.sub(r'src="\{(https://[^}]+)\}"', r'src="\1"', html)
+    for label, url in RESIZED.items():
+        html = html.replace(f"{{{{{label}}}}}", url)
+    return html
+
+
+def timed(fn, iterations: int = ITERATIONS) -> float:
+    """Mean milliseconds per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main():
+    service = HTMLProcessingService()
+    source = build_template()
+    compiled = service.compile_template(source)
+    
+    def single_pass() -> str:
+        return compiled.render(VALUES, unwrap_urls=True, late_values=RESIZED)
+    
+    assert single_pass() == legacy_render(source), "single-pass output differs from the legacy chain"
+    
+    legacy_ms = timed(lambda: legacy_render(source))
+    compile_ms = timed(lambda: service.compile_template(source), iterations=50)
+    single_ms = timed(single_pass)
+    
+    print(f"Template size:       {len(source) / 1024:.1f} KB, {len(compiled.slots)} slots")
+    print(f"Legacy chain:        {legacy_ms:.3f} ms/render")
+    print(f"Compile (cached):    {compile_ms:.3f} ms")
+    print(f"Single-pass render:  {single_ms:.3f} ms/render")
+    print(f"Speedup:             {legacy_ms / single_ms:.1f}x (outputs byte-identical)")
+
+
+if __name__ == "__main__":
+    main()
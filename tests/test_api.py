@@ -94,6 +94,21 @@ def test_generate_amp_missing_placeholder():
     assert response.status_code == 500  # Should fail due to missing placeholder
 
 
+def test_process_html_download_streams_zip():
+    """?stream=true returns the ZIP bundle as a chunked stream"""
+    import io
+    import zipfile
+    response = client.post("/api/v1/process-html-download?stream=true", json={
+        "html_template": "<h1>{{storytitle}}</h1>",
+        "full_slide_json": {"slide1": {"storytitle": "Streamed"}}
+    })
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        html_name = next(name for name in archive.namelist() if name.endswith(".html"))
+        assert archive.read(html_name) == b"<h1>Streamed</h1>"
+
+
 def test_submit_content_missing_fields():
     """Test content submission with missing required fields"""
     response = client.post("/api/v1/submit-content", json={
@@ -0,0 +1,1063 @@
+"""
+Service-level tests for Suvichaar FastAPI Service (no external calls)
+"""
+import asyncio
+import json
+
+from app.services.article_service import ArticleService, NARRATION_FALLBACK
+
+
+ARTICLE_TEXT = "Headline of the story\n" + "Body of the article with enough text to classify. " * 5
+
+
+def _fake_completion(messages, **params):
+    """Return canned LLM output based on the system prompt"""
+    system = messages[0]["content"]
+    if system.startswith("Classify"):
+        return json.dumps({"category": "Sports", "subcategory": "Cricket", "emotion": "Joy"})
+    if system.startswith("You are a digital content editor"):
+        return json.dumps({"slides": [
+            {"title": "First", "prompt": "Explain the first point"},
+            {"title": "Second", "prompt": "Explain the second point"},
+        ]})
+    if system.startswith("You are a news presenter"):
+        return "Hello and welcome"
+    if system.startswith("You write concise narrations"):
+        return "Narration: " + messages[1]["content"].split("Instruction: ")[1].split("\n")[0]
+    return '"A hookline"'
+
+
+def test_generate_story_content_async():
+    """Async story chain returns classification, hookline and ordered slides"""
+    service = ArticleService()
+
+    async def fake_complete_async(messages, **params):
+        await asyncio.sleep(0)
+        return _fake_completion(messages, **params)
+
+    service.complete_async = fake_complete_async
+    output = asyncio.run(service.generate_story_content_async("Title", "Summary", ARTICLE_TEXT, "English"))
+
+    assert output["category"] == "Sports"
+    assert output["hookline"] == "A hookline"
+    assert output["storytitle"] == "Title"
+    assert [s["title"] for s in output["slides"]] == ["Headline of the story", "First", "Second"]
+    assert output["slides"][2]["script"] == "Narration: Explain the second point"
+
+
+def test_generate_narrations_async_bounded_and_ordered():
+    """Narrations keep slide order, respect the concurrency limit and fall back per slide"""
+    service = ArticleService()
+    service.narration_concurrency = 2
+    state = {"active": 0, "peak": 0}
+
+    async def fake_complete_async(messages, **params):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        instruction = messages[1]["content"].split("Instruction: ")[1].split("\n")[0]
+        await asyncio.sleep(0.01 * (5 - int(instruction)))
+        state["active"] -= 1
+        if instruction == "3":
+            raise RuntimeError("rate limited")
+        return f"narration {instruction}"
+
+    service.complete_async = fake_complete_async
+    slides = [{"title": str(i), "prompt": str(i)} for i in range(1, 5)]
+    narrations = asyncio.run(service.generate_narrations_async(slides, "English", "sketch"))
+
+    assert narrations == ["narration 1", "narration 2", NARRATION_FALLBACK, "narration 4"]
+    assert state["peak"] == 2
+
+
+def test_generate_narrations_sync_ordered():
+    """Threaded narration engine keeps slide order"""
+    service = ArticleService()
+    service.complete = lambda messages, **params: _fake_completion(messages, **params)
+    slides = [{"title": str(i), "prompt": f"point {i}"} for i in range(1, 8)]
+
+    narrations = service.generate_narrations(slides, "English", "sketch")
+
+    assert narrations == [f"Narration: point {i}" for i in range(1, 8)]
+
+
+def test_single_shot_generation_and_fallback():
+    """Single-shot mode uses one call when valid and falls back to multi-call when malformed"""
+    service = ArticleService()
+    single_shot = {
+        "intro_script": "Welcome",
+        "slides": [{"title": "One", "prompt": "Explain one", "script": "Narration one"}],
+    }
+    calls = []
+
+    def fake_complete(messages, **params):
+        calls.append(params)
+        if params.get("response_format"):
+            return json.dumps(single_shot)
+        return _fake_completion(messages, **params)
+
+    service.complete = fake_complete
+    output = service.title_script_generator("Sports", "Cricket", "Joy", ARTICLE_TEXT, single_shot=True)
+    assert len(calls) == 1
+    assert [s["script"] for s in output["slides"]] == ["Welcome", "Narration one"]
+
+    del single_shot["slides"][0]["script"]
+    calls.clear()
+    output = service.title_script_generator("Sports", "Cricket", "Joy", ARTICLE_TEXT, single_shot=True)
+    assert len(calls) == 5  # malformed single shot + outline + intro + 2 narrations
+    assert [s["title"] for s in output["slides"]] == ["Headline of the story", "First", "Second"]
+
+
+def test_batched_transliteration_retries_missing_keys_and_caches():
+    """Transliteration sends one keyed request, retries only missing keys and caches by source text"""
+    from app.services.transliteration_service import TransliterationService
+
+    requests_sent = []
+
+    class FakeArticleService:
+        def complete(self, messages, **params):
+            payload = json.loads(messages[1]["content"].split("\n\n", 1)[1])
+            requests_sent.append(sorted(payload))
+            # First attempt drops one key; retries answer everything
+            keys = list(payload)[:-1] if len(requests_sent) == 1 else list(payload)
+            return json.dumps({k: payload[k].upper() for k in keys})
+
+    transliterator = TransliterationService(FakeArticleService())
+    data = {"storytitle": "title", "s1paragraph1": "ek", "s2paragraph1": "do", "s3paragraph1": "ek", "hookline": "hook"}
+
+    result = transliterator.transliterate(data)
+    assert result == {"storytitle": "title", "s1paragraph1": "EK", "s2paragraph1": "DO", "s3paragraph1": "EK", "hookline": "hook"}
+    assert requests_sent == [["s1paragraph1", "s2paragraph1"], ["s2paragraph1"]]
+
+    assert transliterator.transliterate(data) == result
+    assert len(requests_sent) == 2
+
+
+def test_tiered_cache_lru_ttl_and_disk(tmp_path):
+    """Memory tier evicts LRU and expires entries; disk tier survives memory eviction"""
+    from app.utils.cache import MemoryCache, SQLiteCache, TieredCache
+
+    memory = MemoryCache(max_entries=2)
+    memory.set("a", "1")
+    memory.set("b", "2")
+    memory.get("a")
+    memory.set("c", "3")
+    assert memory.get("b") is None and memory.get("a") == "1"
+    memory.set("gone", "x", ttl=-1)
+    assert memory.get("gone") is None
+
+    cache = TieredCache(MemoryCache(max_entries=1), SQLiteCache(str(tmp_path / "cache.db")))
+    cache.set("k1", {"v": 1})
+    cache.set("k2", {"v": 2})
+    assert cache.get("k1") == {"v": 1}
+    assert cache.get("missing") is None
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (0, 1, 1)
+
+    # A promoted disk hit keeps the disk entry's remaining TTL, not the memory default
+    import time
+    cache = TieredCache(MemoryCache(ttl=3600), SQLiteCache(str(tmp_path / "ttl.db")))
+    cache.disk.set("short", "v", ttl=0.05)
+    assert cache.get("short") == "v"
+    time.sleep(0.1)
+    assert cache.memory.get("short") is None
+
+    # An oversize value replaces, rather than leaves behind, the previous one
+    memory = MemoryCache(max_bytes=20)
+    memory.set("k", "small")
+    memory.set("k", "x" * 100)
+    assert memory.get("k") is None
+
+
+def test_llm_completion_cache_hits_skip_the_client():
+    """Repeated prompts with the same parameters are served from the cache"""
+    from types import SimpleNamespace
+    from app.services.llm_cache import LLMResponseCache
+    from app.services.llm_pool import Deployment, DeploymentPool
+    from app.services.rate_limiter import LLMRateLimiter
+    from app.utils.cache import MemoryCache, TieredCache
+
+    service = ArticleService(cache=LLMResponseCache(TieredCache(MemoryCache())))
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        parsed = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=" answer "))])
+        return SimpleNamespace(headers={}, parse=lambda: parsed)
+
+    raw = SimpleNamespace(create=create)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=raw)))
+    service.pool = DeploymentPool([Deployment("primary", "gpt-4", client, None, LLMRateLimiter())])
+    messages = [{"role": "user", "content": "hello"}]
+
+    assert service.complete(messages, max_tokens=10) == "answer"
+    assert service.complete(messages, max_tokens=10) == "answer"
+    assert service.complete(messages, max_tokens=20) == "answer"
+    assert len(calls) == 2
+    assert service.cache.stats()["memory_hits"] == 1
+
+
+def test_llm_cache_skips_replies_the_caller_rejects():
+    """Malformed category and transliteration replies are retried, not replayed from the cache"""
+    from types import SimpleNamespace
+    from app.services.llm_cache import LLMResponseCache
+    from app.services.transliteration_service import TransliterationService
+    from app.utils.cache import MemoryCache, TieredCache
+
+    service = ArticleService(cache=LLMResponseCache(TieredCache(MemoryCache())))
+    replies = []
+
+    class FakePool:
+        def complete(self, messages, params):
+            content = replies.pop(0)
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    service.pool = FakePool()
+
+    replies.extend(['{"category": "Sports"}', '{"category": "Sports", "subcategory": "Cricket", "emotion": "Joy"}'])
+    assert service.detect_category_and_subcategory(ARTICLE_TEXT)["category"] == "Unknown"
+    assert service.detect_category_and_subcategory(ARTICLE_TEXT)["category"] == "Sports"
+    assert service.detect_category_and_subcategory(ARTICLE_TEXT)["category"] == "Sports"
+    assert replies == []
+
+    transliterator = TransliterationService(service)
+    transliterator.max_attempts = 2
+    replies.extend(["not json", json.dumps({"s1paragraph1": "EK"})])
+    assert transliterator.transliterate({"s1paragraph1": "ek"}) == {"s1paragraph1": "EK"}
+    assert replies == []
+
+
+def test_concurrent_tts_keeps_slide_order():
+    """Async synthesis runs slides concurrently but keeps the slideN ordering"""
+    import time
+    from app.services.tts_service import TTSService
+
+    service = TTSService()
+    service.concurrency = 4
+    delays = {"Title": 0.05, "Hook": 0.01, "One": 0.03, "Two": 0.0}
+
+    def fake_generate_audio(text, voice, token=None, uploaded_keys=None):
+        time.sleep(delays[text])
+        return f"https://cdn/{text}.mp3"
+
+    service._generate_audio = fake_generate_audio
+    paragraphs = {"s2paragraph1": "Two", "hookline": "Hook", "s1paragraph1": "One", "storytitle": "Title"}
+    result = asyncio.run(service.synthesize_and_upload_async(paragraphs, "alloy"))
+
+    assert list(result) == ["slide1", "slide2", "slide3", "slide4"]
+    assert result["slide1"] == {"storytitle": "Title", "audio_url": "https://cdn/Title.mp3", "voice": "alloy"}
+    assert result["slide2"]["hookline"] == "Hook"
+    assert result["slide4"]["s2paragraph1"] == "Two"
+    assert service.synthesize_and_upload(paragraphs, "alloy") == result
+
+
+class FakeS3Client:
+    """Records S3 calls made by the services"""
+
+    def __init__(self):
+        self.calls = []
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):
+        body = Body.read() if hasattr(Body, "read") else Body
+        self.calls.append(("put_object", Key))
+        self.objects[(Bucket, Key)] = body
+        return {}
+
+    def create_multipart_upload(self, Bucket, Key, ContentType=None):
+        self.calls.append(("create_multipart_upload", Key))
+        self.objects[(Bucket, Key, "parts")] = []
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.calls.append(("upload_part", PartNumber, len(Body)))
+        self.objects[(Bucket, Key, "parts")].append(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls.append(("complete_multipart_upload", len(MultipartUpload["Parts"])))
+        self.objects[(Bucket, Key)] = b"".join(self.objects.pop((Bucket, Key, "parts")))
+        return {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append(("abort_multipart_upload", Key))
+        return {}
+
+
+def test_streaming_upload_small_and_multipart():
+    """Small bodies use one put_object; bodies past one part switch to multipart"""
+    from app.services.s3_service import S3StreamingUpload
+
+    client = FakeS3Client()
+    with S3StreamingUpload(client, "bucket", "small.mp3", "audio/mpeg") as upload:
+        upload.write(b"abc")
+        upload.write(b"def")
+    assert client.calls == [("put_object", "small.mp3")]
+    assert client.objects[("bucket", "small.mp3")] == b"abcdef"
+
+    client = FakeS3Client()
+    part = 5 * 1024 * 1024
+    with S3StreamingUpload(client, "bucket", "big.mp3", "audio/mpeg", part_size=part) as upload:
+        for _ in range(11):
+            upload.write(b"x" * (part // 5))
+    assert [c[0] for c in client.calls] == [
+        "create_multipart_upload", "upload_part", "upload_part", "upload_part", "complete_multipart_upload"
+    ]
+    assert len(client.objects[("bucket", "big.mp3")]) == 11 * (part // 5)
+
+    client = FakeS3Client()
+    try:
+        with S3StreamingUpload(client, "bucket", "broken.mp3", "audio/mpeg", part_size=part) as upload:
+            upload.write(b"x" * part)
+            raise ConnectionError("TTS stream dropped")
+    except ConnectionError:
+        pass
+    assert client.calls[-1] == ("abort_multipart_upload", "broken.mp3")
+
+
+def test_tts_audio_store_deduplicates_syntheses():
+    """Identical (text, voice) lines are synthesized and uploaded once, then served from the index or S3"""
+    from botocore.exceptions import ClientError, EndpointConnectionError
+    from app.services.audio_store import TTSAudioStore
+    from app.services.tts_service import TTSService
+
+    client = FakeS3Client()
+
+    def head_object(Bucket, Key):
+        if (Bucket, Key) not in client.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {}
+
+    client.head_object = head_object
+    service = TTSService()
+    service.audio_store = TTSAudioStore(client, "bucket", "media/", "https://cdn/")
+    syntheses = []
+
+    def fake_synthesize_to_s3(text, voice, s3_key, token=None):
+        syntheses.append(text)
+        client.objects[("bucket", s3_key)] = b"mp3"
+        return f"https://cdn/{s3_key}"
+
+    service._synthesize_to_s3 = fake_synthesize_to_s3
+    paragraphs = {"storytitle": "Same line", "s1paragraph1": "Same line", "s2paragraph1": "Other line"}
+
+    first = service.synthesize_and_upload(paragraphs, "alloy")
+    assert sorted(syntheses) == ["Other line", "Same line"]
+    assert first["slide1"]["audio_url"] == first["slide2"]["audio_url"]
+    assert first["slide1"]["audio_url"].startswith("https://cdn/media/tts/")
+
+    # A fresh index falls back to S3 head_object; neither path re-synthesizes
+    service.audio_store = TTSAudioStore(client, "bucket", "media/", "https://cdn/")
+    assert service.synthesize_and_upload(paragraphs, "alloy") == first
+    assert service.synthesize_and_upload(paragraphs, "echo")["slide1"]["audio_url"] != first["slide1"]["audio_url"]
+    assert len(syntheses) == 4
+
+    # An unreachable store is bypassed, not fatal
+    def unreachable(Bucket, Key):
+        raise EndpointConnectionError(endpoint_url="https://s3.example.com")
+
+    client.head_object = unreachable
+    assert TTSAudioStore(client, "bucket", "media/", "https://cdn/").lookup("digest") is None
+
+
+def test_template_fetch_revalidates_with_etag():
+    """Repeat template fetches send If-None-Match and reuse the cached body on 304"""
+    import threading
+    import httpx
+    from app.services.html_service import HTMLProcessingService
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="<html>{{storytitle}}</html>",
+                              headers={"content-type": "text/html", "etag": '"v1"'})
+
+    async def run():
+        service = HTMLProcessingService()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service._clients[asyncio.get_running_loop()] = client
+        first = await service.fetch_template_from_url("https://cdn.example.com/t.html")
+        second = await service.fetch_template_from_url("https://cdn.example.com/t.html")
+
+        # A client opened on another loop (e.g. a worker thread's) is kept apart and closed there
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever)
+        thread.start()
+        other = await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_open_client(service), other_loop))
+        await service.shutdown()
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+        return first, second, [client.is_closed, other.is_closed, other is not client]
+
+    async def _open_client(service):
+        return service._get_client()
+
+    first, second, closed = asyncio.run(run())
+    assert first == second == "<html>{{storytitle}}</html>"
+    assert seen == [None, '"v1"']
+    assert closed == [True, True, True]
+
+
+def test_streaming_zip_matches_buffered_zip():
+    """The chunked ZIP stream holds the same members as the in-memory archive"""
+    import io
+    import zipfile
+    from app.services.html_service import HTMLProcessingService
+
+    service = HTMLProcessingService()
+    slide_json = {"slide1": {"storytitle": "Title", "audio_url": "https://cdn/1.mp3"}}
+    template = "<h1>{{storytitle}}</h1><audio src=\"{{storytitle_audiourl}}\"></audio>" * 500
+
+    chunks = list(service.iter_zip_file([
+        ("story.html", service.iter_placeholders_in_html(template, slide_json)),
+        ("data.json", [b'{"a": 1}']),
+    ]))
+    assert len(chunks) > 1
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.read("story.html").decode("utf-8") == service.replace_placeholders_in_html(template, slide_json)
+        assert archive.read("data.json") == b'{"a": 1}'
+
+
+def test_streaming_upload_tee_completes_or_aborts():
+    """Teed chunks reach S3 when fully consumed; an early stop aborts the multipart upload"""
+    from app.services.s3_service import S3StreamingUpload
+
+    client = FakeS3Client()
+    upload = S3StreamingUpload(client, "bucket", "story.html", "text/html")
+    assert b"".join(upload.tee([b"<html>", b"</html>"])) == b"<html></html>"
+    assert client.objects[("bucket", "story.html")] == b"<html></html>"
+
+    big = b"x" * (5 * 1024 * 1024)
+    upload = S3StreamingUpload(client, "bucket", "partial.html", "text/html", part_size=len(big))
+    stream = upload.tee([big, big, big])
+    next(stream)
+    next(stream)
+    stream.close()  # client disconnected
+    assert client.calls[-1] == ("abort_multipart_upload", "partial.html")
+    assert ("bucket", "partial.html") not in client.objects
+
+
+def test_upload_queue_retries_until_uploaded():
+    """Queued uploads return final URLs immediately and retry failed items with backoff"""
+    import time
+    from app.services.s3_service import S3Service, UploadItem
+    from app.services.upload_queue import UploadQueue
+
+    class FlakyS3Client(FakeS3Client):
+        failures = 2
+
+        def put_object(self, Bucket, Key, Body, ContentType=None):
+            if Key.endswith(".json") and self.failures:
+                self.failures -= 1
+                raise ConnectionError("S3 unavailable")
+            return super().put_object(Bucket, Key, Body, ContentType)
+
+    client = FlakyS3Client()
+    queue = UploadQueue(S3Service(s3_client=client), workers=2, base_delay=0.01, max_delay=0.05)
+    job = queue.submit([
+        UploadItem("media/a.html", b"<html></html>", "text/html"),
+        UploadItem("media/a.json", b"{}", "application/json"),
+    ])
+    assert job.urls[0].endswith("media/a.html")
+
+    deadline = time.time() + 5
+    while queue.status(job.job_id)["status"] != "completed" and time.time() < deadline:
+        time.sleep(0.01)
+    queue.stop()
+
+    status = queue.status(job.job_id)
+    assert status["status"] == "completed"
+    assert status["attempts"] == 3
+    assert sorted(call for call in client.calls if call[0] == "put_object") == [
+        ("put_object", "media/a.html"), ("put_object", "media/a.json")
+    ]
+
+
+def test_upload_batch_reports_per_item_results():
+    """Batch uploads run concurrently and report success or failure per item, in order"""
+    import threading
+    from app.services.s3_service import S3Service, UploadItem
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    class ConcurrentS3Client(FakeS3Client):
+        def put_object(self, Bucket, Key, Body, ContentType=None):
+            barrier.wait()  # both uploads must be in flight at once
+            if Key == "bad.json":
+                raise ConnectionError("denied")
+            return super().put_object(Bucket, Key, Body, ContentType)
+
+    service = S3Service(s3_client=ConcurrentS3Client())
+    ok, failed = service.upload_batch([
+        UploadItem("good.html", b"<html></html>", "text/html"),
+        UploadItem("bad.json", b"{}", "application/json", "suvichaarstories"),
+    ])
+    assert ok.key == "good.html" and ok.url.endswith("good.html") and ok.error is None
+    assert failed.url is None and failed.error == "denied"
+
+    barrier.reset()
+    results = asyncio.run(service.upload_batch_async([
+        service.html_story_item("<p></p>", "slug"), service.metadata_item({"a": 1}, "slug"),
+    ]))
+    assert [result.url for result in results] == [
+        "https://suvichaarstories.s3.amazonaws.com/slug.html",
+        "https://suvichaarstories.s3.amazonaws.com/slug_metadata.json",
+    ]
+
+    # Generated names stay distinct within the same second, and processed HTML/JSON share theirs
+    first, second = service.amp_html_item("<p></p>"), service.amp_html_item("<p></p>")
+    assert first.key != second.key
+    html_item, json_item = service.processed_file_items("<p></p>", {})
+    assert html_item.key[:-len(".html")] == json_item.key[:-len(".json")]
+
+
+def test_execution_layer_overlaps_blocking_calls_and_reports_saturation():
+    """Blocking calls on the I/O pool overlap; CPU work runs in a process pool"""
+    import threading
+    from app.core.executor import ExecutionLayer
+    from app.services.article_service import sentiment_polarity
+
+    layer = ExecutionLayer(io_workers=2, cpu_workers=1)
+    barrier = threading.Barrier(2, timeout=5)
+
+    async def run():
+        calls = await asyncio.gather(layer.run_io(barrier.wait), layer.run_io(barrier.wait))
+        polarity = await layer.run_cpu(sentiment_polarity, "What a wonderful, happy day")
+        return calls, polarity
+
+    calls, polarity = asyncio.run(run())
+    stats = layer.stats()
+    start_method = layer.cpu_pool._mp_context.get_start_method()
+    layer.shutdown()
+
+    assert sorted(calls) == [0, 1]  # both waiters passed the barrier together
+    assert polarity > 0.2
+    assert stats["io"]["completed"] == 2 and stats["io"]["active"] == 0
+    assert stats["cpu"]["processes"] is True and stats["cpu"]["completed"] == 1
+    assert start_method in ("forkserver", "spawn")  # never fork from the threaded server process
+
+
+ARTICLE_HTML = (
+    "<html><head><title> Story Title </title><style>p {}</style></head><body>"
+    "<nav class='content'>Menu</nav><article><h1>Head</h1>"
+    "<p>First <b>bold</b><script>track()</script> paragraph.</p></article>"
+)
+
+
+def test_article_extractor_matches_soup_and_stops_early():
+    """Streaming lxml extraction agrees with BeautifulSoup and stops once <article> closes"""
+    import httpx
+    from app.services.article_extractor import ArticleExtractor, extract_with_soup
+
+    body = (ARTICLE_HTML + "<p>filler</p>" * 50000 + "</body></html>").encode("utf-8")
+    chunks_sent = []
+
+    async def stream():
+        for start in range(0, len(body), 4096):
+            chunks_sent.append(start)
+            yield body[start:start + 4096]
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, content=stream())
+
+    async def run():
+        extractor = ArticleExtractor()
+        extractor._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        extractor._client_loop = asyncio.get_running_loop()
+        result = await extractor.extract_async("https://news.example.com/story")
+        await extractor.shutdown()
+        return result
+
+    title, summary, text = asyncio.run(run())
+    assert (title, text) == extract_with_soup(body) == ("Story Title", "HeadFirst bold paragraph.")
+    assert summary == text
+    assert len(chunks_sent) < 5
+
+
+def test_article_extractor_caps_body_bytes():
+    """Pages without an <article> are parsed only up to the byte cap"""
+    from app.services.article_extractor import ArticleExtractor
+
+    body = b"<html><body>" + b"<p>word</p>" * 10000
+    title, _, text = ArticleExtractor(max_bytes=1100).parse([body[:600], body[600:]])
+    assert title == "Untitled Article"
+    assert 90 <= text.count("word") <= 100
+
+
+def test_article_extractor_detects_utf8_without_a_declared_charset():
+    """A UTF-8 page with neither a header nor a meta charset is not decoded as Latin-1"""
+    from app.services.article_extractor import ArticleExtractor, extract_with_soup
+
+    body = "<html><head><title>नमस्ते</title></head><body><article><p>नमस्ते दुनिया</p></article></body></html>".encode("utf-8")
+    split = body.index("दुनिया".encode("utf-8")) + 1  # inside a multi-byte character
+    title, _, text = ArticleExtractor().parse([body[:split], body[split:]])
+    assert (title, text) == extract_with_soup(body) == ("नमस्ते", "नमस्ते दुनिया")
+
+    legacy = "<html><body><article>Café</article></body></html>".encode("windows-1252")
+    assert ArticleExtractor().parse([legacy])[2] == "Café"
+
+
+def test_article_cache_serves_fresh_entries_and_revalidates_stale_ones():
+    """Fresh entries skip the network; stale ones revalidate with validators and reuse the parse on 304"""
+    import httpx
+    from app.services.article_cache import ArticleCache, normalize_url
+    from app.services.article_extractor import ArticleExtractor
+    from app.utils.cache import MemoryCache, TieredCache
+
+    assert normalize_url("HTTPS://News.Example.com:443/a?b=2&utm_source=x&a=1#top") == \
+        "https://news.example.com/a?a=1&b=2"
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text=ARTICLE_HTML, headers={"content-type": "text/html", "etag": '"v1"'})
+
+    cache = ArticleCache(TieredCache(MemoryCache()), fresh_ttl=60)
+
+    async def run():
+        extractor = ArticleExtractor(cache=cache)
+        extractor._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        extractor._client_loop = asyncio.get_running_loop()
+        first = await extractor.extract_async("https://news.example.com/story?utm_medium=email")
+        fresh = await extractor.extract_async("https://news.example.com/story")
+        cache.fresh_ttl = 0
+        revalidated = await extractor.extract_async("https://news.example.com/story")
+        await extractor.shutdown()
+        return first, fresh, revalidated
+
+    first, fresh, revalidated = asyncio.run(run())
+    assert first == fresh == revalidated
+    assert first[0] == "Story Title"
+    assert seen == [None, '"v1"']
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_story_pipeline_batch_bounds_concurrency_and_reports_failures():
+    """Batch runs stories concurrently up to the limit and records per-item failures"""
+    from app.services.pipeline_service import StoryPipeline
+
+    state = {"active": 0, "peak": 0}
+
+    class FakeArticleService:
+        async def extract_article_async(self, url):
+            if url.endswith("/broken"):
+                raise Exception("Failed to extract article from URL: 404")
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            return "Title", "Summary", "Full text"
+
+        async def get_sentiment_async(self, text):
+            return "neutral"
+
+        async def generate_story_content_async(self, title, summary, full_text, language, single_shot=None, on_stage=None):
+            return {"storytitle": title, "hookline": "Hook", "slides": [{"script": "One"}, {"script": "Two"}]}
+
+    class FakeTTSService:
+        async def synthesize_and_upload_async(self, slides, voice, token=None):
+            return {"slide1": {"audio_url": f"https://cdn/{voice}.mp3"}}
+
+        def generate_remotion_input(self, tts_output, image_url):
+            return {"slide1": {"image": image_url}}
+
+    pipeline = StoryPipeline(FakeArticleService(), FakeTTSService(), batch_concurrency=3)
+    urls = [f"https://news.example.com/{i}" for i in range(8)] + ["https://news.example.com/broken"]
+    batch = asyncio.run(pipeline.run_batch(urls, "English", 4, voice="echo"))
+
+    assert (batch["total_items"], batch["processed_items"], batch["failed_items"]) == (9, 8, 1)
+    assert state["peak"] == 3
+    assert [result["index"] for result in batch["results"]] == list(range(9))
+    assert batch["results"][0]["tts_output"]["slide1"]["audio_url"] == "https://cdn/echo.mp3"
+    assert batch["results"][-1]["error"] == "Failed to extract article from URL: 404"
+
+
+def test_job_service_persists_results_and_resumes_interrupted_jobs(tmp_path):
+    """Queued jobs are stored with their stage and results; only expired leases are rerun"""
+    from datetime import datetime, timezone
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.models.database import ContentGeneration
+    from app.services.job_service import JobService
+
+    class FakePipeline:
+        async def generate_story(self, url, content_language, number_of_slides, single_shot=None, on_stage=None):
+            if url.endswith("/broken"):
+                raise Exception("Failed to extract article from URL: 404")
+            on_stage("extraction", {"title": url})
+            await asyncio.sleep(0.02)
+            return {"storytitle": url, "s1paragraph1": content_language}
+
+        async def synthesize(self, slides, voice):
+            return {"slide1": {"audio_url": f"https://cdn/{voice}.mp3"}}, {"slide1": {}}
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    session_factory = sessionmaker(bind=engine)
+
+    async def wait_for(service, kind, job_id):
+        for _ in range(200):
+            job = service.get_job(kind, job_id)
+            if job["status"] in ("completed", "failed"):
+                return job
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"{kind} job {job_id} did not finish")
+
+    async def run_jobs():
+        service = JobService(FakePipeline(), session_factory=session_factory, workers=2)
+        await service.startup()
+        ok = await service.enqueue_article("https://news.example.com/a", "genz", "Hindi", 5)
+        broken = await service.enqueue_article("https://news.example.com/broken", "genz", "English", 5)
+        tts = await service.enqueue_tts({"s1paragraph1": "Hi"}, "echo", content_generation_id=ok["job_id"])
+        assert ok["status"] == "pending"
+        results = [await wait_for(service, kind, job["job_id"]) for kind, job in
+                   (("article", ok), ("article", broken), ("tts", tts))]
+        await service.shutdown()
+        return service, results
+
+    service, (ok, broken, tts) = asyncio.run(run_jobs())
+
+    assert ok["status"] == "completed"
+    assert ok["stage"] == "extraction"
+    assert tts["stage"] == "synthesis"
+    assert ok["result"]["structured_output"] == {"storytitle": "https://news.example.com/a", "s1paragraph1": "Hindi"}
+    assert broken["status"] == "failed"
+    assert broken["error"] == "Failed to extract article from URL: 404"
+    assert tts["result"]["tts_output"]["slide1"]["audio_url"] == "https://cdn/echo.mp3"
+    assert tts["content_generation_id"] == ok["job_id"]
+    assert [job["job_id"] for job in service.list_jobs("article")] == [broken["job_id"], ok["job_id"]]
+    assert [job["job_id"] for job in service.list_jobs("article", status="failed")] == [broken["job_id"]]
+    # Only a pending job can be claimed
+    assert service._claim("article", ok["job_id"]) is None
+
+    # A job interrupted mid-run is picked up again by the next startup; one another
+    # process is still running (its lease is fresh) is left alone until the lease expires
+    with session_factory() as db:
+        interrupted = ContentGeneration(url="https://news.example.com/b", persona="genz", content_language="English",
+                                        number_of_slides=5, status="processing", result_data={"request": {}})
+        leased = ContentGeneration(url="https://news.example.com/c", persona="genz", content_language="English",
+                                   number_of_slides=5, status="processing", result_data={"request": {}},
+                                   claimed_by="other-worker", claimed_at=datetime.now(timezone.utc))
+        db.add_all([interrupted, leased])
+        db.commit()
+        interrupted_id, leased_id = interrupted.id, leased.id
+
+    async def restart():
+        service = JobService(FakePipeline(), session_factory=session_factory, workers=1)
+        await service.startup()
+        job = await wait_for(service, "article", interrupted_id)
+        await service.shutdown()
+        return job, service.get_job("article", leased_id)
+
+    job, leased_job = asyncio.run(restart())
+    assert job["status"] == "completed"
+    assert leased_job["status"] == "processing"
+
+    async def reap():
+        service = JobService(FakePipeline(), session_factory=session_factory, workers=1, lease_seconds=0.1)
+        await service.startup()
+        job = await wait_for(service, "article", leased_id)
+        await service.shutdown()
+        return job
+
+    assert asyncio.run(reap())["status"] == "completed"
+
+
+def test_story_stream_reports_stages_and_cancels_on_close():
+    """stream_story yields every stage, and closing it early cancels the outstanding LLM calls"""
+    from app.services.pipeline_service import StoryPipeline
+
+    service = ArticleService()
+    cancelled = []
+
+    async def fake_extract(url):
+        return "Title", "Summary", ARTICLE_TEXT
+
+    async def fake_sentiment(text):
+        return "positive"
+
+    async def fake_complete_async(messages, **params):
+        await asyncio.sleep(0)
+        return _fake_completion(messages, **params)
+
+    service.extract_article_async = fake_extract
+    service.get_sentiment_async = fake_sentiment
+    service.complete_async = fake_complete_async
+    pipeline = StoryPipeline(service, tts_service=None)
+
+    async def collect():
+        return [event async for event in pipeline.stream_story("https://news.example.com/a", "English", 3, single_shot=False)]
+
+    events = asyncio.run(collect())
+    stages = [stage for stage, _ in events]
+
+    assert stages[:2] == ["extraction", "sentiment"]
+    assert {"category", "hookline", "storytitle"} <= set(stages)
+    assert sorted(data["index"] for stage, data in events if stage == "slide") == [0, 1, 2]
+    assert stages[-1] == "complete"
+    assert events[-1][1]["structured_output"]["storytitle"] == "Title"
+
+    async def slow_complete_async(messages, **params):
+        if messages[0]["content"].startswith("You write concise narrations"):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(messages[1]["content"])
+                raise
+        return _fake_completion(messages, **params)
+
+    service.complete_async = slow_complete_async
+
+    async def disconnect_after_intro():
+        stream = pipeline.stream_story("https://news.example.com/a", "English", 3, single_shot=False)
+        async for stage, data in stream:
+            if stage == "slide":
+                break
+        await asyncio.sleep(0.01)  # narrations are now in flight
+        await stream.aclose()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(disconnect_after_intro())
+    assert len(cancelled) == 2
+
+
+def test_tts_cancellation_stops_syntheses_and_deletes_partial_audio():
+    """Cancelling synthesis stops running threads via the token and deletes audio already uploaded"""
+    import time
+    from types import SimpleNamespace
+    from app.core.cancellation import CancellationToken
+    from app.services.tts_service import TTSService
+
+    deleted = []
+    service = TTSService(s3_client=SimpleNamespace(
+        delete_objects=lambda Bucket, Delete: deleted.extend(obj["Key"] for obj in Delete["Objects"])
+    ))
+    service.audio_store = None
+    service.concurrency = 2
+    started = []
+
+    def fake_synthesize_to_s3(text, voice, s3_key, token=None):
+        started.append(text)
+        while text == "Slow":
+            token.raise_if_cancelled()
+            time.sleep(0.005)
+        return f"https://cdn/{s3_key}"
+
+    service._synthesize_to_s3 = fake_synthesize_to_s3
+    token = CancellationToken()
+    paragraphs = {"storytitle": "Fast", "hookline": "Slow", "s1paragraph1": "Slow", "s2paragraph1": "Queued"}
+
+    async def cancel_midway():
+        task = asyncio.ensure_future(service.synthesize_and_upload_async(paragraphs, "alloy", token=token))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        results = await asyncio.gather(task, return_exceptions=True)
+        return results[0]
+
+    outcome = asyncio.run(cancel_midway())
+
+    assert isinstance(outcome, asyncio.CancelledError)
+    assert token.cancelled
+    assert "Queued" not in started
+    assert len(deleted) == 1 and deleted[0].startswith("media/tts_")
+
+
+def test_cancel_on_disconnect_cancels_work_and_token():
+    """Work is cancelled, and its token set, once the client reports a disconnect"""
+    from app.core.cancellation import CancellationToken, RequestCancelled, cancel_on_disconnect
+
+    class FakeRequest:
+        def __init__(self, disconnect_after):
+            self.checks = 0
+            self.disconnect_after = disconnect_after
+
+        async def is_disconnected(self):
+            self.checks += 1
+            return self.checks >= self.disconnect_after
+
+    cancelled = []
+
+    async def slow_work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def quick_work():
+        return "done"
+
+    async def run():
+        token = CancellationToken()
+        try:
+            await cancel_on_disconnect(FakeRequest(2), slow_work(), token, poll_interval=0.01)
+        except RequestCancelled:
+            pass
+        else:
+            raise AssertionError("expected RequestCancelled")
+        done = await cancel_on_disconnect(FakeRequest(100), quick_work(), poll_interval=0.01)
+        return token, done
+
+    token, done = asyncio.run(run())
+    assert token.cancelled and cancelled == [True]
+    assert done == "done"
+
+
+def test_rate_limiter_backs_off_on_429_and_follows_headers():
+    """429s halve the concurrency limit and are retried; exhausted quota headers pause callers"""
+    import time
+    from types import SimpleNamespace
+    import httpx
+    import openai
+    from app.services.rate_limiter import LLMRateLimiter
+
+    limiter = LLMRateLimiter(tokens_per_minute=6000, max_concurrency=8, min_concurrency=1,
+                             max_attempts=4, base_delay=0.001, max_delay=0.01)
+    request = httpx.Request("POST", "https://azure.example.com/chat")
+    attempts = []
+
+    def throttled_then_ok():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            response = httpx.Response(429, headers={"retry-after-ms": "20"}, request=request)
+            raise openai.RateLimitError("Too Many Requests", response=response, body=None)
+        parsed = SimpleNamespace(usage=SimpleNamespace(total_tokens=100))
+        headers = {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "50ms",
+                   "x-ratelimit-remaining-tokens": "5000"}
+        return SimpleNamespace(headers=headers, parse=lambda: parsed)
+
+    parsed = limiter.call(throttled_then_ok, estimated_tokens=600)
+
+    assert parsed.usage.total_tokens == 100
+    assert attempts[2] - attempts[0] >= 0.04  # two Retry-After pauses
+    stats = limiter.stats()
+    assert (stats["throttled"], stats["retries"], stats["in_flight"]) == (2, 2, 0)
+    assert stats["concurrency_limit"] == 4  # halved once per burst, then grew by 1/4
+    assert stats["tokens_available"] <= 5000
+    assert stats["paused_for"] > 0  # remaining-requests hit zero
+
+    started = time.monotonic()
+    limiter.call(lambda: SimpleNamespace(headers={}, parse=lambda: None), estimated_tokens=10)
+    assert time.monotonic() - started >= 0.03
+
+    # A quota learned from headers starts from the reported remainder (or full), not empty
+    from app.services.rate_limiter import TokenBucket
+
+    learned = TokenBucket(0)
+    learned.observe(6000, 5000, time.monotonic())
+    assert 5000 <= learned.available() <= 6000
+    learned_full = TokenBucket(0)
+    learned_full.observe(6000, None, time.monotonic())
+    assert learned_full.available() == 6000
+    resized = TokenBucket(1000)
+    resized.observe(500, None, time.monotonic())
+    assert resized.available() == 500
+
+
+def test_rate_limiter_bounds_async_concurrency_and_gives_up_on_client_errors():
+    """Sync and async calls never exceed the concurrency limit, and non-retryable errors surface at once"""
+    from types import SimpleNamespace
+    from app.services.rate_limiter import LLMRateLimiter
+
+    limiter = LLMRateLimiter(max_concurrency=3)
+    state = {"active": 0, "peak": 0, "calls": 0}
+
+    async def request():
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return SimpleNamespace(headers={}, parse=lambda: "ok")
+
+    async def failing():
+        state["calls"] += 1
+        raise ValueError("bad request")
+
+    async def run():
+        results = await asyncio.gather(*(limiter.call_async(request, 50) for _ in range(10)))
+        try:
+            await limiter.call_async(failing, 50)
+        except ValueError:
+            pass
+        return results
+
+    assert asyncio.run(run()) == ["ok"] * 10
+    assert state["peak"] == 3
+    assert state["calls"] == 1
+    assert limiter.stats()["failed"] == 1
+
+    # Threads blocked on a full limiter are woken as slots are released
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    limiter = LLMRateLimiter(max_concurrency=2)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def blocking_request():
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.01)
+        with lock:
+            state["active"] -= 1
+        return SimpleNamespace(headers={}, parse=lambda: "ok")
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(lambda _: limiter.call(blocking_request, 50), range(6)))
+    assert results == ["ok"] * 6
+    assert state["peak"] == 2
+
+
+def test_deployment_pool_balances_by_weight_and_ejects_failing_deployments():
+    """Calls go to the least loaded deployment per weight; a deployment failing repeatedly is ejected"""
+    from types import SimpleNamespace
+    import httpx
+    import openai
+    from app.services.llm_pool import Deployment, DeploymentPool
+    from app.services.rate_limiter import LLMRateLimiter
+
+    served = []
+    request = httpx.Request("POST", "https://azure.example.com/chat")
+
+    def async_client(name, failing=False):
+        async def create(model, messages, **params):
+            if failing:
+                raise openai.InternalServerError("Server error", response=httpx.Response(503, request=request), body=None)
+            served.append(name)
+            await asyncio.sleep(0.01)
+            return SimpleNamespace(headers={}, parse=lambda: f"{name}:{model}")
+        raw = SimpleNamespace(create=create)
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=raw)))
+
+    def deployment(name, weight=1, failing=False):
+        return Deployment(name, f"gpt-4-{name}", None, async_client(name, failing),
+                          LLMRateLimiter(max_attempts=1), weight=weight)
+
+    messages = [{"role": "user", "content": "hi"}]
+    pool = DeploymentPool([deployment("eastus", weight=2), deployment("westus")], max_attempts=3)
+
+    async def burst(count):
+        return await asyncio.gather(*(pool.complete_async(messages, {}) for _ in range(count)))
+
+    results = asyncio.run(burst(6))
+    assert served.count("eastus") == 4 and served.count("westus") == 2
+    assert "eastus:gpt-4-eastus" in results
+
+    served.clear()
+    pool = DeploymentPool([deployment("broken", weight=10, failing=True), deployment("backup")],
+                          max_attempts=3, eject_after=3, eject_seconds=60, base_delay=0.001)
+    results = asyncio.run(burst(3)) + asyncio.run(burst(3))
+
+    assert results == ["backup:gpt-4-backup"] * 6
+    broken, backup = pool.stats()["deployments"]
+    assert broken["ejections"] == 1 and broken["ejected_for"] > 0
+    assert broken["failures"] == 3  # no traffic once ejected
+    assert backup["requests"] == 6 and backup["outstanding"] == 0
@@ -0,0 +1,109 @@
+"""
+Template rendering tests for Suvichaar FastAPI Service
+"""
+import re
+
+from app.services.html_service import HTMLProcessingService
+from app.services.template_engine import CompiledTemplate, TemplateCache, SLIDES_MARKER, SLIDES_SLOT
+
+
+TAB3_TEMPLATE = (
+    "<title>{{storytitle}}</title><audio src=\"{{storytitle_audiourl}}\"></audio>"
+    "<p>{{hookline}} {{ hookline }} {{{hookline}}}</p><source src=\"{{hookline_audiourl}}\">"
+    "<span>{{unknown}}</span>{{storytitle}}"
+)
+
+SLIDE_JSON = {
+    "slide1": {"storytitle": "Big & bold", "audio_url": "https://cdn/1.mp3"},
+    "slide2": {"hookline": "You won't believe it", "audio_url": "https://cdn/2.mp3"},
+}
+
+
+def test_compiled_template_keeps_unknown_slots():
+    """Slots without a value render as their original text"""
+    template = CompiledTemplate("a{{x}}b{{y}}c" + SLIDES_MARKER + "d")
+    assert template.slots == ["x", "y", SLIDES_SLOT]
+    assert template.render({"x": "1"}) == "a1b{{y}}c" + SLIDES_MARKER + "d"
+    assert template.render({"x": "1", "y": "2", SLIDES_SLOT: "S"}) == "a1b2cSd"
+
+
+def test_replace_placeholders_matches_chained_replace():
+    """Compiled rendering produces the same output as the sequential str.replace chain"""
+    expected = TAB3_TEMPLATE
+    expected = expected.replace("{{storytitle}}", "Big & bold")
+    expected = expected.replace("{{storytitle_audiourl}}", "https://cdn/1.mp3")
+    expected = expected.replace("{{hookline}}", "You won't believe it")
+    expected = expected.replace("{{hookline_audiourl}}", "https://cdn/2.mp3")
+    
+    service = HTMLProcessingService()
+    assert service.replace_placeholders_in_html(TAB3_TEMPLATE, SLIDE_JSON) == expected
+
+
+def test_template_cache_compiles_once_per_key():
+    """Identical inline templates and unchanged URL validators reuse the compiled plan"""
+    cache = TemplateCache()
+    first = cache.compile(TAB3_TEMPLATE)
+    assert cache.compile(TAB3_TEMPLATE) is first
+    
+    by_url = cache.compile("<p>{{a}}</p>", cache.url_key("https://t/x.html", '"v1"', "<p>{{a}}</p>"))
+    assert cache.compile("<p>{{a}}</p>", cache.url_key("https://t/x.html", '"v1"', "<p>{{a}}</p>")) is by_url
+    changed = cache.compile("<p>{{b}}</p>", cache.url_key("https://t/x.html", '"v2"', "<p>{{b}}</p>"))
+    assert changed.slots == ["b"]
+    assert cache.stats()["hits"] == 2
+
+
+SUBMISSION_TEMPLATE = (
+    '<link rel="canonical" href="{{{canurl}}}"><a href="{https://static.example/a}">'
+    '<img src="{{{image0}}}"><img src="{{{potraitcoverurl}}}"><a href="{{{storytitle}}}">'
+    '<a href="{{{missing}}}"><a href="{https://x/{{canurl1}}}"><p>{{storytitle}} {{msthumbnailcoverurl}}</p>'
+    '<b>{not-a-url}</b><a href="{ftp://keep}">'
+)
+
+
+def test_content_submission_matches_legacy_chain():
+    """Single-pass submission rendering is byte-identical to replace + re.sub + resized replaces"""
+    submission = {
+        "story_title": "Title",
+        "canonical_url": "https://suvichaar.org/stories/t",
+        "canonical_url1": "https://stories.suvichaar.org/t.html",
+        "image_url": "https://media/cover.jpg",
+        "selected_user": "Suvichaar",
+    }
+    resized = {"potraitcoverurl": "https://cdn/p.jpg", "msthumbnailcoverurl": "https://cdn/m.jpg"}
+    
+    service = HTMLProcessingService()
+    rendered = service.process_content_submission(SUBMISSION_TEMPLATE, submission, extra_placeholders=resized)
+    
+    expected = SUBMISSION_TEMPLATE
+    for name, value in {
+        "storytitle": "Title", "canurl": submission["canonical_url"],
+        "canurl1": submission["canonical_url1"], "image0": submission["image_url"],
+    }.items():
+        expected = expected.replace("{{" + name + "}}", value)
+    expected = re.sub(r'href="\{(https://[^}]+)\}"', r'href="\1"', expected)
+    expected = re.sub(r'src="\{(https://[^}]+)\}"', r'src="\1"', expected)
+    for label, url in resized.items():
+        expected = expected.replace(f"{{{{{label}}}}}", url)
+    
+    assert rendered == expected
+    assert 'src="{https://cdn/p.jpg}"' in rendered  # resized URLs were never unwrapped
+
+
+def test_amp_template_chunks_match_slide_concatenation():
+    """Chunked AMP assembly equals the per-slide markup, whether joined or streamed as bytes"""
+    output_data = {
+        "slide2": {"s2paragraph1": 'Second "quoted" line', "audio_url2": "https://cdn/2.mp3"},
+        "slide1": {"s1paragraph1": "First line", "audio_url1": "https://cdn/1.mp3"},
+        "slide3": {"s3paragraph1": "No audio, skipped"},
+    }
+    template = "<body>" + SLIDES_MARKER + "<footer>" + SLIDES_MARKER + "</footer></body>"
+    
+    service = HTMLProcessingService()
+    slides = (
+        service.generate_slide("First line", "https://cdn/1.mp3")
+        + service.generate_slide("Second &quot;quoted&quot; line", "https://cdn/2.mp3")
+    )
+    expected = template.replace(SLIDES_MARKER, slides)
+    
+    assert service.process_amp_template(template, output_data) == expected
+    assert b"".join(service.iter_amp_template(template, output_data)) == expected.encode("utf-8")